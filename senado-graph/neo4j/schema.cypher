@@ -19,6 +19,9 @@ FOR (c:Committee) REQUIRE c.id IS UNIQUE;
 CREATE CONSTRAINT lobbyist_id IF NOT EXISTS
 FOR (l:Lobbyist) REQUIRE l.id IS UNIQUE;
 
+CREATE CONSTRAINT cluster_id IF NOT EXISTS
+FOR (c:Cluster) REQUIRE c.id IS UNIQUE;
+
 // Indexes for performance
 CREATE INDEX senator_name_idx IF NOT EXISTS
 FOR (s:Senator) ON (s.name);
@@ -34,3 +37,22 @@ FOR (l:Law) ON (l.status);
 
 CREATE INDEX vote_date_idx IF NOT EXISTS
 FOR (v:Vote) ON (v.date);
+
+CREATE INDEX voted_same_in_period IF NOT EXISTS
+FOR ()-[r:VOTED_SAME_IN]-() ON (r.granularity, r.period);
+
+CREATE INDEX voted_same_backbone IF NOT EXISTS
+FOR ()-[r:VOTED_SAME]-() ON (r.backbone);
+
+// Centrality scores written by scraper/centrality.py
+CREATE INDEX senator_pagerank IF NOT EXISTS
+FOR (n:Senator) ON (n.pagerank);
+
+CREATE INDEX law_pagerank IF NOT EXISTS
+FOR (n:Law) ON (n.pagerank);
+
+CREATE INDEX lobbyist_pagerank IF NOT EXISTS
+FOR (n:Lobbyist) ON (n.pagerank);
+
+CREATE INDEX party_pagerank IF NOT EXISTS
+FOR (n:Party) ON (n.pagerank);
@@ -4,14 +4,17 @@ Advanced parallel scraper for Chilean Senate data with two-level parallelization
 
 Level 1: Parallel Days - Scrape laws from multiple days concurrently
 Level 2: Parallel Law Voting - Scrape voting data for all laws in parallel
+
+By default both levels are streamed: vote workers pick up each day's laws as
+soon as the day returns, while lobby data is scraped on its own pool.
 """
 
 import requests
 import xml.etree.ElementTree as ET
 import re
 import json
-import os
 import time
+import queue
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any, Tuple
@@ -28,9 +31,17 @@ from config import (
     LOBBY_DONATIONS_URL,
     REQUEST_TIMEOUT,
     DATA_DIR,
+    ensure_dirs,
 )
+from dates import normalize_date
+from industry import classify_industry
+from rate_limit import rate_limit
+from single_flight import RESPONSES
 from models import Senator, Party, Law
 
+# Laws buffered between day and vote workers, per vote worker
+STREAM_QUEUE_FACTOR = 4
+
 
 @dataclass
 class ScrapingResult:
@@ -62,8 +73,12 @@ class AdvancedParallelScraper:
         self.days = days
         self.base_api_url = "https://tramitacion.senado.cl/wspublico/tramitacion.php"
 
-        # Create a session for connection pooling
-        self.session = requests.Session()
+        # Create a session for connection pooling, rate limited per host
+        # together with every other scraper on the machine. Streaming runs
+        # the day and vote pools side by side, plus the lobby thread.
+        self.session = rate_limit(
+            requests.Session(), pool_size=2 * max_workers + 1
+        )
         self.session.headers.update(
             {
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
@@ -100,7 +115,21 @@ class AdvancedParallelScraper:
             return "withdrawn"
         return "in_discussion"
 
-    def _get_api_response(self, url: str) -> Optional[bytes]:
+    def _get_api_root(self, url: str) -> Optional[ET.Element]:
+        """Parsed API response, downloaded and parsed once per URL.
+
+        Concurrent callers share one download and its parsed tree, which is
+        also kept briefly for later ones (see single_flight.py); callers only
+        read it.
+        """
+
+        def fetch():
+            content = self._download(url)
+            return ET.fromstring(content) if content else None
+
+        return RESPONSES.do(("xml", url), fetch)
+
+    def _download(self, url: str) -> Optional[bytes]:
         """Get API response content with retry logic."""
         max_retries = 3
         backoff = 1.0
@@ -139,13 +168,12 @@ class AdvancedParallelScraper:
         url = f"{self.base_api_url}?fecha={date_str}"
 
         try:
-            response_content = self._get_api_response(url)
+            root = self._get_api_root(url)
 
-            if not response_content:
+            if root is None:
                 errors.append(f"Failed to fetch data for {date_str}")
                 return laws, authorships, errors
 
-            root = ET.fromstring(response_content)
             proyectos = root.findall(".//proyecto")
 
             for proj in proyectos:
@@ -195,7 +223,7 @@ class AdvancedParallelScraper:
                         boletin=boletin_text,
                         title=titulo,
                         description=" | ".join(materias) if materias else "",
-                        date_proposed=fecha_ingreso,
+                        date_proposed=normalize_date(fecha_ingreso),
                         status=self._normalize_status(estado),
                         topic=materias[0] if materias else None,
                     )
@@ -219,7 +247,7 @@ class AdvancedParallelScraper:
                                         "role": "principal"
                                         if idx == 0
                                         else "co_sponsor",
-                                        "date": fecha_ingreso,
+                                        "date": normalize_date(fecha_ingreso),
                                     }
                                 )
 
@@ -334,11 +362,10 @@ class AdvancedParallelScraper:
             boletin_number = boletin.split("-")[0]
             url = f"{self.base_api_url}?boletin={boletin_number}"
 
-            response_content = self._get_api_response(url)
-            if not response_content:
+            root = self._get_api_root(url)
+            if root is None:
                 return votes, boletin
 
-            root = ET.fromstring(response_content)
             votaciones = root.findall(".//votaciones/votacion")
 
             for votacion in votaciones:
@@ -364,7 +391,9 @@ class AdvancedParallelScraper:
                                         "session": session.text
                                         if session is not None
                                         else "",
-                                        "date": fecha.text if fecha is not None else "",
+                                        "date": normalize_date(
+                                            fecha.text if fecha is not None else ""
+                                        ),
                                         "topic": tema.text if tema is not None else "",
                                         "senator_name": parlamentario.text.strip(),
                                         "senator_id": f"senator_{self._sanitize_id(parlamentario.text.strip())}",
@@ -445,6 +474,135 @@ class AdvancedParallelScraper:
 
         return all_votes
 
+    def scrape_streaming(self) -> Tuple[ScrapingResult, Dict[str, List[Dict]]]:
+        """
+        Scrape days and votes as one stream, with lobby data alongside.
+
+        Each day's laws are pushed into a bounded queue as soon as the day
+        returns, deduplicated by boletin at enqueue time, and vote workers
+        consume it immediately, so the vote fan-out starts with the first
+        day instead of after the slowest one. Lobby data is scraped on its
+        own pool meanwhile. When the queue is full, day results wait until
+        a vote worker frees a slot.
+
+        Returns:
+            Tuple of (laws, authorships and votes, lobby data)
+        """
+        print(
+            f"\n[Streaming] Scraping {self.days} days and their votes "
+            f"with {self.max_workers} + {self.max_workers} threads..."
+        )
+
+        dates = [datetime.now() - timedelta(days=i) for i in range(self.days)]
+        laws_queue: "queue.Queue[Optional[Law]]" = queue.Queue(
+            maxsize=self.max_workers * STREAM_QUEUE_FACTOR
+        )
+
+        unique_laws: List[Law] = []
+        unique_authorships: List[Dict] = []
+        all_votes: List[Dict] = []
+        all_errors: List[str] = []
+        seen_boletines = set()
+        seen_authorships = set()
+
+        vote_bar = tqdm(total=0, desc="Scraping votes", unit="law", position=1)
+
+        def vote_worker():
+            while True:
+                law = laws_queue.get()
+                if law is None:
+                    return
+                try:
+                    votes, _ = self._scrape_law_votes(law)
+                    with self._lock:
+                        all_votes.extend(votes)
+                        self.stats["votes_found"] += len(votes)
+                except Exception as e:
+                    with self._lock:
+                        all_errors.append(f"Failed votes for {law.boletin}: {e}")
+                        self.stats["votes_failed"] += 1
+                vote_bar.update(1)
+
+        with ThreadPoolExecutor(max_workers=1) as lobby_pool, ThreadPoolExecutor(
+            max_workers=self.max_workers
+        ) as vote_pool:
+            lobby_future = lobby_pool.submit(self.scrape_lobby_parallel)
+            workers = [vote_pool.submit(vote_worker) for _ in range(self.max_workers)]
+
+            try:
+                with ThreadPoolExecutor(max_workers=self.max_workers) as day_pool:
+                    future_to_date = {
+                        day_pool.submit(self._scrape_single_day, date): date
+                        for date in dates
+                    }
+                    with tqdm(
+                        total=len(dates), desc="Scraping days", unit="day", position=0
+                    ) as day_bar:
+                        for future in as_completed(future_to_date):
+                            date = future_to_date[future]
+                            try:
+                                laws, authorships, errors = future.result()
+                            except Exception as e:
+                                all_errors.append(
+                                    f"Failed to scrape {date.strftime('%d/%m/%Y')}: {e}"
+                                )
+                                self.stats["days_failed"] += 1
+                                day_bar.update(1)
+                                continue
+
+                            self.stats["days_processed"] += 1
+                            self.stats["laws_found"] += len(laws)
+                            all_errors.extend(errors)
+                            for law in laws:
+                                if law.boletin in seen_boletines:
+                                    continue
+                                seen_boletines.add(law.boletin)
+                                unique_laws.append(law)
+                                vote_bar.total += 1
+                                vote_bar.refresh()
+                                laws_queue.put(law)
+                            for auth in authorships:
+                                key = (auth["senator_id"], auth["law_id"])
+                                if key not in seen_authorships:
+                                    seen_authorships.add(key)
+                                    unique_authorships.append(auth)
+                            day_bar.update(1)
+            except BaseException:
+                # Drop the laws still queued so the workers stop after the
+                # ones in progress
+                while True:
+                    try:
+                        laws_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                raise
+            finally:
+                # One stop marker per vote worker, behind every queued law;
+                # without them the vote pool never shuts down
+                for _ in workers:
+                    laws_queue.put(None)
+
+            for worker in workers:
+                worker.result()
+            lobby_data = lobby_future.result()
+
+        vote_bar.close()
+        self.stats["laws_unique"] = len(unique_laws)
+
+        print(f"\n[Streaming] Completed: {self.stats['days_processed']} days processed")
+        print(f"  - {self.stats['days_failed']} days failed")
+        print(f"  - {len(unique_laws)} unique laws")
+        print(f"  - {len(unique_authorships)} authorships")
+        print(f"  - {len(all_votes)} votes, {self.stats['votes_failed']} laws failed")
+
+        result = ScrapingResult(
+            laws=unique_laws,
+            authorships=unique_authorships,
+            votes=all_votes,
+            errors=all_errors,
+        )
+        return result, lobby_data
+
     def scrape_senators(self) -> Tuple[List[Senator], List[Party]]:
         """
         Scrape senators (sequential - not much data).
@@ -598,60 +756,7 @@ class AdvancedParallelScraper:
 
         # Scrape lobbyists and meetings
         try:
-            response = self.session.get(LOBBY_LOBBYISTS_URL, timeout=REQUEST_TIMEOUT)
-            response.raise_for_status()
-
-            from bs4 import BeautifulSoup
-
-            soup = BeautifulSoup(response.content, "html.parser")
-
-            tables = soup.find_all("table", class_="table-result")
-
-            for table in tables:
-                try:
-                    thead = table.find("thead")
-                    if not thead:
-                        continue
-
-                    tbody = table.find("tbody")
-                    if not tbody:
-                        continue
-
-                    rows = tbody.find_all("tr")
-
-                    for row in rows:
-                        tds = row.find_all("td")
-                        if len(tds) < 4:
-                            continue
-
-                        name = tds[0].get_text(strip=True)
-                        date = tds[1].get_text(strip=True)
-                        origin = tds[2].get_text(strip=True)
-                        activity = tds[3].get_text(strip=True)
-
-                        lobbyist_id = f"lobbyist_{self._sanitize_id(name)}"
-
-                        lobbyist = {
-                            "id": lobbyist_id,
-                            "name": name,
-                            "type": "organization",
-                            "industry": self._extract_industry(activity),
-                            "registration_date": date,
-                            "origin": origin,
-                        }
-
-                        result["lobbyists"].append(lobbyist)
-
-                        if "Reunión realizada" in origin:
-                            meeting = self._parse_meeting_from_origin(
-                                lobbyist_id, origin, date, activity
-                            )
-                            if meeting:
-                                result["meetings"].append(meeting)
-
-                except Exception as e:
-                    print(f"Error parsing lobbyist table: {e}")
-
+            result["lobbyists"], result["meetings"] = self._scrape_lobbyists()
         except Exception as e:
             print(f"Error scraping lobbyists: {e}")
 
@@ -674,6 +779,67 @@ class AdvancedParallelScraper:
 
         return result
 
+    def _scrape_lobbyists(self) -> Tuple[List[Dict], List[Dict]]:
+        """Scrape registered lobbyists and the meetings in their origin field."""
+        lobbyists = []
+        meetings = []
+
+        response = self.session.get(LOBBY_LOBBYISTS_URL, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(response.content, "html.parser")
+
+        tables = soup.find_all("table", class_="table-result")
+
+        for table in tables:
+            try:
+                thead = table.find("thead")
+                if not thead:
+                    continue
+
+                tbody = table.find("tbody")
+                if not tbody:
+                    continue
+
+                rows = tbody.find_all("tr")
+
+                for row in rows:
+                    tds = row.find_all("td")
+                    if len(tds) < 4:
+                        continue
+
+                    name = tds[0].get_text(strip=True)
+                    date = tds[1].get_text(strip=True)
+                    origin = tds[2].get_text(strip=True)
+                    activity = tds[3].get_text(strip=True)
+
+                    lobbyist_id = f"lobbyist_{self._sanitize_id(name)}"
+
+                    lobbyist = {
+                        "id": lobbyist_id,
+                        "name": name,
+                        "type": "organization",
+                        "industry": classify_industry(activity),
+                        "registration_date": normalize_date(date),
+                        "origin": origin,
+                    }
+
+                    lobbyists.append(lobbyist)
+
+                    if "Reunión realizada" in origin:
+                        meeting = self._parse_meeting_from_origin(
+                            lobbyist_id, origin, date, activity
+                        )
+                        if meeting:
+                            meetings.append(meeting)
+
+            except Exception as e:
+                print(f"Error parsing lobbyist table: {e}")
+
+        return lobbyists, meetings
+
     def _scrape_trips(self) -> List[Dict]:
         """Scrape lobbyist-funded trips."""
         trips = []
@@ -773,7 +939,7 @@ class AdvancedParallelScraper:
                         "lobbyist_id": lobbyist_id,
                         "senator_name": senator_name,
                         "lobbyist_name": donor,
-                        "date": date,
+                        "date": normalize_date(date),
                         "occasion": occasion,
                         "item": item,
                         "donor": donor,
@@ -808,32 +974,6 @@ class AdvancedParallelScraper:
 
         return None
 
-    def _extract_industry(self, activity: str) -> str:
-        """Extract industry/sector from activity description."""
-        activity_lower = activity.lower()
-
-        industry_keywords = {
-            "mining": ["minería", "cobre", "minera", "litio"],
-            "energy": ["energía", "renovable", "hidrógeno", "eléctrica"],
-            "fishing": ["pesca", "acuicultura", "salmon", "mar"],
-            "agriculture": ["agrícola", "agricultura", "fruta", "viña", "vino"],
-            "education": ["educación", "universidad", "escuela"],
-            "health": ["salud", "farmacéutica", "médico"],
-            "finance": ["banca", "financiero", "bancario", "seguro"],
-            "technology": ["tecnología", "digital", "software"],
-            "environment": ["medio ambiente", "ambiental", "agua"],
-            "construction": ["construcción", "inmobiliario", "vivienda"],
-            "transport": ["transporte", "aéreo", "ferrocarril"],
-            "labor": ["trabajo", "laboral", "sindical"],
-            "justice": ["justicia", "legal", "ley"],
-        }
-
-        for industry, keywords in industry_keywords.items():
-            if any(keyword in activity_lower for keyword in keywords):
-                return industry
-
-        return "other"
-
     def _parse_cost(self, cost_text: str) -> int:
         """Parse cost string to integer (in CLP)."""
         try:
@@ -846,7 +986,7 @@ class AdvancedParallelScraper:
 
     def _save_data(self, data: Dict[str, Any]) -> None:
         """Save all scraped data to JSON files."""
-        os.makedirs(DATA_DIR, exist_ok=True)
+        ensure_dirs()
 
         # Save senators
         if "senators" in data:
@@ -903,10 +1043,14 @@ class AdvancedParallelScraper:
 
         print(f"\nAll data saved to {DATA_DIR}/")
 
-    def run(self) -> Dict[str, Any]:
+    def run(self, stream: bool = True) -> Dict[str, Any]:
         """
         Orchestrate all scraping and save to files.
 
+        Args:
+            stream: Overlap days, votes and lobby data (scrape_streaming)
+                instead of running them one phase after another
+
         Returns:
             Dictionary containing all scraped data
         """
@@ -924,16 +1068,22 @@ class AdvancedParallelScraper:
         # Step 1: Scrape senators and parties (sequential)
         senators, parties = self.scrape_senators()
 
-        # Step 2: Scrape laws in parallel (Level 1)
-        law_result = self.scrape_laws_parallel()
-        laws = law_result.laws
-        authorships = law_result.authorships
+        if stream:
+            # Steps 2-4 overlapped: votes start with the first day
+            law_result, lobby_data = self.scrape_streaming()
+            votes = law_result.votes
+        else:
+            # Step 2: Scrape laws in parallel (Level 1)
+            law_result = self.scrape_laws_parallel()
 
-        # Step 3: Scrape votes in parallel (Level 2)
-        votes = self.scrape_votes_parallel(laws)
+            # Step 3: Scrape votes in parallel (Level 2)
+            votes = self.scrape_votes_parallel(law_result.laws)
 
-        # Step 4: Scrape lobby data
-        lobby_data = self.scrape_lobby_parallel()
+            # Step 4: Scrape lobby data
+            lobby_data = self.scrape_lobby_parallel()
+
+        laws = law_result.laws
+        authorships = law_result.authorships
 
         # Compile final results
         results = {
@@ -971,6 +1121,7 @@ class AdvancedParallelScraper:
         print(f"  - {len(lobby_data['meetings'])} meetings")
         print(f"  - {len(lobby_data['trips'])} trips")
         print(f"  - {len(lobby_data['donations'])} donations")
+        print(f"\nAPI requests: {RESPONSES.summary()}")
         print(f"\nFiles saved to: {DATA_DIR}/")
         print("=" * 70)
 
@@ -994,10 +1145,16 @@ def main():
         help="Number of concurrent workers (default: 5)",
     )
 
+    parser.add_argument(
+        "--no-stream",
+        action="store_true",
+        help="Scrape all days before any votes, then lobby data",
+    )
+
     args = parser.parse_args()
 
     scraper = AdvancedParallelScraper(max_workers=args.workers, days=args.days)
-    scraper.run()
+    scraper.run(stream=not args.no_stream)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,288 @@
+"""Sparsify the voting-similarity graph into a bounded set of VOTED_SAME edges.
+
+Every pair of active senators shares enough votes to get a VOTED_SAME edge,
+so the raw graph is nearly complete. Two filters pick the edges worth
+drawing:
+
+- disparity filter (Serrano, Boguñá & Vespignani, 2009): keeps an edge if
+  its weight is statistically significant for at least one endpoint against
+  a null model where each node spreads its strength uniformly over its edges
+- symmetric top-k: keeps an edge if it is among the ``k`` heaviest edges of
+  either endpoint (or of both, with ``mutual``)
+
+Retained edges get ``backbone = true`` in Neo4j (indexed), along with the
+edge's disparity p-value and neighbour rank so queries can tighten either
+filter without recomputing.
+"""
+
+import sys
+import uuid
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+from communities import similarity_weights
+from similarity import MIN_COMMON_VOTES, SimilarityResult
+
+METHODS = ("disparity", "top_k", "union")
+
+# Defaults used by the seeder and the updater
+BACKBONE_METHOD = "union"
+BACKBONE_ALPHA = 0.05
+BACKBONE_K = 5
+
+BACKBONE_QUERY = """
+UNWIND $edges AS edge
+MATCH (s1:Senator {id: edge.senator1_id})
+MATCH (s2:Senator {id: edge.senator2_id})
+MATCH (s1)-[r:VOTED_SAME]->(s2)
+SET r.backbone = true,
+    r.disparity = edge.disparity,
+    r.neighborRank = edge.neighborRank,
+    r.backboneRunId = edge.runId
+"""
+
+BACKBONE_INDEX = (
+    "CREATE INDEX voted_same_backbone IF NOT EXISTS "
+    "FOR ()-[r:VOTED_SAME]-() ON (r.backbone)"
+)
+
+
+@dataclass
+class Backbone:
+    """Retained similarity edges, aligned with ``SimilarityResult.senator_ids``.
+
+    ``disparity`` and ``neighbor_rank`` are symmetric; ``mask`` follows the
+    similarity mask and only marks pairs i < j.
+    """
+
+    senator_ids: List[str]
+    disparity: np.ndarray
+    neighbor_rank: np.ndarray
+    mask: np.ndarray
+
+
+def disparity_pvalues(weights: np.ndarray) -> np.ndarray:
+    """Disparity-filter p-value of every edge, the smaller of both endpoints.
+
+    For node i with strength s_i and degree k_i, the chance that an edge
+    takes at least a share p_ij = w_ij / s_i of the strength under the null
+    model is (1 - p_ij)^(k_i - 1). The only edge of a degree-1 node is
+    always significant. Missing edges get a p-value of 1.
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    linked = weights > 0
+    strength = weights.sum(axis=1)
+    degree = linked.sum(axis=1)
+
+    share = np.zeros_like(weights)
+    np.divide(weights, strength[:, None], out=share, where=strength[:, None] > 0)
+    alpha = np.power(1.0 - share, np.maximum(degree - 1, 0)[:, None])
+    alpha[degree == 1] = 0.0
+    alpha[~linked] = 1.0
+    return np.minimum(alpha, alpha.T)
+
+
+def _row_ranks(weights: np.ndarray) -> np.ndarray:
+    """1-based rank of each edge among its row's edges, heaviest first."""
+    order = np.argsort(np.where(weights > 0, -weights, np.inf), axis=1, kind="stable")
+    ranks = np.empty_like(order)
+    rows = np.arange(len(weights))[:, None]
+    ranks[rows, order] = np.arange(1, weights.shape[1] + 1)[None, :]
+    return ranks
+
+
+def neighbor_ranks(weights: np.ndarray, mutual: bool = False) -> np.ndarray:
+    """Rank of each edge among its endpoints' edges, heaviest first.
+
+    Entry (i, j) combines j's rank among i's neighbours and i's rank among
+    j's, 1-based: the better of the two, so ``ranks <= k`` is the symmetric
+    top-k graph, or with ``mutual`` the worse of the two, so ``ranks <= k``
+    is the mutual top-k graph. Ties keep node order; missing edges get 0.
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    ranks = _row_ranks(weights)
+    ranks = np.maximum(ranks, ranks.T) if mutual else np.minimum(ranks, ranks.T)
+    ranks[weights <= 0] = 0
+    return ranks
+
+
+def sparsify(
+    result: SimilarityResult,
+    senators: Optional[List[dict]] = None,
+    method: str = BACKBONE_METHOD,
+    weight: str = "kappa",
+    alpha: float = BACKBONE_ALPHA,
+    k: int = BACKBONE_K,
+    mutual: bool = False,
+) -> Backbone:
+    """Select the similarity edges to keep.
+
+    Args:
+        result: Similarity matrices
+        senators: When given, only pairs of these senators are considered, so
+            neighbour slots aren't spent on senators the graph doesn't show
+        method: ``disparity``, ``top_k`` or ``union`` of both
+        weight: Edge weight, ``kappa`` or ``agreement``. Raw agreement is
+            high for almost every pair, which leaves the disparity filter
+            little to tell apart
+        alpha: Significance level of the disparity filter
+        k: Neighbours kept per senator by the top-k filter
+        mutual: Require an edge to be in the top-k of both endpoints
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown sparsification method: {method}")
+
+    weights = similarity_weights(result, weight)
+    if senators:
+        ids = {s["id"] for s in senators}
+        keep = np.array(
+            [senator_id in ids for senator_id in result.senator_ids], dtype=bool
+        )
+        weights[~keep, :] = 0.0
+        weights[:, ~keep] = 0.0
+
+    disparity = disparity_pvalues(weights)
+    ranks = neighbor_ranks(weights)
+
+    significant = disparity < alpha
+    nearest = (ranks > 0) & (neighbor_ranks(weights, mutual=mutual) <= k)
+
+    selected = {
+        "disparity": significant,
+        "top_k": nearest,
+        "union": significant | nearest,
+    }[method]
+
+    return Backbone(
+        senator_ids=list(result.senator_ids),
+        disparity=disparity,
+        neighbor_rank=ranks,
+        mask=result.mask & selected & (weights > 0),
+    )
+
+
+def backbone_edges(backbone: Backbone) -> List[dict]:
+    """Rows for BACKBONE_QUERY, oriented like similarity_edges."""
+    rows, cols = np.nonzero(backbone.mask)
+    edges = []
+    for i, j in zip(rows.tolist(), cols.tolist()):
+        first, second = sorted((backbone.senator_ids[i], backbone.senator_ids[j]))
+        edges.append(
+            {
+                "senator1_id": first,
+                "senator2_id": second,
+                "disparity": round(float(backbone.disparity[i, j]), 6),
+                "neighborRank": int(backbone.neighbor_rank[i, j]),
+            }
+        )
+    return edges
+
+
+def write_backbone(driver, writer, backbone: Backbone):
+    """Flag the retained VOTED_SAME edges and clear the flag everywhere else."""
+    run_id = str(uuid.uuid4())
+    edges = backbone_edges(backbone)
+    for edge in edges:
+        edge["runId"] = run_id
+
+    with driver.session() as session:
+        session.run(BACKBONE_INDEX).consume()
+
+    stats = writer.write(BACKBONE_QUERY, edges, param="edges")
+    print(f"  {stats.summary()}")
+
+    with driver.session() as session:
+        session.run(
+            """
+            MATCH ()-[r:VOTED_SAME {backbone: true}]->()
+            WHERE r.backboneRunId IS NULL OR r.backboneRunId <> $run_id
+            SET r.backbone = false
+            REMOVE r.disparity, r.neighborRank, r.backboneRunId
+            """,
+            run_id=run_id,
+        ).consume()
+
+
+def main():
+    """Main entry point."""
+    import argparse
+
+    from config import DATA_DIR
+    from scraped_data import load_dataset
+    from similarity import compute_similarity
+    from vote_matrix import build_vote_matrix
+
+    parser = argparse.ArgumentParser(
+        description="Extract a sparse backbone of the voting-similarity graph"
+    )
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--method", choices=METHODS, default=BACKBONE_METHOD)
+    parser.add_argument(
+        "--weight", choices=("kappa", "agreement"), default="kappa"
+    )
+    parser.add_argument(
+        "--alpha",
+        type=float,
+        default=BACKBONE_ALPHA,
+        help=f"Disparity filter significance level (default: {BACKBONE_ALPHA})",
+    )
+    parser.add_argument(
+        "--k",
+        type=int,
+        default=BACKBONE_K,
+        help=f"Neighbours kept per senator (default: {BACKBONE_K})",
+    )
+    parser.add_argument(
+        "--mutual", action="store_true", help="Only keep mutual top-k neighbours"
+    )
+    parser.add_argument("--min-common-votes", type=int, default=MIN_COMMON_VOTES)
+    parser.add_argument(
+        "--neo4j", action="store_true", help="Flag the retained VOTED_SAME edges"
+    )
+    args = parser.parse_args()
+
+    votes = load_dataset("votes", args.data_dir)
+    if not votes:
+        print("No voting data found")
+        sys.exit(1)
+
+    senators = load_dataset("senators", args.data_dir)
+    result = compute_similarity(
+        build_vote_matrix(votes, senators),
+        min_common_votes=args.min_common_votes,
+        kappa=True,
+    )
+    backbone = sparsify(
+        result,
+        senators,
+        method=args.method,
+        weight=args.weight,
+        alpha=args.alpha,
+        k=args.k,
+        mutual=args.mutual,
+    )
+
+    degree = backbone.mask.sum(axis=0) + backbone.mask.sum(axis=1)
+    print(
+        f"Kept {int(backbone.mask.sum())} of {int(result.mask.sum())} edges; "
+        f"{int((degree == 0).sum())} senators isolated, "
+        f"max degree {int(degree.max()) if degree.size else 0}"
+    )
+
+    if args.neo4j:
+        from neo4j import GraphDatabase
+
+        from config import NEO4J_PASSWORD, NEO4J_URI, NEO4J_USERNAME
+        from neo4j_batch import BatchWriter
+
+        driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USERNAME, NEO4J_PASSWORD))
+        try:
+            write_backbone(driver, BatchWriter(driver), backbone)
+        finally:
+            driver.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,472 @@
+#!/usr/bin/env python3
+"""
+Export scraped data as CSV files for `neo4j-admin database import`.
+
+A full rebuild through seed_neo4j.py runs one MERGE per row over Bolt. For fresh
+environments and disaster recovery the offline importer is orders of magnitude
+faster: this module writes one CSV per label and relationship type (headers
+included), validates referential integrity locally and prints the import
+command to run against a stopped database.
+"""
+
+import csv
+import json
+import os
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+from config import DATA_DIR
+from scraped_data import load_scraped_data
+from senator_resolver import SenatorResolver
+
+# Label -> [(property, neo4j-admin type)]; each label is its own ID space
+NODE_SPECS = {
+    "Party": [
+        ("name", "string"),
+        ("nameEn", "string"),
+        ("shortName", "string"),
+        ("color", "string"),
+        ("ideology", "string"),
+    ],
+    "Senator": [
+        ("name", "string"),
+        ("nameEn", "string"),
+        ("party", "string"),
+        ("region", "string"),
+        ("regionEn", "string"),
+        ("email", "string"),
+        ("photoUrl", "string"),
+        ("biography", "string"),
+        ("biographyEn", "string"),
+        ("startDate", "string"),
+        ("active", "boolean"),
+    ],
+    "Law": [
+        ("boletin", "string"),
+        ("title", "string"),
+        ("titleEn", "string"),
+        ("description", "string"),
+        ("descriptionEn", "string"),
+        ("dateProposed", "string"),
+        ("status", "string"),
+        ("topic", "string"),
+    ],
+    "Lobbyist": [
+        ("name", "string"),
+        ("type", "string"),
+        ("industry", "string"),
+        ("registrationDate", "string"),
+        ("origin", "string"),
+    ],
+}
+
+# Relationship type -> (start label, end label, [(property, type)])
+REL_SPECS = {
+    "BELONGS_TO": ("Senator", "Party", []),
+    "AUTHORED": ("Senator", "Law", [("role", "string"), ("date", "string")]),
+    "VOTED_ON": (
+        "Senator",
+        "Law",
+        [
+            ("session", "string"),
+            ("date", "string"),
+            ("vote", "string"),
+            ("topic", "string"),
+        ],
+    ),
+    "MET_WITH_LOBBYIST": (
+        "Senator",
+        "Lobbyist",
+        [
+            ("date", "string"),
+            ("topic", "string"),
+            ("senatorName", "string"),
+            ("lobbyistName", "string"),
+        ],
+    ),
+    "TRIP_FUNDED_BY": (
+        "Senator",
+        "Lobbyist",
+        [
+            ("destination", "string"),
+            ("purpose", "string"),
+            ("cost", "long"),
+            ("fundedBy", "string"),
+            ("invitedBy", "string"),
+            ("senatorName", "string"),
+            ("lobbyistName", "string"),
+        ],
+    ),
+    "RECEIVED_DONATION": (
+        "Senator",
+        "Lobbyist",
+        [
+            ("date", "string"),
+            ("occasion", "string"),
+            ("item", "string"),
+            ("donor", "string"),
+            ("senatorName", "string"),
+            ("lobbyistName", "string"),
+        ],
+    ),
+}
+
+
+@dataclass
+class ImportTables:
+    """Node and relationship rows ready to be written as import CSVs."""
+
+    nodes: Dict[str, Dict[str, dict]] = field(default_factory=dict)
+    relationships: Dict[str, Dict[Tuple, dict]] = field(default_factory=dict)
+    dropped: Dict[str, int] = field(default_factory=dict)
+
+    def add_node(self, label: str, node_id: str, props: dict, replace: bool = True):
+        nodes = self.nodes.setdefault(label, {})
+        if replace or node_id not in nodes:
+            nodes[node_id] = props
+
+    def add_relationship(self, rel_type: str, key: Tuple, props: dict):
+        # Keyed like the seeder's MERGE pattern, so the last write wins
+        self.relationships.setdefault(rel_type, {})[key] = props
+
+    def drop(self, reason: str):
+        self.dropped[reason] = self.dropped.get(reason, 0) + 1
+
+
+def build_import_tables(data: Dict[str, List[dict]]) -> ImportTables:
+    """Turn scraped datasets into deduplicated node and relationship rows.
+
+    Mirrors seed_neo4j semantics: authorships and votes need an existing
+    Senator and Law (rows that don't resolve are dropped and counted), while
+    lobby relationships create stub Senator/Lobbyist nodes like MERGE does.
+    Lobby rows are matched to senators through SenatorResolver, as the
+    seeder does (see seed_neo4j.resolve_lobby_senators).
+    """
+    tables = ImportTables()
+    resolver = SenatorResolver(data.get("senators", []))
+
+    for party in data.get("parties", []):
+        tables.add_node("Party", party["id"], party)
+
+    party_by_short_name = {
+        party.get("shortName"): party["id"] for party in data.get("parties", [])
+    }
+
+    for senator in data.get("senators", []):
+        tables.add_node("Senator", senator["id"], senator)
+        party_id = party_by_short_name.get(senator.get("party"))
+        if party_id:
+            tables.add_relationship("BELONGS_TO", (senator["id"], party_id), {})
+
+    law_by_boletin = {}
+    for law in data.get("laws", []):
+        tables.add_node("Law", law["id"], law)
+        law_by_boletin[law.get("boletin")] = law["id"]
+
+    law_ids = set(law_by_boletin.values())
+
+    for auth in data.get("authorships", []):
+        senator_id = resolver.resolve_record(auth)
+        if senator_id is None:
+            tables.drop("authorship: unknown senator")
+            continue
+        if auth.get("law_id") not in law_ids:
+            tables.drop("authorship: unknown law")
+            continue
+        tables.add_relationship(
+            "AUTHORED",
+            (senator_id, auth["law_id"], auth.get("role"), auth.get("date")),
+            {"role": auth.get("role"), "date": auth.get("date")},
+        )
+
+    for vote in data.get("votes", []):
+        senator_id = resolver.resolve_record(vote)
+        if senator_id is None:
+            tables.drop("vote: unknown senator")
+            continue
+        law_id = law_by_boletin.get(vote.get("law_boletin"))
+        if law_id is None:
+            tables.drop("vote: unknown law")
+            continue
+        tables.add_relationship(
+            "VOTED_ON",
+            (senator_id, law_id),
+            {
+                "session": vote.get("session"),
+                "date": vote.get("date"),
+                "vote": vote.get("vote"),
+                "topic": vote.get("topic"),
+            },
+        )
+
+    for lobbyist in data.get("lobbyists", []):
+        tables.add_node(
+            "Lobbyist",
+            lobbyist["id"],
+            {
+                "name": lobbyist.get("name"),
+                "type": lobbyist.get("type"),
+                "industry": lobbyist.get("industry"),
+                "registrationDate": lobbyist.get("registration_date"),
+                "origin": lobbyist.get("origin"),
+            },
+        )
+
+    lobby_sources = [
+        ("meetings", "MET_WITH_LOBBYIST"),
+        ("trips", "TRIP_FUNDED_BY"),
+        ("donations", "RECEIVED_DONATION"),
+    ]
+    for dataset, rel_type in lobby_sources:
+        for row in data.get(dataset, []):
+            senator_id = resolver.canonical_id(row)
+            lobbyist_id = row.get("lobbyist_id")
+            if not senator_id or not lobbyist_id:
+                tables.drop(f"{dataset}: missing id")
+                continue
+            tables.add_node(
+                "Senator",
+                senator_id,
+                {"name": row.get("senator_name"), "active": False},
+                replace=False,
+            )
+            tables.add_node(
+                "Lobbyist",
+                lobbyist_id,
+                {"name": row.get("lobbyist_name")},
+                replace=False,
+            )
+            tables.add_relationship(
+                rel_type,
+                (senator_id, lobbyist_id),
+                {
+                    "date": row.get("date"),
+                    "topic": row.get("topic"),
+                    "destination": row.get("destination"),
+                    "purpose": row.get("purpose"),
+                    "cost": row.get("cost"),
+                    "fundedBy": row.get("funded_by"),
+                    "invitedBy": row.get("invited_by"),
+                    "occasion": row.get("occasion"),
+                    "item": row.get("item"),
+                    "donor": row.get("donor"),
+                    "senatorName": row.get("senator_name"),
+                    "lobbyistName": row.get("lobbyist_name"),
+                },
+            )
+
+    return tables
+
+
+def _format_value(value, value_type: str) -> str:
+    """Format a value for neo4j-admin; empty fields are imported as null."""
+    if value is None:
+        return ""
+    if value_type == "boolean":
+        return "true" if value else "false"
+    if value_type == "long":
+        try:
+            return str(int(value))
+        except (TypeError, ValueError):
+            return ""
+    return str(value)
+
+
+def _typed_header(prop: str, value_type: str) -> str:
+    return prop if value_type == "string" else f"{prop}:{value_type}"
+
+
+def node_file(label: str) -> str:
+    return f"nodes_{label.lower()}.csv"
+
+
+def relationship_file(rel_type: str) -> str:
+    return f"rels_{rel_type.lower()}.csv"
+
+
+def write_import_csvs(tables: ImportTables, out_dir: str) -> Dict[str, int]:
+    """Write one CSV per label and relationship type plus a manifest.
+
+    Returns:
+        Row counts keyed by file name
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    counts = {}
+
+    for label, props in NODE_SPECS.items():
+        filename = node_file(label)
+        rows = tables.nodes.get(label, {})
+        path = os.path.join(out_dir, filename)
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(
+                [f"id:ID({label})"]
+                + [_typed_header(p, t) for p, t in props]
+                + [":LABEL"]
+            )
+            for node_id, node in rows.items():
+                writer.writerow(
+                    [node_id]
+                    + [_format_value(node.get(p), t) for p, t in props]
+                    + [label]
+                )
+        counts[filename] = len(rows)
+
+    for rel_type, (start, end, props) in REL_SPECS.items():
+        filename = relationship_file(rel_type)
+        rows = tables.relationships.get(rel_type, {})
+        path = os.path.join(out_dir, filename)
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(
+                [f":START_ID({start})"]
+                + [_typed_header(p, t) for p, t in props]
+                + [f":END_ID({end})", ":TYPE"]
+            )
+            for key, rel in rows.items():
+                writer.writerow(
+                    [key[0]]
+                    + [_format_value(rel.get(p), t) for p, t in props]
+                    + [key[1], rel_type]
+                )
+        counts[filename] = len(rows)
+
+    with open(os.path.join(out_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump({"files": counts, "dropped": tables.dropped}, f, indent=2)
+
+    return counts
+
+
+def _parse_id_column(header: str) -> Tuple[str, str]:
+    """Return (kind, id space) for an :ID/:START_ID/:END_ID header column."""
+    name, _, rest = header.partition(":")
+    kind, _, space = rest.partition("(")
+    return kind, space.rstrip(")")
+
+
+def validate_import_dir(out_dir: str) -> List[str]:
+    """Check the CSVs in ``out_dir`` before handing them to neo4j-admin.
+
+    Verifies that every file has well-formed rows, that node ids are unique
+    within their ID space and that every relationship endpoint exists.
+
+    Returns:
+        List of problems (empty if the export is consistent)
+    """
+    problems = []
+    ids: Dict[str, set] = {}
+
+    for label in NODE_SPECS:
+        path = os.path.join(out_dir, node_file(label))
+        if not os.path.exists(path):
+            problems.append(f"Missing node file {path}")
+            continue
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            _, space = _parse_id_column(header[0]) if header else ("", label)
+            seen = ids.setdefault(space, set())
+            for line, row in enumerate(reader, start=2):
+                if len(row) != len(header):
+                    problems.append(f"{path}:{line}: expected {len(header)} fields")
+                    continue
+                if not row[0]:
+                    problems.append(f"{path}:{line}: empty id")
+                elif row[0] in seen:
+                    problems.append(f"{path}:{line}: duplicate {space} id {row[0]}")
+                seen.add(row[0])
+
+    for rel_type in REL_SPECS:
+        path = os.path.join(out_dir, relationship_file(rel_type))
+        if not os.path.exists(path):
+            problems.append(f"Missing relationship file {path}")
+            continue
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            start_col = next(
+                (i for i, h in enumerate(header) if ":START_ID" in h), None
+            )
+            end_col = next((i for i, h in enumerate(header) if ":END_ID" in h), None)
+            if start_col is None or end_col is None:
+                problems.append(f"{path}: missing :START_ID/:END_ID header")
+                continue
+            _, start_space = _parse_id_column(header[start_col])
+            _, end_space = _parse_id_column(header[end_col])
+            for line, row in enumerate(reader, start=2):
+                if len(row) != len(header):
+                    problems.append(f"{path}:{line}: expected {len(header)} fields")
+                    continue
+                if row[start_col] not in ids.get(start_space, set()):
+                    problems.append(
+                        f"{path}:{line}: unknown {start_space} {row[start_col]}"
+                    )
+                if row[end_col] not in ids.get(end_space, set()):
+                    problems.append(
+                        f"{path}:{line}: unknown {end_space} {row[end_col]}"
+                    )
+
+    return problems
+
+
+def import_command(out_dir: str, database: str = "neo4j") -> str:
+    """Build the neo4j-admin command that imports the exported files."""
+    args = ["neo4j-admin database import full", database, "--overwrite-destination"]
+    for label in NODE_SPECS:
+        args.append(f"--nodes={os.path.join(out_dir, node_file(label))}")
+    for rel_type in REL_SPECS:
+        args.append(
+            f"--relationships={os.path.join(out_dir, relationship_file(rel_type))}"
+        )
+    return " \\\n  ".join(args)
+
+
+def main():
+    """Main entry point."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Export scraped data as neo4j-admin import CSVs"
+    )
+    parser.add_argument(
+        "--data-dir", default=DATA_DIR, help="Directory with scraped JSON files"
+    )
+    parser.add_argument(
+        "--out",
+        default=os.path.join(DATA_DIR, "import"),
+        help="Output directory for CSV files (default: data/import)",
+    )
+    parser.add_argument(
+        "--database", default="neo4j", help="Target database name (default: neo4j)"
+    )
+    parser.add_argument(
+        "--validate-only",
+        action="store_true",
+        help="Only validate an existing export directory",
+    )
+    args = parser.parse_args()
+
+    if not args.validate_only:
+        print(f"Building import tables from {args.data_dir}...")
+        tables = build_import_tables(load_scraped_data(args.data_dir))
+        counts = write_import_csvs(tables, args.out)
+        for filename, count in counts.items():
+            print(f"  - {filename}: {count} rows")
+        for reason, count in sorted(tables.dropped.items()):
+            print(f"  - dropped {count} rows ({reason})")
+
+    print(f"Validating {args.out}...")
+    problems = validate_import_dir(args.out)
+    if problems:
+        for problem in problems[:50]:
+            print(f"  {problem}")
+        print(f"Validation failed with {len(problems)} problems")
+        sys.exit(1)
+
+    print("Validation passed. Import with (database must be stopped):")
+    print(import_command(args.out, args.database))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,359 @@
+"""Node centrality on the full multi-relational graph, stored on nodes.
+
+Degree, weighted degree, PageRank and betweenness are computed offline so the
+frontend can order truncated node lists (``ORDER BY n.pagerank DESC``) by an
+indexed property instead of storage order.
+
+The graph is held as an edge list (COO) with both directions of every edge;
+a sparse matrix-vector product is one ``np.bincount`` over it, so PageRank
+power iteration and the level-synchronous BFS of Brandes' betweenness never
+build a dense adjacency matrix.
+"""
+
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from bulk_export import ImportTables
+from similarity import SimilarityResult
+
+CENTRALITY_LABELS = ("Senator", "Party", "Law", "Lobbyist")
+
+# Weight per relationship type; VOTED_SAME is further scaled by agreement
+CENTRALITY_WEIGHTS = {
+    "VOTED_SAME": 1.0,
+    "BELONGS_TO": 1.0,
+    "AUTHORED": 1.0,
+    "MET_WITH_LOBBYIST": 1.0,
+    "TRIP_FUNDED_BY": 1.0,
+    "RECEIVED_DONATION": 1.0,
+    "VOTED_ON": 0.25,
+}
+
+# Properties that get a range index per label, for index-backed ORDER BY
+INDEXED_PROPERTIES = ("pagerank",)
+
+# Upper bound on the (sources × directed edges) scratch arrays of betweenness
+BETWEENNESS_BUDGET = 8_000_000
+
+
+@dataclass
+class CentralityGraph:
+    """Weighted undirected graph stored as directed edges in both directions."""
+
+    ids: List[str]
+    labels: List[str]
+    src: np.ndarray
+    dst: np.ndarray
+    weights: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+def build_centrality_graph(
+    tables: ImportTables,
+    similarity: Optional[SimilarityResult] = None,
+    backbone: Optional[np.ndarray] = None,
+) -> CentralityGraph:
+    """Collect nodes and relationships, merging parallel edges.
+
+    Args:
+        tables: Deduplicated node and relationship rows
+        similarity: Voting similarity for VOTED_SAME edges
+        backbone: Similarity pairs to use (see backbone.sparsify); the full
+            similarity graph is nearly complete and would swamp every other
+            relationship. Defaults to ``similarity.mask``
+    """
+    ids, labels, index = [], [], {}
+    for label in CENTRALITY_LABELS:
+        for node_id in tables.nodes.get(label, {}):
+            if node_id not in index:
+                index[node_id] = len(ids)
+                ids.append(node_id)
+                labels.append(label)
+
+    pairs: Dict[Tuple[int, int], float] = defaultdict(float)
+
+    def add(start: str, end: str, weight: float):
+        i, j = index.get(start), index.get(end)
+        if i is None or j is None or i == j:
+            return
+        pairs[(min(i, j), max(i, j))] += weight
+
+    for rel_type, rels in tables.relationships.items():
+        weight = CENTRALITY_WEIGHTS.get(rel_type)
+        if weight:
+            for key in rels:
+                add(key[0], key[1], weight)
+
+    if similarity is not None:
+        mask = similarity.mask if backbone is None else similarity.mask & backbone
+        rows, cols = np.nonzero(mask)
+        for i, j in zip(rows.tolist(), cols.tolist()):
+            add(
+                similarity.senator_ids[i],
+                similarity.senator_ids[j],
+                CENTRALITY_WEIGHTS["VOTED_SAME"] * float(similarity.agreement[i, j]),
+            )
+
+    edges = np.array(list(pairs), dtype=np.int64).reshape(-1, 2)
+    weights = np.array(list(pairs.values()), dtype=np.float64)
+    return CentralityGraph(
+        ids=ids,
+        labels=labels,
+        src=np.concatenate([edges[:, 0], edges[:, 1]]),
+        dst=np.concatenate([edges[:, 1], edges[:, 0]]),
+        weights=np.concatenate([weights, weights]),
+    )
+
+
+def pagerank(
+    graph: CentralityGraph,
+    damping: float = 0.85,
+    tol: float = 1e-10,
+    max_iter: int = 200,
+) -> np.ndarray:
+    """Weighted PageRank by power iteration.
+
+    Each step is x' = d·Aᵀ D⁻¹ x + (d·dangling + 1 - d) / n, where D holds
+    weighted degrees and the mass of isolated nodes is spread uniformly.
+
+    Returns:
+        Scores summing to 1
+    """
+    size = len(graph)
+    if size == 0:
+        return np.zeros(0)
+
+    strength = np.bincount(graph.src, weights=graph.weights, minlength=size)
+    dangling = strength == 0
+    inverse = np.zeros(size)
+    inverse[~dangling] = 1.0 / strength[~dangling]
+
+    scores = np.full(size, 1.0 / size)
+    for _ in range(max_iter):
+        flow = np.bincount(
+            graph.dst,
+            weights=graph.weights * (scores * inverse)[graph.src],
+            minlength=size,
+        )
+        updated = damping * flow + (
+            damping * scores[dangling].sum() + 1.0 - damping
+        ) / size
+        converged = np.abs(updated - scores).sum() < tol * size
+        scores = updated
+        if converged:
+            break
+    return scores / scores.sum()
+
+
+def _spread(
+    values: np.ndarray, src: np.ndarray, starts: np.ndarray, targets: np.ndarray
+) -> np.ndarray:
+    """Batched sparse product over dst-sorted edges: one row per source."""
+    out = np.zeros_like(values)
+    if starts.size:
+        out[:, targets] = np.add.reduceat(values[:, src], starts, axis=1)
+    return out
+
+
+def betweenness(
+    graph: CentralityGraph,
+    samples: Optional[int] = None,
+    seed: int = 42,
+) -> np.ndarray:
+    """Normalized shortest-path betweenness (hop distances, Brandes).
+
+    Sources are processed in batches: the BFS advances one level for every
+    source of the batch at once with a sparse product, counting shortest
+    paths on the way down and accumulating dependencies on the way back up.
+
+    Args:
+        graph: Graph to score
+        samples: Estimate from this many random sources (scaled up) instead
+            of all of them, for graphs where exact betweenness is too slow
+        seed: Seed for the source sample
+
+    Returns:
+        Betweenness per node, normalized by (n - 1)(n - 2) / 2
+    """
+    size = len(graph)
+    if size < 3:
+        return np.zeros(size)
+
+    order = np.argsort(graph.dst, kind="stable")
+    src, dst = graph.src[order], graph.dst[order]
+    starts = np.flatnonzero(np.r_[True, dst[1:] != dst[:-1]]) if dst.size else dst
+    targets = dst[starts]
+
+    sources = np.arange(size)
+    if samples is not None and samples < size:
+        sources = np.sort(
+            np.random.default_rng(seed).choice(size, samples, replace=False)
+        )
+    batch_size = max(1, min(len(sources), BETWEENNESS_BUDGET // max(len(src), 1)))
+
+    scores = np.zeros(size)
+    for first in range(0, len(sources), batch_size):
+        batch = sources[first : first + batch_size]
+        rows = np.arange(len(batch))
+        dist = np.full((len(batch), size), -1, dtype=np.int64)
+        sigma = np.zeros((len(batch), size))
+        dist[rows, batch] = 0
+        sigma[rows, batch] = 1.0
+
+        # Forward: count shortest paths level by level
+        frontier = dist == 0
+        level = 0
+        while frontier.any():
+            paths = _spread(np.where(frontier, sigma, 0.0), src, starts, targets)
+            level += 1
+            frontier = (dist < 0) & (paths > 0)
+            dist[frontier] = level
+            sigma[frontier] = paths[frontier]
+
+        # Backward: δ(v) = σ(v) Σ_{w one level below v} (1 + δ(w)) / σ(w)
+        delta = np.zeros_like(sigma)
+        safe_sigma = np.where(sigma > 0, sigma, 1.0)
+        for depth in range(level - 2, 0, -1):
+            below = np.where(dist == depth + 1, (1.0 + delta) / safe_sigma, 0.0)
+            at = dist == depth
+            delta[at] = (sigma * _spread(below, src, starts, targets))[at]
+        scores += delta.sum(axis=0)
+
+    scores *= size / len(sources)
+    # Undirected: every path was counted from both ends
+    return scores / 2 / ((size - 1) * (size - 2) / 2)
+
+
+def compute_centrality(
+    graph: CentralityGraph, samples: Optional[int] = None
+) -> Dict[str, np.ndarray]:
+    """Every score per node, keyed by the node property it is stored in."""
+    size = len(graph)
+    return {
+        "degree": np.bincount(graph.src, minlength=size),
+        "weightedDegree": np.bincount(
+            graph.src, weights=graph.weights, minlength=size
+        ),
+        "pagerank": pagerank(graph),
+        "betweenness": betweenness(graph, samples=samples),
+    }
+
+
+def write_centrality(
+    driver, writer, graph: CentralityGraph, scores: Dict[str, np.ndarray]
+):
+    """Store the scores on every node, one batch per label, and index them."""
+    with driver.session() as session:
+        for label in CENTRALITY_LABELS:
+            for prop in INDEXED_PROPERTIES:
+                # Labels and properties are constants, never data
+                session.run(
+                    f"CREATE INDEX {label.lower()}_{prop} IF NOT EXISTS "
+                    f"FOR (n:{label}) ON (n.{prop})"
+                ).consume()
+
+    by_label = defaultdict(list)
+    for i, (node_id, label) in enumerate(zip(graph.ids, graph.labels)):
+        by_label[label].append(
+            {
+                "id": node_id,
+                "degree": int(scores["degree"][i]),
+                "weightedDegree": round(float(scores["weightedDegree"][i]), 4),
+                "pagerank": float(scores["pagerank"][i]),
+                "betweenness": float(scores["betweenness"][i]),
+            }
+        )
+
+    for label, rows in by_label.items():
+        query = f"""
+        UNWIND $rows AS row
+        MATCH (n:{label} {{id: row.id}})
+        SET n.degree = row.degree,
+            n.weightedDegree = row.weightedDegree,
+            n.pagerank = row.pagerank,
+            n.betweenness = row.betweenness
+        """
+        stats = writer.write(query, rows, param="rows")
+        print(f"  {label}: {stats.summary()}")
+
+
+def main():
+    """Main entry point."""
+    import argparse
+
+    from backbone import sparsify
+    from bulk_export import build_import_tables
+    from config import DATA_DIR
+    from scraped_data import load_scraped_data
+    from similarity import compute_similarity
+    from vote_matrix import build_vote_matrix
+
+    parser = argparse.ArgumentParser(
+        description="Compute node centrality on the full graph"
+    )
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument(
+        "--samples",
+        type=int,
+        help="Estimate betweenness from this many sources (default: exact)",
+    )
+    parser.add_argument("--top", type=int, default=5, help="Nodes to list per label")
+    parser.add_argument(
+        "--neo4j", action="store_true", help="Write the scores to Neo4j"
+    )
+    args = parser.parse_args()
+
+    data = load_scraped_data(args.data_dir)
+    if not data.get("senators"):
+        print("No scraped data found")
+        sys.exit(1)
+
+    similarity, backbone = None, None
+    if data.get("votes"):
+        matrix = build_vote_matrix(data["votes"], data["senators"])
+        similarity = compute_similarity(matrix, kappa=True)
+        backbone = sparsify(similarity, data["senators"]).mask
+
+    start = time.perf_counter()
+    graph = build_centrality_graph(build_import_tables(data), similarity, backbone)
+    scores = compute_centrality(graph, samples=args.samples)
+    print(
+        f"{len(graph)} nodes, {len(graph.src) // 2} edges "
+        f"in {time.perf_counter() - start:.2f}s"
+    )
+
+    for label in CENTRALITY_LABELS:
+        members = sorted(
+            (i for i, node_label in enumerate(graph.labels) if node_label == label),
+            key=lambda i: -scores["pagerank"][i],
+        )
+        print(f"  {label}:")
+        for i in members[: args.top]:
+            print(
+                f"    {graph.ids[i]}: pagerank {scores['pagerank'][i]:.4f}, "
+                f"betweenness {scores['betweenness'][i]:.4f}, "
+                f"degree {scores['degree'][i]}"
+            )
+
+    if args.neo4j:
+        from neo4j import GraphDatabase
+
+        from config import NEO4J_PASSWORD, NEO4J_URI, NEO4J_USERNAME
+        from neo4j_batch import BatchWriter
+
+        driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USERNAME, NEO4J_PASSWORD))
+        try:
+            write_centrality(driver, BatchWriter(driver), graph, scores)
+        finally:
+            driver.close()
+
+
+if __name__ == "__main__":
+    main()
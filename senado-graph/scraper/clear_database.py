@@ -83,5 +83,16 @@ def clear_database():
             driver.close()
 
 
-if __name__ == "__main__":
+def main():
+    """Main entry point."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Delete every node and relationship in Neo4j, after a prompt"
+    )
+    parser.parse_args()
     clear_database()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,317 @@
+"""Louvain community detection on the senator voting-similarity graph."""
+
+import json
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from similarity import SimilarityResult
+
+# Assign clusters and per-cluster stats computed by detect_communities
+CLUSTER_QUERY = """
+UNWIND $clusters AS cluster
+MERGE (c:Cluster {id: cluster.id})
+SET c.size = cluster.size,
+    c.avgAgreement = cluster.avgAgreement,
+    c.density = cluster.density,
+    c.partyBreakdown = cluster.partyBreakdown,
+    c.modularityContribution = cluster.modularityContribution,
+    c.modularity = cluster.modularity,
+    c.runId = cluster.runId
+"""
+
+SENATOR_CLUSTER_QUERY = """
+UNWIND $senators AS row
+MATCH (s:Senator {id: row.id})
+SET s.clusterId = row.clusterId,
+    s.clusterRunId = row.runId
+"""
+
+
+@dataclass
+class Communities:
+    """Partition of senators into voting clusters."""
+
+    senator_ids: List[str]
+    labels: np.ndarray
+    modularity: float
+    clusters: List[dict] = field(default_factory=list)
+
+    def assignments(self) -> Dict[str, int]:
+        return dict(zip(self.senator_ids, self.labels.tolist()))
+
+
+def modularity(
+    weights: np.ndarray, labels: np.ndarray, resolution: float = 1.0
+) -> float:
+    """Newman modularity of a partition of a weighted undirected graph."""
+    two_m = weights.sum()
+    if two_m <= 0:
+        return 0.0
+    membership = np.eye(labels.max() + 1)[labels]
+    internal = np.trace(membership.T @ weights @ membership)
+    community_degree = membership.T @ weights.sum(axis=1)
+    return float(
+        internal / two_m - resolution * np.sum(community_degree**2) / two_m**2
+    )
+
+
+def _local_moving(
+    weights: np.ndarray, rng: np.random.Generator, resolution: float
+) -> np.ndarray:
+    """Move nodes to the neighbouring community with the best modularity gain.
+
+    Each node's links to every community are one ``bincount`` over its row,
+    so a sweep costs O(n²) array work instead of a Python loop per edge.
+    """
+    size = len(weights)
+    labels = np.arange(size)
+    degree = weights.sum(axis=1)
+    two_m = degree.sum()
+    community_degree = degree.copy()
+    self_loops = np.diag(weights)
+
+    for _ in range(100):
+        moved = False
+        for i in rng.permutation(size):
+            current = labels[i]
+            links = np.bincount(labels, weights=weights[i], minlength=size)
+            links[current] -= self_loops[i]
+            community_degree[current] -= degree[i]
+
+            gain = links - resolution * community_degree * degree[i] / two_m
+            # Only communities i is linked to (plus staying put) are candidates
+            candidates = links > 0
+            candidates[current] = True
+            gain[~candidates] = -np.inf
+            best = int(np.argmax(gain))
+            if gain[best] <= gain[current] + 1e-12:
+                best = current
+
+            community_degree[best] += degree[i]
+            if best != current:
+                labels[i] = best
+                moved = True
+        if not moved:
+            break
+
+    return np.unique(labels, return_inverse=True)[1]
+
+
+def _split_disconnected(weights: np.ndarray, labels: np.ndarray) -> np.ndarray:
+    """Split communities whose members are not connected inside the community.
+
+    Louvain can leave a community held together only by nodes that moved
+    away; Leiden's refinement guarantees connected communities, and this
+    gives the same guarantee for the final partition.
+    """
+    labels = labels.copy()
+    next_label = labels.max() + 1 if labels.size else 0
+    for community in np.unique(labels):
+        members = np.flatnonzero(labels == community)
+        inside = weights[np.ix_(members, members)] > 0
+        unseen = set(range(len(members)))
+        first = True
+        while unseen:
+            stack = [unseen.pop()]
+            component = []
+            while stack:
+                node = stack.pop()
+                component.append(node)
+                for neighbor in np.flatnonzero(inside[node]).tolist():
+                    if neighbor in unseen:
+                        unseen.remove(neighbor)
+                        stack.append(neighbor)
+            if not first:
+                labels[members[component]] = next_label
+                next_label += 1
+            first = False
+    return labels
+
+
+def louvain(
+    weights: np.ndarray, seed: int = 42, resolution: float = 1.0
+) -> np.ndarray:
+    """Louvain community detection on a dense symmetric weight matrix.
+
+    Args:
+        weights: Non-negative symmetric matrix (nodes × nodes)
+        seed: Seed for the node visiting order, so reruns on the same data
+            return the same partition
+        resolution: Higher values give more, smaller communities
+
+    Returns:
+        Community label per node, numbered from 0
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    size = len(weights)
+    if size == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    rng = np.random.default_rng(seed)
+    labels = np.arange(size)
+    level = weights
+
+    while True:
+        level_labels = _local_moving(level, rng, resolution)
+        if level_labels.max() + 1 == len(level):
+            break
+        labels = level_labels[labels]
+        # Collapse communities into nodes: W' = Mᵀ W M
+        membership = np.eye(level_labels.max() + 1)[level_labels]
+        level = membership.T @ level @ membership
+
+    labels = _split_disconnected(weights, labels)
+    return np.unique(labels, return_inverse=True)[1]
+
+
+def similarity_weights(result: SimilarityResult, weight: str = "kappa") -> np.ndarray:
+    """Symmetric weight matrix over the pairs that pass the similarity mask.
+
+    Args:
+        result: Similarity matrices
+        weight: ``agreement`` or ``kappa`` (negative kappa is clipped to 0)
+    """
+    values = result.kappa if weight == "kappa" else result.agreement
+    if values is None:
+        raise ValueError(f"Similarity result has no {weight} matrix")
+    upper = np.where(result.mask, np.clip(values, 0.0, None), 0.0)
+    return upper + upper.T
+
+
+def detect_communities(
+    result: SimilarityResult,
+    senators: Optional[List[dict]] = None,
+    weight: str = "kappa",
+    seed: int = 42,
+    resolution: float = 1.0,
+) -> Communities:
+    """Cluster senators on the full weighted similarity graph.
+
+    Cluster ids are ordered by size (largest first), then by the smallest
+    member id, so they stay stable while the partition does.
+
+    Args:
+        result: Similarity matrices
+        senators: Current senators; when given, only they are clustered and
+            their parties are used for the party breakdown
+        weight: Edge weight, ``kappa`` or ``agreement``. Raw agreement is
+            high for almost every pair, which leaves little structure for
+            modularity to find; kappa discounts agreement expected by chance
+        seed: Seed for the Louvain node order
+        resolution: Louvain resolution parameter
+    """
+    weights = similarity_weights(result, weight)
+    senator_ids = list(result.senator_ids)
+    parties = {}
+
+    if senators:
+        parties = {s["id"]: s.get("party") or "Unknown" for s in senators}
+        keep = [i for i, senator_id in enumerate(senator_ids) if senator_id in parties]
+        weights = weights[np.ix_(keep, keep)]
+        senator_ids = [senator_ids[i] for i in keep]
+        agreement = result.agreement[np.ix_(keep, keep)]
+        mask = result.mask[np.ix_(keep, keep)]
+    else:
+        agreement = result.agreement
+        mask = result.mask
+
+    raw = louvain(weights, seed=seed, resolution=resolution)
+    order = sorted(
+        range(raw.max() + 1 if raw.size else 0),
+        key=lambda c: (
+            -int(np.sum(raw == c)),
+            min(senator_ids[i] for i in np.flatnonzero(raw == c)),
+        ),
+    )
+    relabel = np.empty(len(order), dtype=np.int64)
+    relabel[order] = np.arange(len(order))
+    labels = relabel[raw] if raw.size else raw
+
+    total = modularity(weights, labels, resolution) if labels.size else 0.0
+    two_m = weights.sum()
+    degree = weights.sum(axis=1)
+    pair_mask = mask | mask.T
+
+    clusters = []
+    for cluster_id in range(len(order)):
+        members = np.flatnonzero(labels == cluster_id)
+        block = np.ix_(members, members)
+        possible = len(members) * (len(members) - 1)
+        linked = pair_mask[block]
+        contribution = 0.0
+        if two_m > 0:
+            contribution = float(
+                weights[block].sum() / two_m
+                - resolution * (degree[members].sum() / two_m) ** 2
+            )
+        clusters.append(
+            {
+                "id": cluster_id,
+                "size": len(members),
+                "avgAgreement": (
+                    round(float(agreement[block][linked].mean()), 4)
+                    if linked.any()
+                    else 0.0
+                ),
+                "density": (
+                    round(float(linked.sum()) / possible, 4) if possible else 0.0
+                ),
+                "partyBreakdown": dict(
+                    Counter(parties.get(senator_ids[i], "Unknown") for i in members)
+                ),
+                "modularityContribution": round(contribution, 4),
+            }
+        )
+
+    return Communities(
+        senator_ids=senator_ids,
+        labels=labels,
+        modularity=round(total, 4),
+        clusters=clusters,
+    )
+
+
+def write_communities(driver, writer, communities: Communities):
+    """Write Cluster nodes and ``clusterId`` on Senator nodes.
+
+    Clusters and assignments from previous runs are removed once the new
+    ones are committed.
+    """
+    run_id = str(uuid.uuid4())
+    clusters = [
+        {
+            **cluster,
+            # Neo4j properties can't hold maps
+            "partyBreakdown": json.dumps(cluster["partyBreakdown"], ensure_ascii=False),
+            "modularity": communities.modularity,
+            "runId": run_id,
+        }
+        for cluster in communities.clusters
+    ]
+    senators = [
+        {"id": senator_id, "clusterId": cluster_id, "runId": run_id}
+        for senator_id, cluster_id in communities.assignments().items()
+    ]
+
+    stats = writer.write(CLUSTER_QUERY, clusters, param="clusters")
+    print(f"  {stats.summary()}")
+    stats = writer.write(SENATOR_CLUSTER_QUERY, senators, param="senators")
+    print(f"  {stats.summary()}")
+
+    with driver.session() as session:
+        session.run(
+            "MATCH (c:Cluster) WHERE c.runId <> $run_id DETACH DELETE c",
+            run_id=run_id,
+        ).consume()
+        session.run(
+            """
+            MATCH (s:Senator)
+            WHERE s.clusterId IS NOT NULL AND s.clusterRunId <> $run_id
+            REMOVE s.clusterId, s.clusterRunId
+            """,
+            run_id=run_id,
+        ).consume()
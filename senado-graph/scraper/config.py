@@ -1,15 +1,42 @@
-"""Configuration for the scraper module."""
+"""Configuration for the scraper module.
+
+Importing this module has no side effects beyond reading a ``.env`` file,
+and python-dotenv is only imported when there is one. Commands that write
+files call ``ensure_dirs()``.
+"""
 
 import os
-from dotenv import load_dotenv
 
-load_dotenv()
+
+def _find_env_file():
+    """Nearest ``.env`` in this directory or a parent, like find_dotenv."""
+    directory = os.path.dirname(os.path.abspath(__file__))
+    while True:
+        path = os.path.join(directory, ".env")
+        if os.path.isfile(path):
+            return path
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return None
+        directory = parent
+
+
+_ENV_FILE = _find_env_file()
+if _ENV_FILE:
+    from dotenv import load_dotenv
+
+    load_dotenv(_ENV_FILE)
 
 # Neo4j configuration
 NEO4J_URI = os.getenv("NEO4J_URI", "bolt://localhost:7687")
 NEO4J_USERNAME = os.getenv("NEO4J_USERNAME", "neo4j")
 NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD", "password")
 
+# Neo4j write batching
+NEO4J_BATCH_SIZE = int(os.getenv("NEO4J_BATCH_SIZE", "1000"))
+NEO4J_BATCH_RETRIES = int(os.getenv("NEO4J_BATCH_RETRIES", "5"))
+NEO4J_PARALLEL_BATCHES = int(os.getenv("NEO4J_PARALLEL_BATCHES", "1"))
+
 # Scraping configuration
 BASE_URL = "https://www.senado.cl"
 SENATORS_URL = f"{BASE_URL}/appsenado/index.php?mo=senadores&ac=listado"
@@ -23,7 +50,22 @@ LOBBY_DONATIONS_URL = f"{LOBBY_API_BASE}?mo=lobby&ac=GetDonativos"
 
 # Request configuration
 REQUEST_TIMEOUT = 30
-REQUEST_DELAY = 1  # Delay between requests in seconds
+
+# Requests per second to each host, shared by every scraper thread and
+# process on the machine (see rate_limit.py), and the burst allowed after
+# an idle period. Bucket files go to RATE_LIMIT_DIR (default: a directory
+# in the system temp dir).
+REQUESTS_PER_SECOND = float(os.getenv("REQUESTS_PER_SECOND", "2"))
+REQUEST_BURST = int(os.getenv("REQUEST_BURST", "4"))
+RATE_LIMIT_DIR = os.getenv("RATE_LIMIT_DIR", "")
+
+# API responses are shared by concurrent requests for the same URL and kept
+# this many seconds, up to RESULT_CACHE_SIZE of them (see single_flight.py)
+RESULT_CACHE_TTL = float(os.getenv("RESULT_CACHE_TTL", "300"))
+RESULT_CACHE_SIZE = int(os.getenv("RESULT_CACHE_SIZE", "256"))
+
+# Requests the refresh scheduler may send per hour, across all tasks
+SCHEDULER_REQUESTS_PER_HOUR = int(os.getenv("SCHEDULER_REQUESTS_PER_HOUR", "120"))
 
 # Retry configuration (exponential backoff)
 MAX_RETRIES = 0
@@ -36,6 +78,19 @@ IMAGES_DIR = os.path.join(
     os.path.dirname(__file__), "..", "static", "images", "senators"
 )
 
-# Ensure directories exist
-os.makedirs(DATA_DIR, exist_ok=True)
-os.makedirs(IMAGES_DIR, exist_ok=True)
+# Work queue shared by scrape workers: a SQLite file, or "neo4j" to keep it
+# in the project database (see work_queue.py)
+WORK_QUEUE_URL = os.getenv(
+    "WORK_QUEUE_URL", os.path.join(DATA_DIR, "work_queue.sqlite")
+)
+
+# Industry keywords used to classify lobby and law texts (see industry.py)
+INDUSTRY_TAXONOMY_PATH = os.getenv(
+    "INDUSTRY_TAXONOMY", os.path.join(os.path.dirname(__file__), "industries.json")
+)
+
+
+def ensure_dirs():
+    """Create the data and image directories if they are missing."""
+    os.makedirs(DATA_DIR, exist_ok=True)
+    os.makedirs(IMAGES_DIR, exist_ok=True)
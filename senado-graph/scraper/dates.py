@@ -0,0 +1,142 @@
+"""Normalize the dates found in Senate sources to ISO ``YYYY-MM-DD``.
+
+Roll calls, bills and the lobby registry use DD/MM/YYYY, meeting origins and
+donations ISO dates, and some cells carry extra text around the date. Every
+date field is converted once, at ingest, so filtering and sorting downstream
+are plain string comparisons.
+
+A single precompiled regex recognizes both orders (with ``/``, ``-`` or
+``.`` separators) anywhere in the string, and results are cached per raw
+string: registry tables repeat the same few dates on every row.
+"""
+
+import datetime
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+# Day-first or year-first, with any of the separators the sources use
+DATE_PATTERN = re.compile(
+    r"(?<!\d)(?:(?P<day>\d{1,2})[/.-](?P<month>\d{1,2})[/.-](?P<year>\d{4})"
+    r"|(?P<iso_year>\d{4})[/.-](?P<iso_month>\d{1,2})[/.-](?P<iso_day>\d{1,2}))"
+    r"(?!\d)"
+)
+
+# Date fields per dataset, as written by the scrapers
+DATE_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "laws": ("dateProposed",),
+    "authorships": ("date",),
+    "votes": ("date",),
+    "lobbyists": ("registration_date",),
+    "meetings": ("date",),
+    "trips": ("date",),
+    "donations": ("date",),
+}
+
+
+def _valid(year: int, month: int, day: int) -> Optional[str]:
+    try:
+        return datetime.date(year, month, day).isoformat()
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=4096)
+def to_iso(raw: Optional[str]) -> Optional[str]:
+    """ISO date found in ``raw``, or None if there is none.
+
+    Day-first dates that aren't valid as such are read month-first
+    (MM/DD/YYYY), as the previous strptime chain did.
+    """
+    if not raw:
+        return None
+    match = DATE_PATTERN.search(raw)
+    if match is None:
+        return None
+    if match.group("year"):
+        year = int(match.group("year"))
+        day, month = int(match.group("day")), int(match.group("month"))
+        return _valid(year, month, day) or _valid(year, day, month)
+    return _valid(
+        int(match.group("iso_year")),
+        int(match.group("iso_month")),
+        int(match.group("iso_day")),
+    )
+
+
+def normalize_date(raw: Optional[str]) -> str:
+    """ISO form of ``raw``, or ``raw`` stripped if it holds no date."""
+    return to_iso(raw) or (raw or "").strip()
+
+
+def cutoff(days: int, today: Optional[datetime.date] = None) -> str:
+    """ISO date ``days`` days before ``today``."""
+    today = today or datetime.date.today()
+    return (today - datetime.timedelta(days=days)).isoformat()
+
+
+def is_within_days(raw: Optional[str], days: int = 30) -> bool:
+    """Whether ``raw`` falls in the last ``days`` days.
+
+    Values without a recognizable date are kept, so a layout change in a
+    source doesn't silently drop its rows.
+    """
+    iso = to_iso(raw)
+    return iso is None or iso >= cutoff(days)
+
+
+def normalize_records(records: List[dict], fields: Tuple[str, ...]) -> int:
+    """Rewrite ``fields`` of every record to ISO in place.
+
+    Returns:
+        Number of values changed
+    """
+    changed = 0
+    for record in records:
+        for name in fields:
+            value = record.get(name)
+            iso = to_iso(value)
+            if iso and iso != value:
+                record[name] = iso
+                changed += 1
+    return changed
+
+
+def main():
+    """Main entry point."""
+    import argparse
+    import json
+    import os
+
+    from config import DATA_DIR
+    from scraped_data import DATA_FILES, load_dataset
+
+    parser = argparse.ArgumentParser(
+        description="Rewrite the date fields of scraped JSON files to ISO"
+    )
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Only count the dates to rewrite"
+    )
+    args = parser.parse_args()
+
+    total = 0
+    for dataset, fields in DATE_FIELDS.items():
+        records = load_dataset(dataset, args.data_dir)
+        changed = normalize_records(records, fields)
+        total += changed
+        if not changed:
+            continue
+        print(f"  {dataset}: {changed} dates")
+        if not args.dry_run:
+            path = os.path.join(args.data_dir, DATA_FILES[dataset])
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(records, f, ensure_ascii=False, indent=2)
+                f.write("\n")
+
+    action = "Found" if args.dry_run else "Rewrote"
+    print(f"{action} {total} non-ISO dates")
+
+
+if __name__ == "__main__":
+    main()
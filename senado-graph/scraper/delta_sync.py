@@ -0,0 +1,154 @@
+"""Fingerprint-based diff between a new scrape and the last-applied snapshot."""
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from bulk_export import NODE_SPECS, REL_SPECS, ImportTables
+from config import DATA_DIR
+
+SNAPSHOT_PATH = os.path.join(DATA_DIR, "sync_snapshot.json")
+
+# Relationship properties that are part of the MERGE pattern (and the key)
+REL_MERGE_KEYS = {"AUTHORED": ["role", "date"]}
+
+
+def fingerprint(record: dict) -> str:
+    """Stable hash of a record's properties."""
+    payload = json.dumps(record, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def node_props(label: str, node: dict) -> dict:
+    """Project a node onto the properties written for its label."""
+    return {prop: node.get(prop) for prop, _ in NODE_SPECS[label]}
+
+
+def rel_props(rel_type: str, rel: dict) -> dict:
+    """Project a relationship onto the properties written for its type."""
+    _, _, props = REL_SPECS[rel_type]
+    return {prop: rel.get(prop) for prop, _ in props}
+
+
+def encode_key(key) -> str:
+    return json.dumps(list(key), ensure_ascii=False)
+
+
+@dataclass
+class ChangeSet:
+    """Inserts, updates and deletes for one label or relationship type."""
+
+    inserts: List[dict] = field(default_factory=list)
+    updates: List[dict] = field(default_factory=list)
+    deletes: List[dict] = field(default_factory=list)
+
+    def __len__(self):
+        return len(self.inserts) + len(self.updates) + len(self.deletes)
+
+
+@dataclass
+class Delta:
+    """All changes between a snapshot and a new scrape."""
+
+    nodes: Dict[str, ChangeSet] = field(default_factory=dict)
+    relationships: Dict[str, ChangeSet] = field(default_factory=dict)
+    snapshot: Dict[str, Dict[str, str]] = field(default_factory=dict)
+
+    def is_empty(self) -> bool:
+        return not any(self.nodes.values()) and not any(self.relationships.values())
+
+    def summary(self) -> str:
+        lines = []
+        for kind, changes in [("node", self.nodes), ("rel", self.relationships)]:
+            for name, change in changes.items():
+                if change:
+                    lines.append(
+                        f"  - {kind} {name}: +{len(change.inserts)} "
+                        f"~{len(change.updates)} -{len(change.deletes)}"
+                    )
+        return "\n".join(lines) if lines else "  (no changes)"
+
+
+def load_snapshot(path: str = SNAPSHOT_PATH) -> Dict[str, Dict[str, str]]:
+    """Load the fingerprints of the last applied sync (empty if none)."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_snapshot(snapshot: Dict[str, Dict[str, str]], path: str = SNAPSHOT_PATH):
+    """Atomically replace the snapshot file."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(snapshot, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def _diff(old: Dict[str, str], current: Dict[str, tuple]) -> tuple:
+    """Diff fingerprints; ``current`` maps key -> (fingerprint, row).
+
+    Returns:
+        Tuple of (ChangeSet without deletes, snapshot keys that disappeared)
+    """
+    change = ChangeSet()
+    for key, (fp, row) in current.items():
+        previous = old.get(key)
+        if previous is None:
+            change.inserts.append(row)
+        elif previous != fp:
+            change.updates.append(row)
+    return change, sorted(old.keys() - current.keys())
+
+
+def compute_delta(tables: ImportTables, snapshot: Dict[str, Dict[str, str]]) -> Delta:
+    """Compare ``tables`` with ``snapshot`` and collect only real changes.
+
+    Node rows are ``{"id": ..., "props": {...}}``; relationship rows are
+    ``{"start": ..., "end": ..., "key": {...}, "props": {...}}`` where ``key``
+    holds the properties in the MERGE pattern. Deleted rows carry the
+    snapshot key so they can be matched without the original record.
+    """
+    delta = Delta()
+
+    for label in NODE_SPECS:
+        name = f"node:{label}"
+        current = {}
+        for node_id, node in tables.nodes.get(label, {}).items():
+            props = node_props(label, node)
+            current[node_id] = (fingerprint(props), {"id": node_id, "props": props})
+        change, removed = _diff(snapshot.get(name, {}), current)
+        change.deletes = [{"id": node_id} for node_id in removed]
+        delta.nodes[label] = change
+        delta.snapshot[name] = {key: fp for key, (fp, _) in current.items()}
+
+    for rel_type in REL_SPECS:
+        name = f"rel:{rel_type}"
+        merge_keys = REL_MERGE_KEYS.get(rel_type, [])
+        current = {}
+        for key, rel in tables.relationships.get(rel_type, {}).items():
+            props = rel_props(rel_type, rel)
+            row = {
+                "start": key[0],
+                "end": key[1],
+                "key": {prop: props.get(prop) for prop in merge_keys},
+                "props": props,
+            }
+            current[encode_key(key)] = (fingerprint(props), row)
+        change, removed = _diff(snapshot.get(name, {}), current)
+        for encoded in removed:
+            key = json.loads(encoded)
+            change.deletes.append(
+                {
+                    "start": key[0],
+                    "end": key[1],
+                    "key": dict(zip(merge_keys, key[2:])),
+                }
+            )
+        delta.relationships[rel_type] = change
+        delta.snapshot[name] = {key: fp for key, (fp, _) in current.items()}
+
+    return delta
@@ -0,0 +1,459 @@
+"""Versioned, Cytoscape-ready snapshot of the graph for the web app.
+
+The snapshot is written in two encodings:
+
+- ``graph-<version>.json``: ``{"nodes": [...], "edges": [...]}`` exactly as
+  the frontend's GraphData type
+- ``graph-<version>.bin``: the same graph column by column, with a shared
+  string table and integer edge endpoints (see ``encode_columnar``)
+
+``manifest.json`` points at the current version; the version is a hash of
+the graph content, so it doubles as the HTTP ETag and only changes when the
+graph does.
+"""
+
+import hashlib
+import json
+import os
+import struct
+import sys
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from bulk_export import ImportTables, build_import_tables
+from config import DATA_DIR
+from layout import LAYOUT_PATH, load_layout
+from similarity import SimilarityResult
+from similarity_state import STATE_PATH, SimilarityState
+
+SNAPSHOT_DIR = os.path.join(DATA_DIR, "snapshot")
+SCHEMA_VERSION = 1
+
+# Columnar file: magic, then the header length and the JSON header
+COLUMNAR_MAGIC = b"SGC1"
+
+# Versions kept on disk so clients holding an older manifest can finish
+KEEP_VERSIONS = 3
+
+# Agreement threshold for VOTED_SAME edges when no backbone is given
+MIN_AGREEMENT = 0.7
+
+# Lobby relationships are shown as lobbyist -> senator "lobby" edges
+LOBBY_RELATIONSHIPS = ("MET_WITH_LOBBYIST", "TRIP_FUNDED_BY", "RECEIVED_DONATION")
+
+_NULL_INDEX = 0xFFFFFFFF
+
+
+def _node(node_id: str, node_type: str, label, position, **data) -> dict:
+    node = {
+        "data": {
+            "id": node_id,
+            "label": label or node_id,
+            "type": node_type,
+            **{k: v for k, v in data.items() if v is not None},
+        }
+    }
+    if position:
+        node["position"] = {"x": position[0], "y": position[1]}
+    return node
+
+
+def build_snapshot(
+    tables: ImportTables,
+    similarity: Optional[SimilarityResult] = None,
+    clusters: Optional[Dict[str, int]] = None,
+    positions: Optional[Dict[str, List[float]]] = None,
+    backbone: Optional[np.ndarray] = None,
+) -> dict:
+    """Build GraphData (nodes and edges) for active senators and their links.
+
+    Args:
+        tables: Deduplicated node and relationship rows
+        similarity: Voting similarity for VOTED_SAME edges
+        clusters: Senator id -> clusterId
+        positions: Node id -> [x, y] from the offline layout
+        backbone: Similarity pairs to emit as voted_same edges (see
+            backbone.sparsify); defaults to pairs above MIN_AGREEMENT
+    """
+    clusters = clusters or {}
+    positions = positions or {}
+    nodes, edges = [], []
+
+    parties = tables.nodes.get("Party", {})
+    senators = {
+        senator_id: senator
+        for senator_id, senator in tables.nodes.get("Senator", {}).items()
+        if senator.get("active")
+    }
+    party_of = {
+        start: end
+        for start, end in tables.relationships.get("BELONGS_TO", {})
+        if start in senators
+    }
+    members = {}
+    for party_id in party_of.values():
+        members[party_id] = members.get(party_id, 0) + 1
+
+    for senator_id, senator in senators.items():
+        party = parties.get(party_of.get(senator_id), {})
+        nodes.append(
+            _node(
+                senator_id,
+                "senator",
+                senator.get("name"),
+                positions.get(senator_id),
+                color=party.get("color"),
+                party=senator.get("party"),
+                region=senator.get("region"),
+                clusterId=clusters.get(senator_id),
+            )
+        )
+    for law_id, law in tables.nodes.get("Law", {}).items():
+        nodes.append(
+            _node(
+                law_id,
+                "law",
+                law.get("boletin"),
+                positions.get(law_id),
+                status=law.get("status"),
+                topic=law.get("topic"),
+            )
+        )
+    for party_id, party in parties.items():
+        nodes.append(
+            _node(
+                party_id,
+                "party",
+                party.get("shortName"),
+                positions.get(party_id),
+                color=party.get("color"),
+                ideology=party.get("ideology"),
+                memberCount=members.get(party_id, 0),
+            )
+        )
+    for lobbyist_id, lobbyist in tables.nodes.get("Lobbyist", {}).items():
+        nodes.append(
+            _node(
+                lobbyist_id,
+                "lobbyist",
+                lobbyist.get("name"),
+                positions.get(lobbyist_id),
+                lobbyistType=lobbyist.get("type"),
+                industry=lobbyist.get("industry"),
+            )
+        )
+
+    def add_edge(source: str, target: str, edge_type: str, **data):
+        edges.append(
+            {
+                "data": {
+                    "id": f"edge_{len(edges)}",
+                    "source": source,
+                    "target": target,
+                    "type": edge_type,
+                    **{k: v for k, v in data.items() if v is not None},
+                }
+            }
+        )
+
+    for start, end, *_ in tables.relationships.get("AUTHORED", {}):
+        add_edge(start, end, "authored")
+    for start, end in tables.relationships.get("BELONGS_TO", {}):
+        add_edge(start, end, "belongs_to")
+    lobby_pairs = {}
+    for rel_type in LOBBY_RELATIONSHIPS:
+        for start, end, *_ in tables.relationships.get(rel_type, {}):
+            lobby_pairs.setdefault((end, start), rel_type.lower())
+    for (lobbyist_id, senator_id), relation in lobby_pairs.items():
+        add_edge(lobbyist_id, senator_id, "lobby", relation=relation)
+
+    if similarity is not None:
+        rows, cols = np.nonzero(
+            similarity.mask & backbone
+            if backbone is not None
+            else similarity.mask & (similarity.agreement > MIN_AGREEMENT)
+        )
+        for i, j in zip(rows.tolist(), cols.tolist()):
+            first, second = sorted(
+                (similarity.senator_ids[i], similarity.senator_ids[j])
+            )
+            add_edge(
+                first,
+                second,
+                "voted_same",
+                agreement=round(float(similarity.agreement[i, j]), 4),
+            )
+
+    for (start, end), rel in tables.relationships.get("VOTED_ON", {}).items():
+        add_edge(start, end, "voted_on", vote=rel.get("vote"))
+
+    node_ids = {node["data"]["id"] for node in nodes}
+    edges = [
+        edge
+        for edge in edges
+        if edge["data"]["source"] in node_ids and edge["data"]["target"] in node_ids
+    ]
+    for i, edge in enumerate(edges):
+        edge["data"]["id"] = f"edge_{i}"
+
+    return {"nodes": nodes, "edges": edges}
+
+
+def snapshot_version(graph: dict) -> str:
+    """Content hash of the graph, used as the version and ETag."""
+    payload = json.dumps(graph, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _column(values: list, strings: Dict[str, int]) -> tuple:
+    """Encode one property column as (encoding, dtype, array)."""
+    present = [v for v in values if v is not None]
+    if present and all(isinstance(v, bool) for v in present):
+        array = np.array(
+            [255 if v is None else int(v) for v in values], dtype=np.uint8
+        )
+        return "bool", "u8", array
+    if present and all(
+        isinstance(v, (int, float)) and not isinstance(v, bool) for v in present
+    ):
+        array = np.array(
+            [np.nan if v is None else v for v in values], dtype=np.float32
+        )
+        return "number", "f32", array
+    indexes = []
+    for v in values:
+        if v is None:
+            indexes.append(_NULL_INDEX)
+        else:
+            indexes.append(strings.setdefault(str(v), len(strings)))
+    return "string", "u32", np.array(indexes, dtype=np.uint32)
+
+
+def encode_columnar(graph: dict, version: str) -> bytes:
+    """Encode GraphData as a compact columnar binary.
+
+    Layout: ``SGC1``, a little-endian uint32 header length, the UTF-8 JSON
+    header, then 4-byte aligned little-endian column arrays. The header
+    holds the string table and, for each column, its encoding (``string``
+    indexes into the table with 0xFFFFFFFF for null, ``number`` is float32
+    with NaN for null, ``bool`` is uint8 with 255 for null, ``node`` indexes
+    into the node list), dtype, byte offset and length. Edge ids are not
+    stored; they are ``edge_<index>``.
+    """
+    strings: Dict[str, int] = {}
+    body = bytearray()
+    header = {
+        "format": "senadograph-columnar",
+        "schemaVersion": SCHEMA_VERSION,
+        "version": version,
+    }
+
+    def add_array(array: np.ndarray) -> dict:
+        while len(body) % 4:
+            body.append(0)
+        offset = len(body)
+        body.extend(array.astype(array.dtype.newbyteorder("<")).tobytes())
+        return {"offset": offset, "length": len(array)}
+
+    def encode_rows(rows: List[dict], skip=()) -> dict:
+        keys = []
+        for row in rows:
+            for key in row:
+                if key not in keys and key not in skip:
+                    keys.append(key)
+        columns = {}
+        for key in keys:
+            encoding, dtype, array = _column([row.get(key) for row in rows], strings)
+            columns[key] = {"encoding": encoding, "dtype": dtype, **add_array(array)}
+        return columns
+
+    node_rows = []
+    for node in graph["nodes"]:
+        row = dict(node["data"])
+        if "position" in node:
+            row["x"], row["y"] = node["position"]["x"], node["position"]["y"]
+        node_rows.append(row)
+    header["nodes"] = {"count": len(node_rows), "columns": encode_rows(node_rows)}
+
+    index = {row["id"]: i for i, row in enumerate(node_rows)}
+    edge_rows = [edge["data"] for edge in graph["edges"]]
+    edge_columns = {}
+    for key in ("source", "target"):
+        array = np.array([index[row[key]] for row in edge_rows], dtype=np.uint32)
+        edge_columns[key] = {"encoding": "node", "dtype": "u32", **add_array(array)}
+    edge_columns.update(encode_rows(edge_rows, skip=("id", "source", "target")))
+    header["edges"] = {"count": len(edge_rows), "columns": edge_columns}
+
+    header["strings"] = sorted(strings, key=strings.get)
+    header_bytes = json.dumps(header, ensure_ascii=False).encode("utf-8")
+    header_bytes += b" " * (-(len(COLUMNAR_MAGIC) + 4 + len(header_bytes)) % 4)
+    return (
+        COLUMNAR_MAGIC + struct.pack("<I", len(header_bytes)) + header_bytes + body
+    )
+
+
+def write_snapshot(
+    graph: dict, out_dir: str = SNAPSHOT_DIR, views: Optional[Dict[str, dict]] = None
+) -> dict:
+    """Write both encodings and point manifest.json at them.
+
+    Coarser level-of-detail views (see graph_views.py) are written as
+    ``graph-<version>-<level>.json``. Files are immutable per version; the
+    manifest is replaced atomically and only the last ``KEEP_VERSIONS``
+    versions are kept.
+
+    Returns:
+        The manifest
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    version = snapshot_version(graph)
+    files = {"json": f"graph-{version}.json", "columnar": f"graph-{version}.bin"}
+    views = {level: view for level, view in (views or {}).items() if view is not graph}
+    view_files = {level: f"graph-{version}-{level}.json" for level in views}
+
+    payloads = [
+        (files["json"], lambda: json.dumps(graph, ensure_ascii=False).encode("utf-8")),
+        (files["columnar"], lambda: encode_columnar(graph, version)),
+    ] + [
+        (view_files[level], lambda v=view: json.dumps(v, ensure_ascii=False).encode())
+        for level, view in views.items()
+    ]
+    for filename, payload in payloads:
+        path = os.path.join(out_dir, filename)
+        if not os.path.exists(path):
+            with open(f"{path}.tmp", "wb") as f:
+                f.write(payload())
+            os.replace(f"{path}.tmp", path)
+
+    previous = load_manifest(out_dir)
+    history = [version] + [
+        v for v in previous.get("history", []) if v != version
+    ][: KEEP_VERSIONS - 1]
+    manifest = {
+        "schemaVersion": SCHEMA_VERSION,
+        "version": version,
+        "generatedAt": (
+            previous["generatedAt"]
+            if previous.get("version") == version
+            else datetime.now(timezone.utc).isoformat(timespec="seconds")
+        ),
+        "files": files,
+        "counts": {"nodes": len(graph["nodes"]), "edges": len(graph["edges"])},
+        "views": {
+            level: {
+                "file": view_files[level],
+                "nodes": len(view["nodes"]),
+                "edges": len(view["edges"]),
+            }
+            for level, view in views.items()
+        },
+        "history": history,
+    }
+    manifest_path = os.path.join(out_dir, "manifest.json")
+    with open(f"{manifest_path}.tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(f"{manifest_path}.tmp", manifest_path)
+
+    for filename in os.listdir(out_dir):
+        name, _ = os.path.splitext(filename)
+        version_part = name[len("graph-") :].split("-")[0]
+        if name.startswith("graph-") and version_part not in history:
+            os.remove(os.path.join(out_dir, filename))
+
+    return manifest
+
+
+def load_manifest(out_dir: str = SNAPSHOT_DIR) -> dict:
+    try:
+        with open(os.path.join(out_dir, "manifest.json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def export_snapshot(
+    data: Dict[str, list],
+    out_dir: str = SNAPSHOT_DIR,
+    state_path: str = STATE_PATH,
+    layout_path: str = LAYOUT_PATH,
+) -> dict:
+    """Build and write the snapshot for the scraped datasets.
+
+    Similarity, clusters and the voted_same backbone are derived from the
+    saved pairwise counters, the same way the seeder and sync do, so they
+    match what is in Neo4j (or from the votes, before anything was seeded);
+    positions come from the saved layout.
+    """
+    from backbone import sparsify
+    from communities import detect_communities
+    from graph_views import build_views
+
+    similarity, clusters, backbone = None, None, None
+    if data.get("votes"):
+        state = SimilarityState.load(state_path)
+        if not state.senator_ids:
+            # Nothing seeded yet: count the votes the way the seeder would
+            from vote_matrix import build_vote_matrix
+
+            state.fold(build_vote_matrix(data["votes"], data.get("senators")))
+        similarity = state.result()
+        clusters = detect_communities(similarity, data.get("senators")).assignments()
+        backbone = sparsify(similarity, data.get("senators")).mask
+    graph = build_snapshot(
+        build_import_tables(data),
+        similarity,
+        clusters,
+        load_layout(layout_path),
+        backbone,
+    )
+    return write_snapshot(graph, out_dir, views=build_views(graph))
+
+
+def main():
+    """Main entry point."""
+    import argparse
+
+    from scraped_data import load_scraped_data
+
+    parser = argparse.ArgumentParser(
+        description="Export the Cytoscape graph snapshot served by /api/graph"
+    )
+    parser.add_argument(
+        "--data-dir", default=DATA_DIR, help="Directory with scraped JSON files"
+    )
+    parser.add_argument(
+        "--out", default=SNAPSHOT_DIR, help="Output directory (default: data/snapshot)"
+    )
+    parser.add_argument(
+        "--state",
+        default=STATE_PATH,
+        help="Saved similarity counters (default: data/similarity_state.npz)",
+    )
+    parser.add_argument(
+        "--layout",
+        default=LAYOUT_PATH,
+        help="Saved node positions (default: data/layout.json)",
+    )
+    args = parser.parse_args()
+
+    data = load_scraped_data(args.data_dir)
+    if not data.get("senators"):
+        print("No senator data found")
+        sys.exit(1)
+
+    manifest = export_snapshot(data, args.out, args.state, args.layout)
+    print(
+        f"Snapshot {manifest['version']}: {manifest['counts']['nodes']} nodes, "
+        f"{manifest['counts']['edges']} edges"
+    )
+    for kind, filename in manifest["files"].items():
+        size = os.path.getsize(os.path.join(args.out, filename))
+        print(f"  - {kind}: {filename} ({size / 1024:.1f} KiB)")
+    for level, view in manifest["views"].items():
+        print(f"  - {level}: {view['nodes']} nodes, {view['edges']} edges")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""Level-of-detail views of the graph snapshot built from super-nodes.
+
+Each level replaces groups of nodes with one super-node whose ``members``
+lists the ids it stands for in the next, more detailed level; edges between
+groups are merged into one ``aggregate`` edge carrying the number of
+underlying edges and their mean agreement where there is one:
+
+- ``parties``: party and voting-cluster super-nodes (a few dozen nodes)
+- ``senators``: individual senators and parties, with lobbyists grouped
+  into one super-node per industry
+- ``full``: the snapshot itself
+"""
+
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional
+
+# Levels from coarsest to most detailed
+LEVELS = ("parties", "senators", "full")
+
+
+def _super_node(
+    node_id: str,
+    node_type: str,
+    label: str,
+    members: List[str],
+    positions: Dict[str, dict],
+    **data,
+) -> dict:
+    """Node standing for ``members``, placed at their centroid if known."""
+    node = {
+        "data": {
+            "id": node_id,
+            "label": label,
+            "type": node_type,
+            "aggregate": True,
+            "memberCount": len(members),
+            "members": sorted(members),
+            **{k: v for k, v in data.items() if v is not None},
+        }
+    }
+    placed = [positions[member] for member in members if member in positions]
+    if placed:
+        node["position"] = {
+            "x": round(sum(p["x"] for p in placed) / len(placed), 1),
+            "y": round(sum(p["y"] for p in placed) / len(placed), 1),
+        }
+    return node
+
+
+def aggregate_edges(
+    edges: List[dict], group_of: Callable[[str], Optional[str]], relation: str
+) -> List[dict]:
+    """Merge edges whose endpoints fall in the same pair of groups.
+
+    Edges with an endpoint outside every group, or inside a single group,
+    are dropped. Pairs are undirected and oriented by sorted group id.
+    """
+    count: Dict[tuple, int] = defaultdict(int)
+    agreement: Dict[tuple, List[float]] = defaultdict(list)
+    for edge in edges:
+        source = group_of(edge["data"]["source"])
+        target = group_of(edge["data"]["target"])
+        if source is None or target is None or source == target:
+            continue
+        key = tuple(sorted((source, target)))
+        count[key] += 1
+        if edge["data"].get("agreement") is not None:
+            agreement[key].append(edge["data"]["agreement"])
+
+    rows = []
+    for (source, target), weight in sorted(count.items()):
+        data = {
+            "source": source,
+            "target": target,
+            "type": "aggregate",
+            "relation": relation,
+            "weight": weight,
+        }
+        values = agreement.get((source, target))
+        if values:
+            data["agreement"] = round(sum(values) / len(values), 4)
+        rows.append({"data": data})
+    return rows
+
+
+def _membership_edges(
+    groups: Dict[str, List[str]], group_of: Callable[[str], Optional[str]]
+) -> List[dict]:
+    """Aggregate edges from each group to the groups its members belong to."""
+    weights: Dict[tuple, int] = defaultdict(int)
+    for group_id, members in groups.items():
+        for member in members:
+            other = group_of(member)
+            if other is not None:
+                weights[(group_id, other)] += 1
+    return [
+        {
+            "data": {
+                "source": source,
+                "target": target,
+                "type": "aggregate",
+                "relation": "membership",
+                "weight": weight,
+            }
+        }
+        for (source, target), weight in sorted(weights.items())
+    ]
+
+
+def _with_edge_ids(nodes: List[dict], edges: List[dict]) -> dict:
+    for i, edge in enumerate(edges):
+        edge["data"] = {"id": f"edge_{i}", **edge["data"]}
+    return {"nodes": nodes, "edges": edges}
+
+
+def build_views(graph: dict) -> Dict[str, dict]:
+    """Build every level of detail from a full snapshot graph.
+
+    Args:
+        graph: GraphData from graph_snapshot.build_snapshot
+
+    Returns:
+        GraphData per level in LEVELS
+    """
+    by_type = defaultdict(list)
+    for node in graph["nodes"]:
+        by_type[node["data"]["type"]].append(node)
+    edges_by_type = defaultdict(list)
+    for edge in graph["edges"]:
+        edges_by_type[edge["data"]["type"]].append(edge)
+    positions = {
+        node["data"]["id"]: node["position"]
+        for node in graph["nodes"]
+        if "position" in node
+    }
+
+    senators = {node["data"]["id"]: node for node in by_type["senator"]}
+    parties = {node["data"]["id"]: node for node in by_type["party"]}
+
+    party_of = {
+        edge["data"]["source"]: edge["data"]["target"]
+        for edge in edges_by_type["belongs_to"]
+        if edge["data"]["source"] in senators
+    }
+    party_members = defaultdict(list)
+    for senator_id, party_id in party_of.items():
+        party_members[party_id].append(senator_id)
+
+    cluster_of = {
+        senator_id: f"cluster_{node['data']['clusterId']}"
+        for senator_id, node in senators.items()
+        if node["data"].get("clusterId") is not None
+    }
+    cluster_members = defaultdict(list)
+    for senator_id, group in cluster_of.items():
+        cluster_members[group].append(senator_id)
+
+    industry_of = {
+        node["data"]["id"]: f"industry_{node['data'].get('industry') or 'other'}"
+        for node in by_type["lobbyist"]
+    }
+    industry_members = defaultdict(list)
+    for lobbyist_id, group in industry_of.items():
+        industry_members[group].append(lobbyist_id)
+
+    # Coarsest level: parties and voting clusters
+    nodes = [
+        _super_node(
+            party_id,
+            "party",
+            parties[party_id]["data"]["label"],
+            members,
+            positions,
+            color=parties[party_id]["data"].get("color"),
+            ideology=parties[party_id]["data"].get("ideology"),
+        )
+        for party_id, members in sorted(party_members.items())
+        if party_id in parties
+    ]
+    nodes += [
+        _super_node(
+            group,
+            "cluster",
+            f"Cluster {int(group.split('_')[1]) + 1}",
+            members,
+            positions,
+            clusterId=int(group.split("_")[1]),
+        )
+        for group, members in sorted(cluster_members.items())
+    ]
+    edges = aggregate_edges(edges_by_type["voted_same"], party_of.get, "voted_same")
+    edges += aggregate_edges(edges_by_type["voted_same"], cluster_of.get, "voted_same")
+    edges += _membership_edges(party_members, cluster_of.get)
+    parties_view = _with_edge_ids(nodes, edges)
+
+    # Middle level: senators and parties, lobbyists grouped by industry
+    nodes = list(senators.values()) + [
+        parties[party_id] for party_id in sorted(party_members) if party_id in parties
+    ]
+    nodes += [
+        _super_node(
+            group,
+            "industry",
+            group[len("industry_") :],
+            members,
+            positions,
+            industry=group[len("industry_") :],
+        )
+        for group, members in sorted(industry_members.items())
+    ]
+    edges = [
+        {"data": {k: v for k, v in edge["data"].items() if k != "id"}}
+        for edge_type in ("belongs_to", "voted_same")
+        for edge in edges_by_type[edge_type]
+    ]
+    edges += aggregate_edges(
+        edges_by_type["lobby"],
+        lambda node_id: node_id if node_id in senators else industry_of.get(node_id),
+        "lobby",
+    )
+    senators_view = _with_edge_ids(nodes, edges)
+
+    return {"parties": parties_view, "senators": senators_view, "full": graph}
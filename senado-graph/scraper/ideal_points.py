@@ -0,0 +1,330 @@
+"""Ideal points of senators estimated from roll calls.
+
+Votes are coded +1 (favor) and -1 (against); abstentions, pareos and
+absences are missing. Each senator i gets a position x_i in one or two
+dimensions and each votación j a cut (a_j, c_j) such that
+
+    y_ij ≈ c_j + a_j · x_i
+
+fitted by alternating ridge least squares over the observed cells only,
+starting from a truncated SVD of the centered, zero-filled matrix. Every
+half-step solves one small (d + 1) × (d + 1) system per senator or
+votación, batched with ``np.linalg.solve``.
+
+Positions are standardized and rotated to their principal axes; the first
+dimension is signed so that ANCHOR_PARTIES come out positive (right). A
+bootstrap over votaciones gives standard errors and 95% intervals.
+"""
+
+import sys
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from vote_matrix import VOTE_CODES, VoteMatrix
+
+# Parties whose senators get positive first-dimension scores
+ANCHOR_PARTIES = ("U.D.I.", "R.N.")
+
+# Votaciones whose minority side is smaller than this carry no information
+MIN_MINORITY = 0.025
+
+# Bootstrap replicates run by the seeder and the updater
+BOOTSTRAP_REPLICATES = 50
+
+IDEAL_POINTS_QUERY = """
+UNWIND $senators AS row
+MATCH (s:Senator {id: row.id})
+SET s.idealPoint = row.idealPoint,
+    s.idealPointSE = row.idealPointSE,
+    s.idealPointLow = row.idealPointLow,
+    s.idealPointHigh = row.idealPointHigh,
+    s.idealPoint2d = row.idealPoint2d,
+    s.idealPointVotes = row.votes
+"""
+
+
+@dataclass
+class IdealPoints:
+    """Estimated positions (senators × dimensions) and bootstrap spread."""
+
+    senator_ids: List[str]
+    positions: np.ndarray
+    votes: np.ndarray
+    se: Optional[np.ndarray] = None
+    low: Optional[np.ndarray] = None
+    high: Optional[np.ndarray] = None
+
+
+def vote_values(matrix: VoteMatrix) -> np.ndarray:
+    """+1 favor, -1 against, NaN for everything else."""
+    values = np.full(matrix.shape, np.nan)
+    values[matrix.codes == VOTE_CODES["favor"]] = 1.0
+    values[matrix.codes == VOTE_CODES["against"]] = -1.0
+    return values
+
+
+def informative(
+    values: np.ndarray, min_minority: float = MIN_MINORITY, min_votes: int = 10
+):
+    """Masks of contested votaciones and of senators with enough votes on them."""
+    yes = (values > 0).sum(axis=0)
+    no = (values < 0).sum(axis=0)
+    cast = yes + no
+    minority = np.minimum(yes, no) / np.maximum(cast, 1)
+    columns = (minority >= min_minority) & (np.minimum(yes, no) >= 1)
+    rows = (~np.isnan(values[:, columns])).sum(axis=1) >= min_votes
+    return rows, columns
+
+
+def _solve(
+    observed: np.ndarray, rhs: np.ndarray, factors: np.ndarray, ridge: float
+) -> np.ndarray:
+    """Ridge normal equations per row: (Σ_obs f fᵀ + ridge I) w = rhs.
+
+    Args:
+        observed: 0/1 mask (rows × cols)
+        rhs: Σ_obs t·f per row (rows × k)
+        factors: Design per column (cols × k)
+    """
+    k = factors.shape[1]
+    # Σ_j observed_ij f_j f_jᵀ for every row as one matrix product
+    outer = (factors[:, :, None] * factors[:, None, :]).reshape(len(factors), k * k)
+    gram = (observed @ outer).reshape(-1, k, k) + ridge * np.eye(k)
+    return np.linalg.solve(gram, rhs[..., None])[..., 0]
+
+
+def fit(
+    values: np.ndarray,
+    dims: int = 1,
+    iterations: int = 50,
+    ridge: float = 0.1,
+    tol: float = 1e-4,
+    start: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Alternating least squares on the observed cells.
+
+    Args:
+        values: +1/-1/NaN matrix (senators × votaciones)
+        dims: Number of dimensions
+        iterations: Maximum ALS sweeps
+        ridge: L2 penalty, keeps rarely-voting senators near the centre
+        tol: Stop when positions move less than this (RMS)
+        start: Initial positions (senators × dims), e.g. a previous fit
+
+    Returns:
+        Raw positions (senators × dims), before standardization
+    """
+    observed = (~np.isnan(values)).astype(np.float64)
+    targets = np.nan_to_num(values)
+    # Contiguous transposes for the votación half-steps
+    observed_t, targets_t = observed.T.copy(), targets.T.copy()
+
+    if start is None:
+        cast = np.maximum(observed.sum(axis=0), 1)
+        centered = (targets - targets.sum(axis=0) / cast) * observed
+        u, s, _ = np.linalg.svd(centered, full_matrices=False)
+        start = u[:, :dims] * s[:dims]
+    positions = np.asarray(start, dtype=np.float64)[:, :dims]
+    ones = np.ones((len(positions), 1))
+
+    for _ in range(iterations):
+        # Votación cuts given positions: [c_j, a_j]
+        design = np.hstack([ones, positions])
+        cuts = _solve(observed_t, targets_t @ design, design, ridge)
+        # Positions given cuts: Σ_obs (y_ij - c_j) a_j without an n × m temporary
+        intercepts, slopes = cuts[:, 0], cuts[:, 1:]
+        rhs = targets @ slopes - observed @ (intercepts[:, None] * slopes)
+        updated = _solve(observed, rhs, slopes, ridge)
+        moved = np.sqrt(np.mean((updated - positions) ** 2))
+        positions = updated
+        if moved < tol:
+            break
+    return positions
+
+
+def _normalize(
+    positions: np.ndarray, anchors: np.ndarray, reference: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """Standardize, rotate to principal axes and fix signs.
+
+    With ``reference`` (the main estimate) the positions of a bootstrap
+    replicate are instead aligned to it by orthogonal Procrustes, so
+    replicates are comparable.
+    """
+    positions = positions - positions.mean(axis=0)
+    if reference is not None:
+        u, _, vt = np.linalg.svd(positions.T @ reference)
+        positions = positions @ (u @ vt)
+        return positions / positions.std(axis=0).clip(1e-12) * reference.std(axis=0)
+
+    _, _, vt = np.linalg.svd(positions, full_matrices=False)
+    positions = positions @ vt.T
+    positions /= positions.std(axis=0).clip(1e-12)
+    for axis in range(positions.shape[1]):
+        column = positions[:, axis]
+        sign = np.sign(column[anchors].mean()) if anchors.any() else 0.0
+        if sign == 0:
+            sign = np.sign(column[np.argmax(np.abs(column))])
+        positions[:, axis] = column * (sign or 1.0)
+    return positions
+
+
+def estimate(
+    matrix: VoteMatrix,
+    senators: Optional[List[dict]] = None,
+    dims: int = 1,
+    bootstrap: int = 0,
+    seed: int = 42,
+    min_votes: int = 10,
+) -> IdealPoints:
+    """Estimate ideal points, optionally with a bootstrap over votaciones.
+
+    Args:
+        matrix: Vote matrix
+        senators: Senator records, used to find ANCHOR_PARTIES members
+        dims: 1 or 2 dimensions
+        bootstrap: Number of replicates (0 to skip)
+        seed: Seed for the bootstrap resampling
+        min_votes: Senators with fewer contested votes are left out
+    """
+    values = vote_values(matrix)
+    rows, columns = informative(values, min_votes=min_votes)
+    values = values[np.ix_(rows, columns)]
+    senator_ids = [s for s, keep in zip(matrix.senator_ids, rows) if keep]
+
+    party_of = {s["id"]: s.get("party") for s in senators or []}
+    anchors = np.array([party_of.get(s) in ANCHOR_PARTIES for s in senator_ids])
+    votes = (~np.isnan(values)).sum(axis=1)
+
+    if len(senator_ids) <= dims or values.shape[1] <= dims:
+        empty = np.zeros((len(senator_ids), dims))
+        return IdealPoints(senator_ids=senator_ids, positions=empty, votes=votes)
+
+    raw = fit(values, dims=dims)
+    positions = _normalize(raw, anchors)
+    result = IdealPoints(senator_ids=senator_ids, positions=positions, votes=votes)
+
+    if bootstrap:
+        rng = np.random.default_rng(seed)
+        replicates = np.empty((bootstrap,) + positions.shape)
+        for b in range(bootstrap):
+            sample = rng.integers(0, values.shape[1], values.shape[1])
+            replicate = fit(values[:, sample], dims=dims, iterations=10, start=raw)
+            replicates[b] = _normalize(replicate, anchors, reference=positions)
+        result.se = replicates.std(axis=0)
+        result.low, result.high = np.percentile(replicates, [2.5, 97.5], axis=0)
+
+    return result
+
+
+def ideal_point_rows(
+    one_d: IdealPoints, two_d: Optional[IdealPoints] = None
+) -> List[dict]:
+    """Rows for IDEAL_POINTS_QUERY, one per senator with a 1D estimate."""
+
+    def rounded(values: Optional[np.ndarray], i: int) -> Optional[float]:
+        return None if values is None else round(float(values[i, 0]), 4)
+
+    second: Dict[str, List[float]] = {}
+    if two_d is not None:
+        second = {
+            senator_id: [round(float(v), 4) for v in two_d.positions[i]]
+            for i, senator_id in enumerate(two_d.senator_ids)
+        }
+    return [
+        {
+            "id": senator_id,
+            "idealPoint": round(float(one_d.positions[i, 0]), 4),
+            "idealPointSE": rounded(one_d.se, i),
+            "idealPointLow": rounded(one_d.low, i),
+            "idealPointHigh": rounded(one_d.high, i),
+            "idealPoint2d": second.get(senator_id),
+            "votes": int(one_d.votes[i]),
+        }
+        for i, senator_id in enumerate(one_d.senator_ids)
+    ]
+
+
+def compute_ideal_points(
+    matrix: VoteMatrix,
+    senators: List[dict],
+    bootstrap: int = BOOTSTRAP_REPLICATES,
+    min_votes: int = 10,
+) -> List[dict]:
+    """1D (with bootstrap) and 2D estimates as IDEAL_POINTS_QUERY rows."""
+    one_d = estimate(
+        matrix, senators, dims=1, bootstrap=bootstrap, min_votes=min_votes
+    )
+    two_d = estimate(matrix, senators, dims=2, min_votes=min_votes)
+    return ideal_point_rows(one_d, two_d)
+
+
+def write_ideal_points(writer, rows: List[dict]):
+    """Store ideal points on Senator nodes."""
+    stats = writer.write(IDEAL_POINTS_QUERY, rows, param="senators")
+    print(f"  {stats.summary()}")
+
+
+def main():
+    """Main entry point."""
+    import argparse
+
+    from config import DATA_DIR
+    from scraped_data import load_dataset
+    from vote_matrix import build_vote_matrix
+
+    parser = argparse.ArgumentParser(
+        description="Estimate senator ideal points from roll calls"
+    )
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument(
+        "--bootstrap",
+        type=int,
+        default=BOOTSTRAP_REPLICATES,
+        help=f"Bootstrap replicates, 0 to skip (default: {BOOTSTRAP_REPLICATES})",
+    )
+    parser.add_argument("--min-votes", type=int, default=10)
+    parser.add_argument(
+        "--neo4j", action="store_true", help="Store ideal points on Senator nodes"
+    )
+    args = parser.parse_args()
+
+    votes = load_dataset("votes", args.data_dir)
+    if not votes:
+        print("No voting data found")
+        sys.exit(1)
+
+    senators = load_dataset("senators", args.data_dir)
+    matrix = build_vote_matrix(votes, senators)
+
+    start = time.perf_counter()
+    rows = compute_ideal_points(matrix, senators, args.bootstrap, args.min_votes)
+    print(f"{len(rows)} senators placed in {time.perf_counter() - start:.2f}s")
+
+    party_of = {s["id"]: s.get("party") for s in senators}
+    by_party: Dict[str, List[float]] = {}
+    for row in rows:
+        by_party.setdefault(party_of.get(row["id"]) or "?", []).append(
+            row["idealPoint"]
+        )
+    for party, points in sorted(by_party.items(), key=lambda p: np.mean(p[1])):
+        print(f"  {party}: {np.mean(points):+.2f} ({len(points)} senators)")
+
+    if args.neo4j:
+        from neo4j import GraphDatabase
+
+        from config import NEO4J_PASSWORD, NEO4J_URI, NEO4J_USERNAME
+        from neo4j_batch import BatchWriter
+
+        driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USERNAME, NEO4J_PASSWORD))
+        try:
+            write_ideal_points(BatchWriter(driver), rows)
+        finally:
+            driver.close()
+
+
+if __name__ == "__main__":
+    main()
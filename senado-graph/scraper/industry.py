@@ -0,0 +1,278 @@
+"""Keyword classifier for industries/sectors in free-text activity fields.
+
+The taxonomy (industries.json by default, see INDUSTRY_TAXONOMY_PATH) maps
+each industry to Spanish keywords. Keywords match whole words, or word
+prefixes when they end in ``*`` ("miner*" matches "minera" and "mineros");
+multi-word keywords match as phrases. Matching is case- and
+accent-insensitive.
+
+All keywords are compiled once into a single regex shaped as their trie
+(shared prefixes factored out, accented letters as character classes), so
+the regex engine walks the keyword automaton in one pass over the raw text:
+at each word start it branches on one character at a time instead of
+trying every keyword, and the text is never copied or normalized. The same
+classifier serves lobbyist activities, meeting topics and law
+topics/descriptions.
+"""
+
+import json
+import re
+import sys
+import time
+import unicodedata
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config import INDUSTRY_TAXONOMY_PATH
+
+# Industry assigned when no keyword matches
+DEFAULT_INDUSTRY = "other"
+
+# Free-text fields per dataset, classified by the benchmark
+TEXT_FIELDS = {
+    "meetings": ("topic",),
+    "trips": ("purpose", "funded_by"),
+    "donations": ("occasion", "item", "donor"),
+    "laws": ("title", "topic", "description"),
+}
+
+
+def fold(text: str) -> str:
+    """Lowercase and strip accents."""
+    text = (text or "").lower()
+    if text.isascii():
+        return text
+    decomposed = unicodedata.normalize("NFD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def _accent_variants() -> Dict[str, str]:
+    """Lowercase Latin-1 letters keyed by their unaccented form."""
+    variants: Dict[str, str] = {}
+    for code in range(0xC0, 0x100):
+        char = chr(code).lower()
+        base = fold(char)
+        if base != char and len(base) == 1:
+            variants[base] = variants.get(base, base) + char
+    return {base: "".join(sorted(set(chars))) for base, chars in variants.items()}
+
+
+ACCENT_VARIANTS = _accent_variants()
+
+
+def load_taxonomy(path: str = INDUSTRY_TAXONOMY_PATH) -> Dict[str, List[str]]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class IndustryClassifier:
+    """Multi-pattern matcher over an industry -> keywords taxonomy.
+
+    Ties between industries are broken by taxonomy order.
+    """
+
+    def __init__(self, taxonomy: Dict[str, List[str]]):
+        self.industries = list(taxonomy)
+        # Keyword index -> industry index, through the group closing its match
+        self._industry_of: Dict[str, int] = {}
+
+        # Trie over folded keywords; "" marks a whole-word end, "*" a prefix end
+        trie: dict = {}
+        for industry, keywords in enumerate(taxonomy.values()):
+            for keyword in keywords:
+                pattern = " ".join(fold(keyword.rstrip("*")).split())
+                if not pattern:
+                    continue
+                node = trie
+                for char in pattern:
+                    node = node.setdefault(char, {})
+                end = "*" if keyword.endswith("*") else ""
+                name = f"k{len(self._industry_of)}"
+                self._industry_of[name] = industry
+                node.setdefault(end, name)
+
+        # Text is lowercased before matching: IGNORECASE is several times
+        # slower on character classes
+        self._pattern = re.compile(rf"(?<!\w)(?:{self._compile(trie)})")
+
+    @staticmethod
+    def _compile(node: dict) -> str:
+        """Regex for a trie node, longest continuation tried first."""
+        branches = []
+        for char, child in node.items():
+            if char in ("", "*"):
+                continue
+            if char == " ":
+                head = r"\s+"
+            elif char in ACCENT_VARIANTS:
+                head = f"[{ACCENT_VARIANTS[char]}]"
+            else:
+                head = re.escape(char)
+            branches.append(head + IndustryClassifier._compile(child))
+        if "*" in node:
+            branches.append(rf"\w*(?P<{node['*']}>)")
+        if "" in node:
+            branches.append(rf"\b(?P<{node['']}>)")
+        if len(branches) == 1:
+            return branches[0]
+        return f"(?:{'|'.join(branches)})"
+
+    @classmethod
+    def from_file(cls, path: str = INDUSTRY_TAXONOMY_PATH) -> "IndustryClassifier":
+        return cls(load_taxonomy(path))
+
+    def __len__(self) -> int:
+        return len(self._industry_of)
+
+    def matches(self, text: str) -> List[int]:
+        """Industry index of every (non-overlapping) keyword occurrence."""
+        industry_of = self._industry_of
+        return [
+            industry_of[m.lastgroup] for m in self._pattern.finditer(text.lower())
+        ]
+
+    def classify(self, *texts: Optional[str]) -> List[Tuple[str, float]]:
+        """Matched industries with their share of keyword hits, best first."""
+        counts: Dict[int, int] = {}
+        for text in texts:
+            if text:
+                for industry in self.matches(text):
+                    counts[industry] = counts.get(industry, 0) + 1
+        total = sum(counts.values())
+        ranked = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+        return [
+            (self.industries[industry], round(count / total, 4))
+            for industry, count in ranked
+        ]
+
+    def industry(self, *texts: Optional[str], default: str = DEFAULT_INDUSTRY) -> str:
+        """Best-scoring industry across ``texts``, or ``default``."""
+        scores = self.classify(*texts)
+        return scores[0][0] if scores else default
+
+
+@lru_cache(maxsize=None)
+def get_classifier(path: str = INDUSTRY_TAXONOMY_PATH) -> IndustryClassifier:
+    """Classifier for the taxonomy at ``path``, built once per process."""
+    return IndustryClassifier.from_file(path)
+
+
+def classify_industry(*texts: Optional[str]) -> str:
+    """Best-scoring industry of ``texts`` under the default taxonomy."""
+    return get_classifier().industry(*texts)
+
+
+def _registry_texts(data: Dict[str, list]) -> Dict[str, List[str]]:
+    texts = {}
+    for dataset, fields in TEXT_FIELDS.items():
+        texts[dataset] = [
+            " ".join(row.get(field) or "" for field in fields)
+            for row in data.get(dataset) or []
+        ]
+    return texts
+
+
+def _substring_scan(taxonomy: Dict[str, List[str]], texts: Iterable[str]) -> int:
+    """Baseline: one ``in`` test per keyword and text, first match wins."""
+    keywords = [
+        (industry, [k.rstrip("*").lower() for k in words])
+        for industry, words in taxonomy.items()
+    ]
+    matched = 0
+    for text in texts:
+        text = text.lower()
+        for _, words in keywords:
+            if any(word in text for word in words):
+                matched += 1
+                break
+    return matched
+
+
+def _padded(taxonomy: Dict[str, List[str]], extra: int) -> Dict[str, List[str]]:
+    """Copy of ``taxonomy`` with ``extra`` random keywords spread over it."""
+    import random
+
+    rng = random.Random(42)
+    padded = {industry: list(words) for industry, words in taxonomy.items()}
+    industries = list(padded)
+    for k in range(extra):
+        word = "".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=rng.randint(4, 10)))
+        padded[industries[k % len(industries)]].append(word)
+    return padded
+
+
+def main():
+    """Main entry point."""
+    import argparse
+
+    from config import DATA_DIR
+    from scraped_data import load_dataset
+
+    parser = argparse.ArgumentParser(
+        description="Classify lobby and law texts by industry and time it"
+    )
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--taxonomy", default=INDUSTRY_TAXONOMY_PATH)
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=1,
+        help="Scan the registry this many times for the benchmark (default: 1)",
+    )
+    parser.add_argument(
+        "--extra-keywords",
+        type=int,
+        default=0,
+        help="Pad the taxonomy with this many random keywords to time scaling",
+    )
+    args = parser.parse_args()
+
+    data = {dataset: load_dataset(dataset, args.data_dir) for dataset in TEXT_FIELDS}
+    texts = _registry_texts(data)
+    corpus = [text for rows in texts.values() for text in rows]
+    if not corpus:
+        print("No lobby or law data found")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    taxonomy = load_taxonomy(args.taxonomy)
+    if args.extra_keywords:
+        taxonomy = _padded(taxonomy, args.extra_keywords)
+    classifier = IndustryClassifier(taxonomy)
+    print(
+        f"{len(classifier)} keywords in {len(classifier.industries)} industries, "
+        f"compiled in {(time.perf_counter() - start) * 1000:.1f}ms"
+    )
+
+    for dataset, rows in texts.items():
+        counts: Dict[str, int] = {}
+        for text in rows:
+            industry = classifier.industry(text)
+            counts[industry] = counts.get(industry, 0) + 1
+        top = sorted(counts.items(), key=lambda item: -item[1])[:5]
+        summary = ", ".join(f"{industry} {count}" for industry, count in top)
+        print(f"  {dataset} ({len(rows)}): {summary}")
+
+    corpus = corpus * max(args.repeat, 1)
+    size = sum(len(text) for text in corpus) / 1e6
+
+    start = time.perf_counter()
+    for text in corpus:
+        classifier.classify(text)
+    elapsed = time.perf_counter() - start
+    print(
+        f"Automaton: {len(corpus)} texts ({size:.2f} MB) in {elapsed:.3f}s, "
+        f"{len(corpus) / elapsed:,.0f} texts/s"
+    )
+
+    start = time.perf_counter()
+    _substring_scan(taxonomy, corpus)
+    elapsed = time.perf_counter() - start
+    print(
+        f"Substring scan: {elapsed:.3f}s, {len(corpus) / elapsed:,.0f} texts/s "
+        f"(first match only)"
+    )
+
+
+if __name__ == "__main__":
+    main()
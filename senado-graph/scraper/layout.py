@@ -0,0 +1,262 @@
+"""Offline force-directed layout stored as x/y on graph nodes."""
+
+import json
+import os
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from bulk_export import ImportTables
+from config import DATA_DIR
+from similarity import SimilarityResult
+
+LAYOUT_PATH = os.path.join(DATA_DIR, "layout.json")
+
+# Node labels shown on the graph page
+LAYOUT_LABELS = ("Senator", "Party", "Law", "Lobbyist")
+
+# Spring strength per relationship type; VOTED_SAME is further scaled by
+# agreement so close voting partners end up next to each other
+EDGE_WEIGHTS = {
+    "VOTED_SAME": 1.0,
+    "BELONGS_TO": 1.0,
+    "AUTHORED": 0.5,
+    "MET_WITH_LOBBYIST": 0.5,
+    "TRIP_FUNDED_BY": 0.5,
+    "RECEIVED_DONATION": 0.5,
+    "VOTED_ON": 0.05,
+}
+
+# Ideal distance between connected nodes, in Cytoscape pixels
+NODE_SPACING = 80.0
+
+
+@dataclass
+class LayoutGraph:
+    """Weighted undirected graph to lay out."""
+
+    ids: List[str]
+    labels: List[str]
+    edges: np.ndarray
+    weights: np.ndarray
+
+
+def build_layout_graph(
+    tables: ImportTables,
+    similarity: Optional[SimilarityResult] = None,
+    min_agreement: float = 0.7,
+) -> LayoutGraph:
+    """Collect the nodes and edges the graph page renders.
+
+    Args:
+        tables: Deduplicated node and relationship rows
+        similarity: Voting similarity; pairs with at least ``min_agreement``
+            become VOTED_SAME springs
+        min_agreement: Agreement a senator pair needs to pull together. The
+            page draws backbone edges (backbone.py), not these pairs
+    """
+    ids, labels, index = [], [], {}
+    for label in LAYOUT_LABELS:
+        for node_id in tables.nodes.get(label, {}):
+            if node_id not in index:
+                index[node_id] = len(ids)
+                ids.append(node_id)
+                labels.append(label)
+
+    springs: Dict[Tuple[int, int], float] = defaultdict(float)
+
+    def add(start: str, end: str, weight: float):
+        i, j = index.get(start), index.get(end)
+        if i is None or j is None or i == j:
+            return
+        springs[(min(i, j), max(i, j))] += weight
+
+    for rel_type, rels in tables.relationships.items():
+        weight = EDGE_WEIGHTS.get(rel_type)
+        if weight:
+            for key in rels:
+                add(key[0], key[1], weight)
+
+    if similarity is not None:
+        rows, cols = np.nonzero(
+            similarity.mask & (similarity.agreement >= min_agreement)
+        )
+        for i, j in zip(rows.tolist(), cols.tolist()):
+            add(
+                similarity.senator_ids[i],
+                similarity.senator_ids[j],
+                EDGE_WEIGHTS["VOTED_SAME"] * float(similarity.agreement[i, j]),
+            )
+
+    edges = np.array(list(springs), dtype=np.int64).reshape(-1, 2)
+    weights = np.array(list(springs.values()), dtype=np.float64)
+    return LayoutGraph(ids=ids, labels=labels, edges=edges, weights=weights)
+
+
+def _initial_positions(
+    graph: LayoutGraph,
+    previous: Dict[str, List[float]],
+    rng: np.random.Generator,
+    extent: float,
+) -> Tuple[np.ndarray, int]:
+    """Previous coordinates where known; new nodes start next to their
+    already-placed neighbours, or anywhere in the box if they have none.
+
+    Returns:
+        Tuple of (positions, mask of nodes placed from ``previous``)
+    """
+    size = len(graph.ids)
+    positions = rng.uniform(-extent / 2, extent / 2, size=(size, 2))
+    placed = np.zeros(size, dtype=bool)
+    for i, node_id in enumerate(graph.ids):
+        if node_id in previous:
+            positions[i] = previous[node_id]
+            placed[i] = True
+
+    warm = int(placed.sum())
+    if warm and warm < size:
+        sums = np.zeros((size, 2))
+        counts = np.zeros(size)
+        for a, b in ((0, 1), (1, 0)):
+            src, dst = graph.edges[:, a], graph.edges[:, b]
+            known = placed[src] & ~placed[dst]
+            np.add.at(sums, dst[known], positions[src[known]])
+            np.add.at(counts, dst[known], 1)
+        near = counts > 0
+        jitter = rng.normal(scale=NODE_SPACING / 4, size=(int(near.sum()), 2))
+        positions[near] = sums[near] / counts[near, None] + jitter
+
+    return positions, placed
+
+
+def fruchterman_reingold(
+    graph: LayoutGraph,
+    previous: Optional[Dict[str, List[float]]] = None,
+    iterations: int = 300,
+    gravity: float = 0.05,
+    seed: int = 42,
+    chunk_size: int = 1024,
+) -> np.ndarray:
+    """Vectorized Fruchterman–Reingold layout.
+
+    Repulsion between all pairs is computed in row chunks of
+    ``chunk_size × n`` so memory stays bounded; spring forces are summed per
+    node with ``np.bincount``. A weak pull toward the origin keeps unconnected
+    nodes from drifting off.
+
+    With ``previous`` positions the layout is incremental: known nodes keep
+    their coordinates exactly and only new nodes are laid out around them,
+    so the graph doesn't shift between syncs. If every node is known nothing
+    is computed. Delete the saved layout to lay everything out afresh.
+
+    Args:
+        graph: Graph to lay out
+        previous: Node id -> [x, y] from the last layout
+        iterations: Number of cooling steps
+        gravity: Strength of the pull toward the origin
+        seed: Seed for the initial placement of new nodes
+
+    Returns:
+        Positions (nodes × 2) in Cytoscape pixels
+    """
+    size = len(graph.ids)
+    if size == 0:
+        return np.zeros((0, 2))
+
+    k = NODE_SPACING
+    extent = k * np.sqrt(size)
+    rng = np.random.default_rng(seed)
+    positions, placed = _initial_positions(graph, previous or {}, rng, extent)
+    if placed.all():
+        return positions
+    # Placed nodes are held still; new ones start next to their neighbours,
+    # so they only need a short, cool run to settle
+    moving = (~placed).astype(np.float64)[:, None]
+
+    temperature = extent / 10
+    if placed.any():
+        temperature *= max(0.02, 1.0 - placed.mean())
+        iterations = max(iterations // 3, 50)
+    cooling = temperature / iterations
+
+    src, dst = graph.edges[:, 0], graph.edges[:, 1]
+    for _ in range(iterations):
+        x, y = positions[:, 0], positions[:, 1]
+        displacement = np.zeros_like(positions)
+
+        # Repulsion k² / d between every pair
+        for start in range(0, size, chunk_size):
+            rows = slice(start, start + chunk_size)
+            dx = x[rows, None] - x[None, :]
+            dy = y[rows, None] - y[None, :]
+            scale = k * k / np.maximum(dx * dx + dy * dy, 1e-4)
+            displacement[rows, 0] += (dx * scale).sum(axis=1)
+            displacement[rows, 1] += (dy * scale).sum(axis=1)
+
+        # Attraction w · d² / k along each edge
+        delta = positions[src] - positions[dst]
+        pull = delta * (graph.weights * np.hypot(delta[:, 0], delta[:, 1]) / k)[
+            :, None
+        ]
+        for axis in (0, 1):
+            displacement[:, axis] += np.bincount(
+                dst, weights=pull[:, axis], minlength=size
+            ) - np.bincount(src, weights=pull[:, axis], minlength=size)
+
+        displacement -= gravity * positions
+
+        length = np.maximum(np.hypot(displacement[:, 0], displacement[:, 1]), 0.01)
+        step = displacement * (np.minimum(length, temperature) / length)[:, None]
+        positions += step * moving
+        temperature = max(temperature - cooling, 0.01)
+
+    if placed.any():
+        return positions
+    return positions - positions.mean(axis=0)
+
+
+def load_layout(path: str = LAYOUT_PATH) -> Dict[str, List[float]]:
+    """Load the last layout (empty if none)."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_layout(positions: Dict[str, List[float]], path: str = LAYOUT_PATH):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(positions, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def compute_layout(
+    graph: LayoutGraph, previous: Optional[Dict[str, List[float]]] = None, **kwargs
+) -> Dict[str, List[float]]:
+    """Lay out ``graph`` and return node id -> [x, y] rounded to 0.1 px."""
+    positions = fruchterman_reingold(graph, previous=previous, **kwargs)
+    return {
+        node_id: [round(float(x), 1), round(float(y), 1)]
+        for node_id, (x, y) in zip(graph.ids, positions)
+    }
+
+
+def write_layout(writer, graph: LayoutGraph, positions: Dict[str, List[float]]):
+    """Store ``x``/``y`` on every laid-out node, one batch per label."""
+    by_label = defaultdict(list)
+    for node_id, label in zip(graph.ids, graph.labels):
+        x, y = positions[node_id]
+        by_label[label].append({"id": node_id, "x": x, "y": y})
+
+    for label, rows in by_label.items():
+        # Labels come from LAYOUT_LABELS, never from data
+        query = f"""
+        UNWIND $rows AS row
+        MATCH (n:{label} {{id: row.id}})
+        SET n.x = row.x, n.y = row.y
+        """
+        stats = writer.write(query, rows, param="rows")
+        print(f"  {label}: {stats.summary()}")
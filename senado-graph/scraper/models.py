@@ -216,12 +216,50 @@ class VotingSimilarity:
     senator1_id: str
     senator2_id: str
     agreement: float
+    jaccard: Optional[float] = None
+    kappa: Optional[float] = None
+    common_votes: int = 0
+
+    def to_dict(self):
+        return {
+            "senator1_id": self.senator1_id,
+            "senator2_id": self.senator2_id,
+            "agreement": self.agreement,
+            "jaccard": self.jaccard,
+            "kappa": self.kappa,
+            "commonVotes": self.common_votes,
+        }
 
 
 @dataclass
 class CoSponsorship:
-    """Represents co-sponsorship relationship between two senators."""
+    """Represents co-sponsorship relationship between two senators.
+
+    Aggregated over every law both senators authored (see projection.py).
+    """
 
     senator1_id: str
     senator2_id: str
-    law_id: str
+    shared: int
+    weight: float
+    jaccard: Optional[float] = None
+    newman: Optional[float] = None
+
+    def to_dict(self):
+        return {
+            "senator1_id": self.senator1_id,
+            "senator2_id": self.senator2_id,
+            "shared": self.shared,
+            "weight": self.weight,
+            "jaccard": self.jaccard,
+            "newman": self.newman,
+        }
+
+
+@dataclass
+class SharedLobbyist(CoSponsorship):
+    """Represents two senators lobbied by the same organisations.
+
+    Aggregated over every lobbyist that met, funded a trip for or made a
+    donation to both senators (see projection.py).
+    """
@@ -0,0 +1,198 @@
+"""Chunked, retrying writes to Neo4j through managed transactions."""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Dict, List, Optional
+
+from neo4j.exceptions import ServiceUnavailable, SessionExpired, TransientError
+
+from config import (
+    NEO4J_BATCH_SIZE,
+    NEO4J_BATCH_RETRIES,
+    NEO4J_PARALLEL_BATCHES,
+    INITIAL_BACKOFF,
+    MAX_BACKOFF,
+)
+
+RETRYABLE_ERRORS = (TransientError, ServiceUnavailable, SessionExpired)
+
+COUNTER_NAMES = [
+    "nodes_created",
+    "nodes_deleted",
+    "relationships_created",
+    "relationships_deleted",
+    "properties_set",
+]
+
+
+@dataclass
+class BatchStats:
+    """Timing and counters collected while writing a list in batches."""
+
+    rows: int = 0
+    batches: int = 0
+    failed_batches: int = 0
+    retries: int = 0
+    seconds: float = 0.0
+    batch_seconds: List[float] = field(default_factory=list)
+    counters: Dict[str, int] = field(default_factory=dict)
+
+    def add_counters(self, counters: Dict[str, int]):
+        for name, value in counters.items():
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def summary(self) -> str:
+        slowest = max(self.batch_seconds) if self.batch_seconds else 0.0
+        return (
+            f"{self.rows} rows in {self.batches} batches, "
+            f"{self.seconds:.2f}s total, slowest batch {slowest:.2f}s, "
+            f"{self.retries} retries, {self.failed_batches} failed"
+        )
+
+
+def chunked(rows: list, size: int):
+    """Yield consecutive slices of ``rows`` with at most ``size`` items."""
+    for start in range(0, len(rows), size):
+        yield rows[start : start + size]
+
+
+def _write_batch(tx, query: str, param: str, batch: list) -> Dict[str, int]:
+    """Transaction function: run one UNWIND query over a single batch."""
+    summary = tx.run(query, {param: batch}).consume()
+    return {name: getattr(summary.counters, name) for name in COUNTER_NAMES}
+
+
+class BatchWriter:
+    """Writes large parameter lists as a series of small managed transactions.
+
+    Each batch runs through ``session.execute_write`` so the driver retries
+    transient failures inside the transaction; on top of that, a batch that
+    still fails with a retryable error is resubmitted with exponential
+    backoff. Batches that succeed are committed and never re-sent, so a
+    failure late in a large seed no longer discards earlier progress.
+    """
+
+    def __init__(
+        self,
+        driver,
+        batch_size: int = NEO4J_BATCH_SIZE,
+        max_retries: int = NEO4J_BATCH_RETRIES,
+        initial_backoff: float = INITIAL_BACKOFF,
+        max_backoff: float = MAX_BACKOFF,
+        verbose: bool = True,
+    ):
+        self.driver = driver
+        self.batch_size = max(1, batch_size)
+        self.max_retries = max(1, max_retries)
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.verbose = verbose
+
+        # Thread-safe lock for stats shared by parallel batches
+        self._lock = Lock()
+
+    def _run_with_retry(
+        self, query: str, param: str, batch: list, stats: BatchStats
+    ) -> Dict[str, int]:
+        """Submit one batch in its own session, retrying retryable errors."""
+        attempt = 0
+        backoff = self.initial_backoff
+
+        while True:
+            try:
+                with self.driver.session() as session:
+                    return session.execute_write(_write_batch, query, param, batch)
+            except RETRYABLE_ERRORS as e:
+                attempt += 1
+                if attempt >= self.max_retries:
+                    raise
+
+                wait_time = min(backoff, self.max_backoff)
+                with self._lock:
+                    stats.retries += 1
+                print(
+                    f"Batch failed (attempt {attempt}/{self.max_retries}): {e}. "
+                    f"Retrying in {wait_time:.1f}s..."
+                )
+                time.sleep(wait_time)
+                backoff *= 2
+
+    def _timed_batch(
+        self, index: int, total: int, query: str, param: str, batch: list,
+        stats: BatchStats,
+    ) -> Dict[str, int]:
+        start = time.perf_counter()
+        counters = self._run_with_retry(query, param, batch, stats)
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            stats.batch_seconds.append(elapsed)
+        if self.verbose:
+            print(f"  batch {index + 1}/{total}: {len(batch)} rows in {elapsed:.2f}s")
+        return counters
+
+    def write(
+        self,
+        query: str,
+        rows: list,
+        param: str = "rows",
+        parallel: Optional[int] = None,
+    ) -> BatchStats:
+        """Write ``rows`` by running ``query`` once per batch.
+
+        Args:
+            query: Cypher query that UNWINDs ``$<param>``
+            rows: Full list of parameter maps to write
+            param: Name of the list parameter referenced by the query
+            parallel: Number of batches to submit concurrently. Only use
+                values above 1 for writes that don't contend on the same
+                nodes (e.g. relationships between already-existing nodes).
+
+        Returns:
+            BatchStats with per-batch timings and summed update counters
+        """
+        stats = BatchStats(rows=len(rows))
+        batches = list(chunked(rows, self.batch_size))
+        stats.batches = len(batches)
+        workers = parallel if parallel is not None else NEO4J_PARALLEL_BATCHES
+        start = time.perf_counter()
+
+        if workers <= 1 or len(batches) <= 1:
+            for index, batch in enumerate(batches):
+                try:
+                    counters = self._timed_batch(
+                        index, len(batches), query, param, batch, stats
+                    )
+                except Exception:
+                    stats.failed_batches += 1
+                    stats.seconds = time.perf_counter() - start
+                    raise
+                stats.add_counters(counters)
+        else:
+            errors = []
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {
+                    executor.submit(
+                        self._timed_batch,
+                        index,
+                        len(batches),
+                        query,
+                        param,
+                        batch,
+                        stats,
+                    ): index
+                    for index, batch in enumerate(batches)
+                }
+                for future in as_completed(futures):
+                    try:
+                        stats.add_counters(future.result())
+                    except Exception as e:
+                        stats.failed_batches += 1
+                        errors.append(e)
+            if errors:
+                stats.seconds = time.perf_counter() - start
+                raise errors[0]
+
+        stats.seconds = time.perf_counter() - start
+        return stats
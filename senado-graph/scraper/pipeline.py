@@ -0,0 +1,477 @@
+"""Declarative scrape -> seed -> export pipeline with cached stages.
+
+Each stage declares the files it reads and writes. Dependencies follow from
+them (a stage depends on every stage producing one of its inputs), and the
+stages run on the step graph runner, so independent ones (the four fetches,
+the import CSVs and the similarity windows) run in parallel.
+
+Entity resolution and voting similarity feed Neo4j through ``seed`` itself:
+update_neo4j.sync resolves the scraped records into import tables and folds
+new votes into the saved similarity counters. The ``import_csvs`` and
+``monthly_similarity`` stages only write side artifacts, the neo4j-admin
+import files and the monthly similarity windows, which no other stage reads.
+
+Stages are skipped make-style: a stage re-runs only if the hash of its
+inputs and parameters differs from the one recorded after its last
+successful run, or one of its outputs is missing. Because inputs are hashed
+by content rather than timestamp, a re-fetch that returns the same data
+stops there and nothing downstream re-runs. Fetch stages also re-run when
+their outputs are older than ``max_age`` (or with --force), since the site
+changes without any of their inputs changing.
+
+A fetch that comes back empty or reports errors fails its stage instead of
+overwriting the stored datasets, so it is retried on the next run and the
+stages after it (seed in particular) don't see a half-empty scrape.
+
+Every file a stage reads or writes lives under the data directory, so
+``--data-dir`` selects a fully separate pipeline.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from config import DATA_DIR
+from scraped_data import DATA_FILES
+from step_graph import Step, StepReport, run_step_graph
+
+PIPELINE_STATE_FILE = "pipeline_state.json"
+PIPELINE_STATE_PATH = os.path.join(DATA_DIR, PIPELINE_STATE_FILE)
+
+# Fetched data older than this is scraped again
+FETCH_MAX_AGE = 12 * 3600
+
+
+class FetchError(Exception):
+    """A fetch stage got no usable data; the stored datasets are kept."""
+
+
+@dataclass
+class Stage:
+    """A pipeline stage and the files it reads and writes."""
+
+    name: str
+    run: Callable[[], object]
+    inputs: List[str] = field(default_factory=list)
+    outputs: List[str] = field(default_factory=list)
+    # Anything besides the inputs that changes the outputs (e.g. --days)
+    params: Dict[str, object] = field(default_factory=dict)
+    max_age: Optional[float] = None
+
+
+def file_hash(path: str) -> Optional[str]:
+    """SHA-256 of a file, or of every file under a directory (None if missing)."""
+    digest = hashlib.sha256()
+    if os.path.isdir(path):
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                full = os.path.join(root, name)
+                digest.update(os.path.relpath(full, path).encode("utf-8"))
+                digest.update((file_hash(full) or "").encode("ascii"))
+        return digest.hexdigest()
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    except FileNotFoundError:
+        return None
+    return digest.hexdigest()
+
+
+def stage_key(stage: Stage) -> str:
+    """Hash of the stage's parameters and current input contents."""
+    payload = {
+        "stage": stage.name,
+        "params": stage.params,
+        "inputs": {path: file_hash(path) for path in stage.inputs},
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class PipelineState:
+    """Input hash and finish time recorded after each successful stage run."""
+
+    def __init__(self, path: str = PIPELINE_STATE_PATH):
+        self.path = path
+        self._lock = Lock()
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self.stages: Dict[str, dict] = json.load(f)
+        except FileNotFoundError:
+            self.stages = {}
+
+    def stale_reason(self, stage: Stage, key: str) -> Optional[str]:
+        """Why ``stage`` must run, or None if its recorded outputs are current."""
+        entry = self.stages.get(stage.name)
+        if entry is None:
+            return "never ran"
+        missing = [path for path in stage.outputs if not os.path.exists(path)]
+        if missing:
+            return f"missing {os.path.basename(missing[0])}"
+        if entry.get("key") != key:
+            return "inputs changed"
+        if stage.max_age is not None:
+            age = time.time() - entry.get("finished", 0)
+            if age > stage.max_age:
+                return f"outputs {age / 3600:.1f}h old"
+        return None
+
+    def record(self, stage: Stage, key: str):
+        """Store a successful run and save the state file."""
+        with self._lock:
+            self.stages[stage.name] = {
+                "key": key,
+                "finished": time.time(),
+            }
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.stages, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+
+
+def stage_dependencies(stages: List[Stage]) -> Dict[str, List[str]]:
+    """Producing stages of each stage's inputs.
+
+    Raises:
+        ValueError: If two stages write the same file
+    """
+    producer: Dict[str, str] = {}
+    for stage in stages:
+        for path in stage.outputs:
+            if path in producer:
+                raise ValueError(
+                    f"{path} is written by both {producer[path]} and {stage.name}"
+                )
+            producer[path] = stage.name
+    return {
+        stage.name: sorted(
+            {producer[path] for path in stage.inputs if path in producer}
+            - {stage.name}
+        )
+        for stage in stages
+    }
+
+
+def select_stages(stages: List[Stage], targets: Iterable[str]) -> List[Stage]:
+    """``targets`` and every stage they depend on, in declaration order."""
+    by_name = {stage.name: stage for stage in stages}
+    deps = stage_dependencies(stages)
+    selected: Set[str] = set()
+    queue = list(targets)
+    while queue:
+        name = queue.pop()
+        if name not in by_name:
+            raise ValueError(f"Unknown stage: {name}")
+        if name not in selected:
+            selected.add(name)
+            queue.extend(deps[name])
+    return [stage for stage in stages if stage.name in selected]
+
+
+def run_pipeline(
+    stages: List[Stage],
+    state: Optional[PipelineState] = None,
+    force: Iterable[str] = (),
+    skip: Iterable[str] = (),
+    max_workers: int = 4,
+) -> StepReport:
+    """Run the stages whose inputs changed, independent ones in parallel.
+
+    Args:
+        stages: Stages to consider
+        state: Recorded stage runs (default: PIPELINE_STATE_PATH)
+        force: Stages to run even if they are up to date
+        skip: Stages to treat as up to date without checking
+        max_workers: Maximum number of stages running at the same time
+
+    Returns:
+        StepReport whose results map each stage to "ran", "cached" or
+        "skipped"
+    """
+    state = state or PipelineState()
+    force, skip = set(force), set(skip)
+    deps = stage_dependencies(stages)
+
+    def execute(stage: Stage) -> str:
+        if stage.name in skip:
+            return "skipped"
+        # Inputs are hashed once upstream stages are done, so a re-run that
+        # produced identical files leaves this stage cached
+        key = stage_key(stage)
+        reason = "forced" if stage.name in force else state.stale_reason(stage, key)
+        if reason is None:
+            print(f"[{stage.name}] up to date")
+            return "cached"
+        print(f"[{stage.name}] running ({reason})")
+        stage.run()
+        state.record(stage, key)
+        return "ran"
+
+    steps = [
+        Step(stage.name, lambda s=stage: execute(s), deps[stage.name])
+        for stage in stages
+    ]
+    return run_step_graph(steps, max_workers=max_workers)
+
+
+def _dataset(name: str, data_dir: str) -> str:
+    return os.path.join(data_dir, DATA_FILES[name])
+
+
+def _load(path: str) -> list:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _dump(path: str, rows: list):
+    """Atomically write a dataset.
+
+    Raises:
+        FetchError: If ``rows`` is empty and the stored dataset is not
+    """
+    if not rows and os.path.exists(path) and _load(path):
+        raise FetchError(f"refusing to empty {os.path.basename(path)}")
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(rows, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def default_stages(
+    data_dir: str = DATA_DIR, days: int = 30, workers: int = 5
+) -> List[Stage]:
+    """Fetch senators, days, votes and lobby data, seed Neo4j, export the snapshot.
+
+    Args:
+        data_dir: Directory with scraped JSON files
+        days: Days of bills and lobby records to fetch
+        workers: Concurrent requests per fetch stage
+    """
+    from delta_sync import SNAPSHOT_PATH
+    from graph_snapshot import SNAPSHOT_DIR
+    from layout import LAYOUT_PATH
+    from similarity_state import STATE_PATH
+    from similarity_windows import windows_path
+    from voting_metrics import METRICS_PATH
+
+    def path(name: str) -> str:
+        return _dataset(name, data_dir)
+
+    def artifact(default: str) -> str:
+        return os.path.join(data_dir, os.path.basename(default))
+
+    sync_snapshot = artifact(SNAPSHOT_PATH)
+    similarity_state = artifact(STATE_PATH)
+    layout = artifact(LAYOUT_PATH)
+    metrics = artifact(METRICS_PATH)
+    windows = windows_path("month", data_dir)
+    snapshot_dir = artifact(SNAPSHOT_DIR)
+
+    def scraper():
+        from advanced_parallel_scraper import AdvancedParallelScraper
+
+        return AdvancedParallelScraper(max_workers=workers, days=days)
+
+    def fetch_senators():
+        senators, parties = scraper().scrape_senators()
+        if not senators:
+            raise FetchError("no senators found")
+        _dump(path("senators"), [s.to_dict() for s in senators])
+        _dump(path("parties"), [p.to_dict() for p in parties])
+
+    def fetch_days():
+        result = scraper().scrape_laws_parallel()
+        if result.errors:
+            raise FetchError(f"{len(result.errors)} errors, first: {result.errors[0]}")
+        if not result.laws:
+            raise FetchError(f"no laws in the last {days} days")
+        _dump(path("laws"), [law.to_dict() for law in result.laws])
+        _dump(path("authorships"), result.authorships)
+
+    def fetch_votes():
+        from models import Law
+
+        laws = [
+            Law(id=row["id"], boletin=row["boletin"], title=row.get("title") or "")
+            for row in _load(path("laws"))
+        ]
+        fetcher = scraper()
+        votes = fetcher.scrape_votes_parallel(laws)
+        if fetcher.stats["votes_failed"]:
+            raise FetchError(f"votes failed for {fetcher.stats['votes_failed']} laws")
+        if laws and not votes:
+            raise FetchError(f"no votes for {len(laws)} laws")
+        _dump(path("votes"), votes)
+
+    def fetch_lobby():
+        from scrape_units import LOBBY_PAGES, fetch_unit
+
+        # fetch_unit raises on a page that fails or comes back empty; every
+        # page is fetched before any dataset is written
+        fetcher = scraper()
+        lobby = {}
+        for page in LOBBY_PAGES:
+            lobby.update(fetch_unit(fetcher, "lobby", page))
+        for name in ("lobbyists", "meetings", "trips", "donations"):
+            _dump(path(name), lobby.get(name, []))
+
+    def import_csvs():
+        from bulk_export import build_import_tables, write_import_csvs
+        from scraped_data import load_scraped_data
+
+        tables = build_import_tables(load_scraped_data(data_dir))
+        write_import_csvs(tables, os.path.join(data_dir, "import"))
+
+    def monthly_similarity():
+        from similarity_windows import build_windowed_counts
+        from vote_matrix import build_vote_matrix
+
+        matrix = build_vote_matrix(_load(path("votes")), _load(path("senators")))
+        build_windowed_counts(matrix, "month").save(windows)
+
+    def seed():
+        from update_neo4j import sync
+
+        # Also saves the voting metrics, so no other stage computes them
+        sync(
+            data_dir=data_dir,
+            snapshot_path=sync_snapshot,
+            state_path=similarity_state,
+            export=False,
+            metrics_path=metrics,
+            layout_path=layout,
+        )
+
+    def export_snapshot():
+        from graph_snapshot import export_snapshot as export
+        from scraped_data import load_scraped_data
+
+        manifest = export(
+            load_scraped_data(data_dir),
+            snapshot_dir,
+            state_path=similarity_state,
+            layout_path=layout,
+        )
+        print(f"Exported graph snapshot {manifest['version']}")
+
+    datasets = [path(name) for name in DATA_FILES]
+    fetch = {"days": days}
+    return [
+        Stage(
+            "fetch_senators",
+            fetch_senators,
+            outputs=[path("senators"), path("parties")],
+            max_age=FETCH_MAX_AGE,
+        ),
+        Stage(
+            "fetch_days",
+            fetch_days,
+            outputs=[path("laws"), path("authorships")],
+            params=fetch,
+            max_age=FETCH_MAX_AGE,
+        ),
+        Stage(
+            "fetch_votes",
+            fetch_votes,
+            inputs=[path("laws")],
+            outputs=[path("votes")],
+            max_age=FETCH_MAX_AGE,
+        ),
+        Stage(
+            "fetch_lobby",
+            fetch_lobby,
+            outputs=[path(n) for n in ("lobbyists", "meetings", "trips", "donations")],
+            params=fetch,
+            max_age=FETCH_MAX_AGE,
+        ),
+        Stage(
+            "import_csvs",
+            import_csvs,
+            inputs=datasets,
+            outputs=[os.path.join(data_dir, "import")],
+        ),
+        Stage(
+            "monthly_similarity",
+            monthly_similarity,
+            inputs=[path("votes"), path("senators")],
+            outputs=[windows],
+        ),
+        Stage(
+            "seed",
+            seed,
+            inputs=datasets,
+            outputs=[sync_snapshot, similarity_state, layout, metrics],
+        ),
+        Stage(
+            "export_snapshot",
+            export_snapshot,
+            inputs=datasets + [sync_snapshot, similarity_state, layout],
+            outputs=[os.path.join(snapshot_dir, "manifest.json")],
+        ),
+    ]
+
+
+def main():
+    """Main entry point."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Run the scraping pipeline, skipping stages that are up to date"
+    )
+    parser.add_argument(
+        "targets", nargs="*", help="Stages to bring up to date (default: all)"
+    )
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--workers", type=int, default=5, help="Threads per fetch")
+    parser.add_argument(
+        "--parallel", type=int, default=4, help="Stages running at the same time"
+    )
+    parser.add_argument(
+        "--force", action="append", default=[], help="Re-run a stage (or 'all')"
+    )
+    parser.add_argument(
+        "--skip", action="append", default=[], help="Treat a stage as up to date"
+    )
+    parser.add_argument(
+        "--state",
+        help=f"Recorded stage runs (default: <data-dir>/{PIPELINE_STATE_FILE})",
+    )
+    parser.add_argument(
+        "--list", action="store_true", help="Show stages and whether they are stale"
+    )
+    args = parser.parse_args()
+
+    stages = default_stages(args.data_dir, args.days, args.workers)
+    if args.targets:
+        stages = select_stages(stages, args.targets)
+    state = PipelineState(
+        args.state or os.path.join(args.data_dir, PIPELINE_STATE_FILE)
+    )
+
+    if args.list:
+        deps = stage_dependencies(stages)
+        for stage in stages:
+            reason = state.stale_reason(stage, stage_key(stage)) or "up to date"
+            after = ", ".join(deps[stage.name])
+            print(f"  {stage.name}: {reason}" + (f" (after {after})" if after else ""))
+        return
+
+    force = [s.name for s in stages] if "all" in args.force else args.force
+    report = run_pipeline(
+        stages, state, force=force, skip=args.skip, max_workers=args.parallel
+    )
+    print(report.summary())
+    if not report.ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
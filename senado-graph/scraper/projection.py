@@ -0,0 +1,324 @@
+"""Senator–senator projections of bipartite senator × item networks.
+
+Any senator × X incidence (authorships × laws, lobby meetings, trips and
+donations × lobbyists) projects onto weighted senator pairs: B Bᵀ counts the
+items two senators share. The product is computed item by item from the
+sorted incidence list, generating the member pairs of every item with
+``np.repeat`` in bounded chunks, so the cost follows Σ (senators per item)²
+rather than senators² × items.
+
+Normalizations:
+
+- ``raw``: number of shared items
+- ``jaccard``: shared / (items_i + items_j - shared)
+- ``newman``: Σ 1 / (senators on the item - 1) over shared items, Newman's
+  collaboration weight, which discounts items with many senators
+"""
+
+import sys
+import uuid
+from dataclasses import dataclass
+from typing import Dict, List, Tuple, Type
+
+import numpy as np
+
+from bulk_export import ImportTables
+from models import CoSponsorship, SharedLobbyist
+
+NORMALIZATIONS = ("raw", "jaccard", "newman")
+
+# Projected relationship type -> (incidence relationship types, edge model)
+PROJECTIONS: Dict[str, Tuple[Tuple[str, ...], Type[CoSponsorship]]] = {
+    "CO_SPONSORED": (("AUTHORED",), CoSponsorship),
+    "SHARED_LOBBYIST": (
+        ("MET_WITH_LOBBYIST", "TRIP_FUNDED_BY", "RECEIVED_DONATION"),
+        SharedLobbyist,
+    ),
+}
+
+# Upper bound on member pairs generated per chunk of items
+PAIR_BUDGET = 4_000_000
+
+
+@dataclass
+class Projection:
+    """Senator pairs sharing at least one item, with i < j by index."""
+
+    senator_ids: List[str]
+    first: np.ndarray
+    second: np.ndarray
+    shared: np.ndarray
+    newman: np.ndarray
+    degree: np.ndarray
+
+    def jaccard(self) -> np.ndarray:
+        union = self.degree[self.first] + self.degree[self.second] - self.shared
+        return self.shared / np.maximum(union, 1)
+
+    def weights(self, normalization: str) -> np.ndarray:
+        if normalization == "raw":
+            return self.shared.astype(np.float64)
+        if normalization == "jaccard":
+            return self.jaccard()
+        if normalization == "newman":
+            return self.newman
+        raise ValueError(f"Unknown normalization: {normalization}")
+
+
+def incidence(
+    tables: ImportTables, rel_types: Tuple[str, ...]
+) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """Senator and item index of every relationship of ``rel_types``.
+
+    Relationship keys start with (senator id, item id), as built by
+    bulk_export.build_import_tables.
+
+    Returns:
+        Tuple of (senator ids, senator index per row, item index per row)
+    """
+    senator_ids = list(tables.nodes.get("Senator", {}))
+    senator_index = {senator_id: i for i, senator_id in enumerate(senator_ids)}
+    item_index: Dict[str, int] = {}
+    rows, cols = [], []
+    for rel_type in rel_types:
+        for key in tables.relationships.get(rel_type, {}):
+            row = senator_index.get(key[0])
+            if row is None:
+                continue
+            rows.append(row)
+            cols.append(item_index.setdefault(key[1], len(item_index)))
+    return (
+        senator_ids,
+        np.array(rows, dtype=np.int64),
+        np.array(cols, dtype=np.int64),
+    )
+
+
+def project(
+    senator_ids: List[str],
+    rows: np.ndarray,
+    cols: np.ndarray,
+    pair_budget: int = PAIR_BUDGET,
+) -> Projection:
+    """Project a senator × item incidence onto senator pairs.
+
+    Repeated (senator, item) rows count once.
+
+    Args:
+        senator_ids: Senator id per row index
+        rows: Senator index per incidence
+        cols: Item index per incidence
+        pair_budget: Member pairs generated per chunk of items
+    """
+    size = len(senator_ids)
+    # Sorted by item, then senator, so each item's members are contiguous
+    keys = np.unique(cols.astype(np.int64) * size + rows)
+    items, members = keys // size, keys % size
+    degree = np.bincount(members, minlength=size)
+
+    starts = np.flatnonzero(np.r_[True, items[1:] != items[:-1]])[: keys.size]
+    sizes = np.diff(np.r_[starts, keys.size])
+    shared_items = sizes >= 2
+    starts, sizes = starts[shared_items], sizes[shared_items]
+
+    # Chunk boundaries so a chunk only exceeds pair_budget pairs if one item
+    # does on its own
+    cost = np.cumsum(sizes**2)
+    total = cost[-1] if cost.size else 0
+    bounds = np.searchsorted(
+        cost, np.arange(pair_budget, total, pair_budget), side="right"
+    )
+    bounds = np.unique(np.r_[0, bounds, len(sizes)])
+
+    pair_keys, counts, newman = [], [], []
+    for lo, hi in zip(bounds[:-1], bounds[1:]):
+        chunk_starts, chunk_sizes = starts[lo:hi], sizes[lo:hi]
+        # Every member of every item, then every member paired with its item
+        group = np.repeat(np.arange(len(chunk_sizes)), chunk_sizes)
+        offsets = np.cumsum(chunk_sizes) - chunk_sizes
+        member = chunk_starts[group] + np.arange(group.size) - offsets[group]
+        repeats = chunk_sizes[group]
+        left = np.repeat(member, repeats)
+        pair_offsets = np.cumsum(repeats) - repeats
+        partner = np.arange(left.size) - np.repeat(pair_offsets, repeats)
+        right = np.repeat(chunk_starts[group], repeats) + partner
+        upper = left < right
+        left, right = left[upper], right[upper]
+        item_weight = 1.0 / (np.repeat(repeats, repeats)[upper] - 1)
+
+        chunk_keys, inverse = np.unique(
+            members[left] * size + members[right], return_inverse=True
+        )
+        pair_keys.append(chunk_keys)
+        counts.append(np.bincount(inverse, minlength=chunk_keys.size))
+        newman.append(
+            np.bincount(inverse, weights=item_weight, minlength=chunk_keys.size)
+        )
+
+    if pair_keys:
+        merged, inverse = np.unique(np.concatenate(pair_keys), return_inverse=True)
+        shared = np.bincount(inverse, weights=np.concatenate(counts))
+        collaboration = np.bincount(inverse, weights=np.concatenate(newman))
+    else:
+        merged = np.zeros(0, dtype=np.int64)
+        shared, collaboration = np.zeros(0), np.zeros(0)
+
+    return Projection(
+        senator_ids=list(senator_ids),
+        first=merged // size,
+        second=merged % size,
+        shared=shared.astype(np.int64),
+        newman=collaboration,
+        degree=degree,
+    )
+
+
+def projection_edges(
+    projection: Projection,
+    model: Type[CoSponsorship] = CoSponsorship,
+    normalization: str = "newman",
+    min_shared: int = 1,
+) -> List[dict]:
+    """Edge rows oriented so that senator1_id < senator2_id.
+
+    Args:
+        projection: Projected pairs
+        model: Edge model the rows are built from
+        normalization: Measure stored as ``weight``
+        min_shared: Pairs sharing fewer items are skipped
+    """
+    weights = projection.weights(normalization)
+    jaccard = projection.jaccard()
+    edges = []
+    for k in np.flatnonzero(projection.shared >= min_shared).tolist():
+        first, second = sorted(
+            (
+                projection.senator_ids[projection.first[k]],
+                projection.senator_ids[projection.second[k]],
+            )
+        )
+        edge = model(
+            senator1_id=first,
+            senator2_id=second,
+            shared=int(projection.shared[k]),
+            weight=round(float(weights[k]), 4),
+            jaccard=round(float(jaccard[k]), 4),
+            newman=round(float(projection.newman[k]), 4),
+        )
+        edges.append(edge.to_dict())
+    return edges
+
+
+def build_projections(
+    tables: ImportTables, normalization: str = "newman", min_shared: int = 1
+) -> Dict[str, List[dict]]:
+    """Edge rows for every relationship type in PROJECTIONS."""
+    edges = {}
+    for rel_type, (sources, model) in PROJECTIONS.items():
+        projection = project(*incidence(tables, sources))
+        edges[rel_type] = projection_edges(
+            projection, model, normalization=normalization, min_shared=min_shared
+        )
+    return edges
+
+
+def write_projection(driver, writer, rel_type: str, edges: List[dict]):
+    """Replace the ``rel_type`` edges between senators."""
+    if rel_type not in PROJECTIONS:
+        raise ValueError(f"Unknown projection: {rel_type}")
+
+    run_id = str(uuid.uuid4())
+    for edge in edges:
+        edge["runId"] = run_id
+
+    # rel_type is one of the PROJECTIONS keys, never data
+    query = f"""
+    UNWIND $edges AS edge
+    MATCH (s1:Senator {{id: edge.senator1_id}})
+    MATCH (s2:Senator {{id: edge.senator2_id}})
+    MERGE (s1)-[r:{rel_type}]->(s2)
+    SET r.shared = edge.shared,
+        r.weight = edge.weight,
+        r.jaccard = edge.jaccard,
+        r.newman = edge.newman,
+        r.runId = edge.runId
+    """
+    stats = writer.write(query, edges, param="edges")
+    print(f"  {rel_type}: {stats.summary()}")
+
+    with driver.session() as session:
+        session.run(
+            f"""
+            MATCH ()-[r:{rel_type}]->()
+            WHERE r.runId IS NULL OR r.runId <> $run_id
+            DELETE r
+            """,
+            run_id=run_id,
+        ).consume()
+
+
+def main():
+    """Main entry point."""
+    import argparse
+    import time
+
+    from bulk_export import build_import_tables
+    from config import DATA_DIR
+    from scraped_data import load_scraped_data
+
+    parser = argparse.ArgumentParser(
+        description="Project senator × law/lobbyist networks onto senator pairs"
+    )
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument(
+        "--normalization",
+        choices=NORMALIZATIONS,
+        default="newman",
+        help="Measure stored as the edge weight (default: newman)",
+    )
+    parser.add_argument(
+        "--min-shared",
+        type=int,
+        default=1,
+        help="Minimum shared laws or lobbyists per pair (default: 1)",
+    )
+    parser.add_argument(
+        "--neo4j", action="store_true", help="Write the projected relationships"
+    )
+    args = parser.parse_args()
+
+    data = load_scraped_data(args.data_dir)
+    if not data.get("senators"):
+        print("No scraped data found")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    projections = build_projections(
+        build_import_tables(data), args.normalization, args.min_shared
+    )
+    print(f"Projected in {time.perf_counter() - start:.3f}s")
+    for rel_type, edges in projections.items():
+        print(f"  {rel_type}: {len(edges)} senator pairs")
+        for edge in sorted(edges, key=lambda e: -e["weight"])[:3]:
+            print(
+                f"    {edge['senator1_id']} - {edge['senator2_id']}: "
+                f"{edge['shared']} shared, weight {edge['weight']}"
+            )
+
+    if args.neo4j:
+        from neo4j import GraphDatabase
+
+        from config import NEO4J_PASSWORD, NEO4J_URI, NEO4J_USERNAME
+        from neo4j_batch import BatchWriter
+
+        driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USERNAME, NEO4J_PASSWORD))
+        try:
+            writer = BatchWriter(driver)
+            for rel_type, edges in projections.items():
+                write_projection(driver, writer, rel_type, edges)
+        finally:
+            driver.close()
+
+
+if __name__ == "__main__":
+    main()
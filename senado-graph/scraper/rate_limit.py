@@ -0,0 +1,129 @@
+"""Per-host token-bucket rate limit shared by every thread and process.
+
+Each host gets a bucket of REQUEST_BURST tokens refilled at
+REQUESTS_PER_SECOND. The bucket lives in a small lock file under
+RATE_LIMIT_DIR (a temp directory by default), so the spider processes
+started by parallel_scraper.py, the thread pools of AdvancedParallelScraper
+and any other runner on the machine draw from the same budget instead of
+each sleeping REQUEST_DELAY on its own.
+
+Taking a token is one ``flock``-guarded read-modify-write of the file. The
+token count may go negative: a caller that finds the bucket empty reserves
+the next token and sleeps until it is due, outside the lock, so waiters are
+served in arrival order and the lock is never held across a sleep.
+
+Sessions are limited by mounting RateLimitedAdapter, so every request they
+send pays, including retries and photo downloads. Without ``fcntl``
+(Windows) the bucket is only shared between threads.
+"""
+
+import os
+import struct
+import tempfile
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from config import RATE_LIMIT_DIR, REQUEST_BURST, REQUESTS_PER_SECOND
+
+BUCKET_DIR = RATE_LIMIT_DIR or os.path.join(
+    tempfile.gettempdir(), "senadograph-rate-limit"
+)
+
+# Bucket file layout: tokens left and the wall-clock time they were counted
+_STATE = struct.Struct("<dd")
+
+
+class TokenBucket:
+    """Token bucket stored in a file, safe across threads and processes."""
+
+    def __init__(
+        self,
+        path: str,
+        rate: float = REQUESTS_PER_SECOND,
+        burst: int = REQUEST_BURST,
+    ):
+        self.path = path
+        self.rate = rate
+        self.burst = burst
+        # flock doesn't exclude threads sharing a process's lock file
+        self._lock = threading.Lock()
+
+    def reserve(self, now: Optional[float] = None) -> float:
+        """Take a token; returns how long to wait before using it."""
+        with self._lock:
+            # Opened per call: a descriptor inherited through fork would
+            # share its lock with the parent
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                data = os.read(fd, _STATE.size)
+                now = time.time() if now is None else now
+                if len(data) == _STATE.size:
+                    tokens, counted = _STATE.unpack(data)
+                    refill = max(now - counted, 0.0) * self.rate
+                    tokens = min(tokens + refill, float(self.burst))
+                else:
+                    tokens = float(self.burst)
+                tokens -= 1
+                os.lseek(fd, 0, os.SEEK_SET)
+                os.write(fd, _STATE.pack(tokens, now))
+            finally:
+                os.close(fd)
+        return max(-tokens / self.rate, 0.0)
+
+    def acquire(self) -> float:
+        """Take a token, sleeping until it is due; returns the time slept."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+_buckets: Dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def bucket_for(host: str) -> TokenBucket:
+    """The shared bucket for ``host``."""
+    with _buckets_lock:
+        bucket = _buckets.get(host)
+        if bucket is None:
+            os.makedirs(BUCKET_DIR, exist_ok=True)
+            name = "".join(c if c.isalnum() or c in ".-" else "_" for c in host)
+            bucket = TokenBucket(os.path.join(BUCKET_DIR, f"{name}.bucket"))
+            _buckets[host] = bucket
+        return bucket
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """Transport adapter taking a token from the host's bucket per request."""
+
+    def send(self, request, **kwargs):
+        bucket_for(urlsplit(request.url).hostname or "").acquire()
+        return super().send(request, **kwargs)
+
+
+def rate_limit(
+    session: requests.Session, pool_size: int = DEFAULT_POOLSIZE
+) -> requests.Session:
+    """Route every request of ``session`` through the shared buckets.
+
+    Args:
+        session: Session to limit
+        pool_size: Connections kept per host, at least the session's threads
+    """
+    adapter = RateLimitedAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
@@ -0,0 +1,418 @@
+"""Long-running refresh scheduler for the Senate sources.
+
+Instead of re-fetching the last N days at a fixed interval, the daemon keeps
+a priority queue of refresh tasks, each due at a time that depends on how
+likely its source is to have changed:
+
+- ``day``: the ``fecha`` query for one day. Today and yesterday refresh
+  hourly; older days rarely, since bills seldom move back in time.
+- ``boletin``: the votes of one bill. Bills in discussion with a votación in
+  the last RECENT_VOTE_DAYS days refresh daily, other bills in discussion
+  weekly, and approved, rejected or withdrawn bills rarely.
+- ``lobby``: one lobby registry page (lobbyists, trips, donations), on its
+  own cadence.
+
+Every interval gets random jitter so tasks planned together drift apart,
+and the daemon never sends more than a global budget of requests per hour;
+tasks that come due while the budget is spent wait, most urgent first.
+Results are merged into the scraped JSON files, and the queue is saved
+after every task so a restart resumes where the daemon stopped.
+"""
+
+import heapq
+import json
+import os
+import random
+import signal
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from datetime import date, timedelta
+from typing import Deque, Dict, List, Optional, Tuple
+
+from config import DATA_DIR, SCHEDULER_REQUESTS_PER_HOUR
+from dates import cutoff
+from scrape_units import LOBBY_PAGES, describe, fetch_unit, merge_unit, unit_id
+from scraped_data import load_dataset
+
+SCHEDULER_STATE_PATH = os.path.join(DATA_DIR, "scheduler_state.json")
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+# Refresh intervals per kind of task, in seconds
+RECENT_DAY_INTERVAL = HOUR
+OLD_DAY_INTERVAL = 7 * DAY
+ACTIVE_BOLETIN_INTERVAL = DAY
+IDLE_BOLETIN_INTERVAL = 7 * DAY
+CLOSED_BOLETIN_INTERVAL = 30 * DAY
+LOBBY_INTERVAL = 6 * HOUR
+
+# Days (counting today) whose fecha query refreshes hourly
+RECENT_DAYS = 2
+
+# A votación this recent keeps a bill in discussion on the daily cadence
+RECENT_VOTE_DAYS = 30
+
+# Intervals are scaled by a random factor in [1 - JITTER, 1 + JITTER]
+JITTER = 0.1
+
+# Failed tasks retry after this, doubling per failure up to their interval
+RETRY_DELAY = 5 * 60
+
+# How often the task list is re-planned from the scraped data
+PLAN_INTERVAL = 10 * 60
+
+
+@dataclass
+class RefreshTask:
+    """A source to fetch again when ``due`` (epoch seconds) is reached."""
+
+    kind: str
+    target: str
+    interval: float
+    due: float
+    last_run: Optional[float] = None
+    failures: int = 0
+
+    @property
+    def key(self) -> str:
+        return unit_id(self.kind, self.target)
+
+
+class RequestBudget:
+    """Sliding one-hour window of request timestamps."""
+
+    def __init__(self, per_hour: int, sent: Optional[List[float]] = None):
+        self.per_hour = per_hour
+        self.sent: Deque[float] = deque(sorted(sent or []))
+
+    def _expire(self, now: float):
+        while self.sent and self.sent[0] <= now - HOUR:
+            self.sent.popleft()
+
+    def wait_time(self, now: float) -> float:
+        """Seconds until another request fits in the budget."""
+        self._expire(now)
+        if len(self.sent) < self.per_hour:
+            return 0.0
+        return self.sent[len(self.sent) - self.per_hour] + HOUR - now
+
+    def spend(self, now: float):
+        self.sent.append(now)
+
+
+def plan_tasks(
+    laws: List[dict], votes: List[dict], days: int, today: Optional[date] = None
+) -> Dict[str, Tuple[str, str, float]]:
+    """Refresh interval of every source worth tracking.
+
+    Args:
+        laws: Scraped laws
+        votes: Scraped votes, for the last votación of each boletin
+        days: Days of fecha queries to keep, counting today
+        today: Reference date (defaults to today)
+
+    Returns:
+        Task key -> (kind, target, interval)
+    """
+    today = today or date.today()
+    plan: Dict[str, Tuple[str, str, float]] = {}
+
+    for offset in range(days):
+        day = (today - timedelta(days=offset)).isoformat()
+        interval = RECENT_DAY_INTERVAL if offset < RECENT_DAYS else OLD_DAY_INTERVAL
+        plan[unit_id("day", day)] = ("day", day, interval)
+
+    last_vote: Dict[str, str] = {}
+    for vote in votes:
+        boletin, voted = vote.get("law_boletin"), vote.get("date") or ""
+        if boletin and voted > last_vote.get(boletin, ""):
+            last_vote[boletin] = voted
+
+    recent = cutoff(RECENT_VOTE_DAYS, today)
+    for law in laws:
+        boletin = law.get("boletin")
+        if not boletin:
+            continue
+        if law.get("status", "in_discussion") != "in_discussion":
+            interval = CLOSED_BOLETIN_INTERVAL
+        elif last_vote.get(boletin, "") >= recent:
+            interval = ACTIVE_BOLETIN_INTERVAL
+        else:
+            interval = IDLE_BOLETIN_INTERVAL
+        plan[unit_id("boletin", boletin)] = ("boletin", boletin, interval)
+
+    for page in LOBBY_PAGES:
+        plan[unit_id("lobby", page)] = ("lobby", page, LOBBY_INTERVAL)
+
+    return plan
+
+
+class RefreshScheduler:
+    """Priority queue of refresh tasks, run under the request budget."""
+
+    def __init__(
+        self,
+        data_dir: str = DATA_DIR,
+        state_path: str = SCHEDULER_STATE_PATH,
+        days: int = 30,
+        per_hour: int = SCHEDULER_REQUESTS_PER_HOUR,
+        seed: Optional[int] = None,
+    ):
+        self.data_dir = data_dir
+        self.state_path = state_path
+        self.days = days
+        self.rng = random.Random(seed)
+        self.tasks: Dict[str, RefreshTask] = {}
+        # (due, interval, key); entries whose due no longer matches are stale
+        self._heap: List[Tuple[float, float, str]] = []
+        self._scraper = None
+        self._next_plan = 0.0
+        self.stop = threading.Event()
+
+        sent: List[float] = []
+        try:
+            with open(state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            self.tasks = {
+                task.key: task
+                for task in (RefreshTask(**entry) for entry in state["tasks"])
+            }
+            sent = state.get("sent", [])
+        except FileNotFoundError:
+            pass
+        self.budget = RequestBudget(per_hour, sent)
+        self._rebuild_heap()
+
+    @property
+    def scraper(self):
+        if self._scraper is None:
+            from advanced_parallel_scraper import AdvancedParallelScraper
+
+            self._scraper = AdvancedParallelScraper(max_workers=1, days=self.days)
+        return self._scraper
+
+    def save(self):
+        state = {
+            "tasks": [asdict(task) for task in self.tasks.values()],
+            "sent": list(self.budget.sent),
+        }
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def _jittered(self, interval: float) -> float:
+        return interval * self.rng.uniform(1 - JITTER, 1 + JITTER)
+
+    def _push(self, task: RefreshTask):
+        heapq.heappush(self._heap, (task.due, task.interval, task.key))
+
+    def _rebuild_heap(self):
+        self._heap = [(t.due, t.interval, t.key) for t in self.tasks.values()]
+        heapq.heapify(self._heap)
+
+    def peek(self) -> Optional[RefreshTask]:
+        """Most urgent task, dropping stale heap entries."""
+        while self._heap:
+            due, _, key = self._heap[0]
+            task = self.tasks.get(key)
+            if task is not None and task.due == due:
+                return task
+            heapq.heappop(self._heap)
+        return None
+
+    def refresh_plan(self, now: Optional[float] = None) -> Tuple[int, int]:
+        """Sync the queue with the scraped data.
+
+        New sources are due now (ties go to the shortest interval), sources
+        whose cadence shortened are pulled forward, and sources no longer
+        tracked are dropped.
+
+        Returns:
+            (tasks added, tasks dropped)
+        """
+        now = time.time() if now is None else now
+        plan = plan_tasks(
+            load_dataset("laws", self.data_dir),
+            load_dataset("votes", self.data_dir),
+            self.days,
+        )
+
+        dropped = [key for key in self.tasks if key not in plan]
+        for key in dropped:
+            del self.tasks[key]
+
+        added = 0
+        for key, (kind, target, interval) in plan.items():
+            task = self.tasks.get(key)
+            if task is None:
+                self.tasks[key] = RefreshTask(kind, target, interval, due=now)
+                added += 1
+            elif task.interval != interval:
+                task.interval = interval
+                if task.last_run is not None and not task.failures:
+                    task.due = min(task.due, task.last_run + self._jittered(interval))
+
+        self._rebuild_heap()
+        self._next_plan = now + PLAN_INTERVAL
+        return added, len(dropped)
+
+    def run_task(self, task: RefreshTask, now: Optional[float] = None) -> bool:
+        """Fetch one source and schedule its next refresh."""
+        now = time.time() if now is None else now
+        # One request per task; the scraper's own retries aren't counted
+        self.budget.spend(now)
+        try:
+            rows = fetch_unit(self.scraper, task.kind, task.target)
+            if merge_unit(task.kind, task.target, rows, self.data_dir):
+                # Pick up new boletines and status changes right away
+                self._next_plan = 0.0
+            outcome = describe(rows)
+            ok = True
+        except Exception as e:
+            outcome = f"failed: {e}"
+            ok = False
+
+        finished = time.time()
+        task.last_run = finished
+        if ok:
+            task.failures = 0
+            task.due = finished + self._jittered(task.interval)
+        else:
+            task.failures += 1
+            delay = min(RETRY_DELAY * 2 ** (task.failures - 1), task.interval)
+            task.due = finished + self._jittered(delay)
+        if task.key in self.tasks:
+            self._push(task)
+
+        print(f"  {task.key}: {outcome}, next in {_duration(task.due - finished)}")
+        return ok
+
+    def run(self, once: bool = False, max_tasks: Optional[int] = None) -> int:
+        """Run tasks as they come due until stopped.
+
+        Args:
+            once: Run the tasks due now (within budget), then return
+            max_tasks: Stop after this many tasks
+
+        Returns:
+            Number of tasks run
+        """
+        ran = 0
+        try:
+            while not self.stop.is_set():
+                now = time.time()
+                if now >= self._next_plan:
+                    added, dropped = self.refresh_plan(now)
+                    if added or dropped:
+                        print(f"Planned {added} new tasks, dropped {dropped}")
+                        self.save()
+
+                task = self.peek()
+                wait = PLAN_INTERVAL if task is None else task.due - now
+                wait = max(wait, self.budget.wait_time(now))
+                if wait > 0:
+                    if once:
+                        break
+                    self.stop.wait(min(wait, PLAN_INTERVAL))
+                    continue
+
+                heapq.heappop(self._heap)
+                self.run_task(task, now)
+                self.save()
+                ran += 1
+                if max_tasks is not None and ran >= max_tasks:
+                    break
+        finally:
+            self.save()
+        return ran
+
+    def summary(self, now: Optional[float] = None, limit: int = 20) -> str:
+        """Queue overview: tasks per kind and the next ones due."""
+        now = time.time() if now is None else now
+        counts: Dict[str, int] = {}
+        for task in self.tasks.values():
+            counts[task.kind] = counts.get(task.kind, 0) + 1
+        lines = [
+            f"{len(self.tasks)} tasks ("
+            + ", ".join(f"{count} {kind}" for kind, count in sorted(counts.items()))
+            + f"), {len(self.budget.sent)}/{self.budget.per_hour} requests "
+            "in the last hour"
+        ]
+        upcoming = sorted(self.tasks.values(), key=lambda t: (t.due, t.interval))
+        for task in upcoming[:limit]:
+            due = "now" if task.due <= now else f"in {_duration(task.due - now)}"
+            lines.append(
+                f"  {task.key:<24} every {_duration(task.interval):>4}, due {due}"
+            )
+        return "\n".join(lines)
+
+
+def _duration(seconds: float) -> str:
+    seconds = max(seconds, 0)
+    if seconds < HOUR:
+        return f"{seconds / 60:.0f}m"
+    if seconds < 2 * DAY:
+        return f"{seconds / HOUR:.0f}h"
+    return f"{seconds / DAY:.0f}d"
+
+
+def main():
+    """Main entry point."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Keep scraped data fresh, refreshing likely changes first"
+    )
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--state", default=SCHEDULER_STATE_PATH)
+    parser.add_argument(
+        "--days",
+        type=int,
+        default=30,
+        help="Days of fecha queries to keep refreshing (default: 30)",
+    )
+    parser.add_argument(
+        "--budget",
+        type=int,
+        default=SCHEDULER_REQUESTS_PER_HOUR,
+        help=f"Requests per hour (default: {SCHEDULER_REQUESTS_PER_HOUR})",
+    )
+    parser.add_argument(
+        "--once",
+        action="store_true",
+        help="Run the tasks due now within budget and exit (for cron)",
+    )
+    parser.add_argument("--max-tasks", type=int, help="Exit after this many tasks")
+    parser.add_argument(
+        "--list", action="store_true", help="Print the queue and exit"
+    )
+    args = parser.parse_args()
+
+    scheduler = RefreshScheduler(
+        data_dir=args.data_dir,
+        state_path=args.state,
+        days=args.days,
+        per_hour=args.budget,
+    )
+
+    if args.list:
+        scheduler.refresh_plan()
+        print(scheduler.summary())
+        return
+
+    signal.signal(signal.SIGTERM, lambda *_: scheduler.stop.set())
+    print(scheduler.summary(limit=5))
+    try:
+        ran = scheduler.run(once=args.once, max_tasks=args.max_tasks)
+    except KeyboardInterrupt:
+        print("\nInterrupted")
+        return
+    print(f"Ran {ran} tasks")
+
+
+if __name__ == "__main__":
+    main()
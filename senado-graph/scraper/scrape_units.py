@@ -0,0 +1,120 @@
+"""Smallest independently fetchable pieces of the Senate sources.
+
+A unit is a (kind, target) pair:
+
+- ``day``: the ``fecha`` query for an ISO date, giving laws and authorships
+- ``boletin``: the votes of one bill
+- ``lobby``: one lobby registry page (lobbyists, trips or donations)
+
+Fetching a unit returns its rows keyed by dataset name, in the format the
+scrapers write, so results can be moved around (the refresh scheduler runs
+them in-process, the work queue ships them between hosts) and merged into
+the scraped JSON files later.
+"""
+
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+from config import DATA_DIR
+from scraped_data import merge_dataset, save_dataset
+
+UNIT_KINDS = ("day", "boletin", "lobby")
+
+LOBBY_PAGES = ("lobbyists", "trips", "donations")
+
+
+class UnitFetchError(Exception):
+    """A unit's source could not be fetched; it should be retried."""
+
+
+def unit_id(kind: str, target: str) -> str:
+    return f"{kind}:{target}"
+
+
+def parse_unit_id(key: str) -> Tuple[str, str]:
+    kind, _, target = key.partition(":")
+    if kind not in UNIT_KINDS or not target:
+        raise ValueError(f"Not a scrape unit: {key!r}")
+    return kind, target
+
+
+def fetch_unit(scraper, kind: str, target: str) -> Dict[str, List[dict]]:
+    """Fetch one unit with an AdvancedParallelScraper.
+
+    Raises:
+        UnitFetchError: If the source didn't answer
+        ValueError: For an unknown kind or lobby page
+    """
+    if kind == "day":
+        day = datetime.strptime(target, "%Y-%m-%d")
+        laws, authorships, errors = scraper._scrape_single_day(day)
+        if errors and not laws:
+            raise UnitFetchError(errors[0])
+        return {
+            "laws": [law.to_dict() for law in laws],
+            "authorships": authorships,
+        }
+
+    if kind == "boletin":
+        from models import Law
+
+        law = Law(id=f"law_{scraper._sanitize_id(target)}", boletin=target, title="")
+        votes, _ = scraper._scrape_law_votes(law)
+        return {"votes": votes}
+
+    if kind == "lobby":
+        if target == "lobbyists":
+            lobbyists, meetings = scraper._scrape_lobbyists()
+            rows = {"lobbyists": lobbyists, "meetings": meetings}
+        elif target == "trips":
+            rows = {"trips": scraper._scrape_trips()}
+        elif target == "donations":
+            rows = {"donations": scraper._scrape_donations()}
+        else:
+            raise ValueError(f"Unknown lobby page: {target}")
+        # Registry pages list every record: an empty one is a failed fetch
+        if not any(rows.values()):
+            raise UnitFetchError(f"empty {target} page")
+        return rows
+
+    raise ValueError(f"Unknown unit kind: {kind}")
+
+
+def merge_unit(
+    kind: str, target: str, rows: Dict[str, List[dict]], data_dir: str = DATA_DIR
+) -> bool:
+    """Merge a fetched unit into the scraped JSON files.
+
+    Day rows are upserted, a boletin's votes replace its stored votes, and a
+    lobby page replaces its datasets.
+
+    Returns:
+        Whether any file changed
+    """
+    if kind == "day":
+        if not rows.get("laws"):
+            return False
+        merge_dataset("laws", rows["laws"], data_dir)
+        merge_dataset("authorships", rows.get("authorships", []), data_dir)
+        return True
+
+    if kind == "boletin":
+        # An empty answer may be a failed fetch: keep the stored votes
+        if not rows.get("votes"):
+            return False
+        merge_dataset(
+            "votes",
+            rows["votes"],
+            data_dir,
+            replace=lambda vote: vote.get("law_boletin") == target,
+        )
+        return True
+
+    for name, page_rows in rows.items():
+        save_dataset(name, page_rows, data_dir)
+    return True
+
+
+def describe(rows: Dict[str, List[dict]]) -> str:
+    """Row counts of a fetched unit, e.g. "3 laws, 7 authorships"."""
+    return ", ".join(f"{len(page)} {name}" for name, page in rows.items())
@@ -0,0 +1,94 @@
+"""Load and update the JSON files written by the scrapers."""
+
+import json
+import os
+from typing import Callable, Dict, List, Optional, Tuple
+
+from config import DATA_DIR
+
+# Dataset name -> file name in the data directory
+DATA_FILES = {
+    "parties": "parties.json",
+    "senators": "senators.json",
+    "laws": "laws.json",
+    "authorships": "authorships.json",
+    "votes": "votes.json",
+    "lobbyists": "lobbyists.json",
+    "meetings": "lobby_meetings.json",
+    "trips": "lobby_trips.json",
+    "donations": "lobby_donations.json",
+}
+
+# Fields identifying a row of each dataset, used to merge partial scrapes
+DATASET_KEYS: Dict[str, Tuple[str, ...]] = {
+    "parties": ("id",),
+    "senators": ("id",),
+    "laws": ("id",),
+    "authorships": ("senator_id", "law_id"),
+    "votes": ("law_boletin", "session", "date", "topic", "senator_id"),
+    "lobbyists": ("id",),
+    "meetings": ("senator_id", "lobbyist_id", "date", "topic"),
+    "trips": ("senator_id", "lobbyist_id", "destination", "purpose"),
+    "donations": ("senator_id", "donor", "item", "date"),
+}
+
+
+def load_dataset(name: str, data_dir: str = DATA_DIR) -> List[dict]:
+    """Load one dataset, returning an empty list if the file is missing."""
+    path = os.path.join(data_dir, DATA_FILES[name])
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        print(f"No {name} data found at {path}, skipping...")
+        return []
+
+
+def load_scraped_data(data_dir: str = DATA_DIR) -> Dict[str, List[dict]]:
+    """Load every dataset in DATA_FILES."""
+    return {name: load_dataset(name, data_dir) for name in DATA_FILES}
+
+
+def save_dataset(name: str, rows: List[dict], data_dir: str = DATA_DIR):
+    """Write one dataset, replacing the file atomically."""
+    path = os.path.join(data_dir, DATA_FILES[name])
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(rows, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def merge_dataset(
+    name: str,
+    rows: List[dict],
+    data_dir: str = DATA_DIR,
+    replace: Optional[Callable[[dict], bool]] = None,
+) -> int:
+    """Upsert ``rows`` into a dataset by its DATASET_KEYS fields.
+
+    Args:
+        name: Dataset name
+        rows: Scraped rows; a row replaces the stored row with the same key
+        data_dir: Directory with scraped JSON files
+        replace: Stored rows for which this returns True are dropped first,
+            e.g. every vote of a boletin that was scraped again
+
+    Returns:
+        Number of rows in the dataset after merging
+    """
+    fields = DATASET_KEYS[name]
+    existing = load_dataset(name, data_dir)
+    if replace is not None:
+        existing = [row for row in existing if not replace(row)]
+
+    index = {tuple(row.get(f) for f in fields): i for i, row in enumerate(existing)}
+    for row in rows:
+        key = tuple(row.get(f) for f in fields)
+        if key in index:
+            existing[index[key]] = row
+        else:
+            index[key] = len(existing)
+            existing.append(row)
+
+    save_dataset(name, existing, data_dir)
+    return len(existing)
@@ -2,17 +2,82 @@
 
 import json
 import os
+import time
+import uuid
+from typing import Dict, List, Optional
 from neo4j import GraphDatabase
-from config import NEO4J_URI, NEO4J_USERNAME, NEO4J_PASSWORD
+from config import NEO4J_URI, NEO4J_USERNAME, NEO4J_PASSWORD, NEO4J_BATCH_SIZE
+from backbone import sparsify, write_backbone
+from bulk_export import build_import_tables
+from centrality import build_centrality_graph, compute_centrality, write_centrality
+from communities import detect_communities, write_communities
+from graph_snapshot import export_snapshot
+from ideal_points import compute_ideal_points, write_ideal_points
+from layout import (
+    LAYOUT_PATH,
+    build_layout_graph,
+    compute_layout,
+    load_layout,
+    save_layout,
+    write_layout,
+)
+from neo4j_batch import BatchWriter
+from projection import build_projections, write_projection
+from senator_resolver import SenatorResolver
+from similarity import MIN_COMMON_VOTES, similarity_edges
+from similarity_state import STATE_PATH, SimilarityState
+from step_graph import Step, StepReport, run_step_graph
+from vote_matrix import build_vote_matrix
+from voting_metrics import METRICS_PATH, compute_metrics, save_metrics, write_metrics
+
+# Upsert VOTED_SAME edges computed by similarity.similarity_edges
+VOTED_SAME_QUERY = """
+UNWIND $edges AS edge
+MATCH (s1:Senator {id: edge.senator1_id})
+MATCH (s2:Senator {id: edge.senator2_id})
+MERGE (s1)-[r:VOTED_SAME]->(s2)
+SET r.agreement = edge.agreement,
+    r.jaccard = edge.jaccard,
+    r.kappa = edge.kappa,
+    r.commonVotes = edge.commonVotes,
+    r.runId = edge.runId
+"""
+
+
+def resolve_lobby_senators(rows: List[dict], resolver: SenatorResolver) -> List[dict]:
+    """Lobby rows with senator_id resolved the way bulk_export does.
+
+    Rows are matched to scraped senators by name, so they attach to the same
+    Senator node a sync or bulk import would use; rows missing either id are
+    dropped, as they are from the import tables.
+    """
+    resolved = []
+    for row in rows:
+        senator_id = resolver.canonical_id(row)
+        if senator_id and row.get("lobbyist_id"):
+            resolved.append({**row, "senator_id": senator_id})
+    return resolved
 
 
 class Neo4jSeeder:
     """Seeds Neo4j with initial data from scraped files or mock data."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        batch_size: int = NEO4J_BATCH_SIZE,
+        parallel_batches: Optional[int] = None,
+    ):
+        """
+        Args:
+            batch_size: Number of rows sent per write transaction
+            parallel_batches: Concurrent batches for relationship writes
+                between existing nodes (authorships, votes)
+        """
         self.driver = GraphDatabase.driver(
             NEO4J_URI, auth=(NEO4J_USERNAME, NEO4J_PASSWORD)
         )
+        self.writer = BatchWriter(self.driver, batch_size=batch_size)
+        self.parallel_batches = parallel_batches
 
     def close(self):
         self.driver.close()
@@ -29,6 +94,7 @@ class Neo4jSeeder:
             "CREATE CONSTRAINT vote_id IF NOT EXISTS FOR (v:Vote) REQUIRE v.id IS UNIQUE",
             "CREATE CONSTRAINT lobbyist_id IF NOT EXISTS FOR (l:Lobbyist) REQUIRE l.id IS UNIQUE",
             "CREATE CONSTRAINT donation_id IF NOT EXISTS FOR (d:Donation) REQUIRE d.id IS UNIQUE",
+            "CREATE CONSTRAINT cluster_id IF NOT EXISTS FOR (c:Cluster) REQUIRE c.id IS UNIQUE",
         ]
 
         with self.driver.session() as session:
@@ -54,8 +120,8 @@ class Neo4jSeeder:
             p.ideology = party.ideology
         """
 
-        with self.driver.session() as session:
-            session.run(query, parties=parties)
+        stats = self.writer.write(query, parties, param="parties")
+        print(f"  {stats.summary()}")
 
         print("Parties seeded")
 
@@ -82,8 +148,8 @@ class Neo4jSeeder:
         MERGE (s)-[:BELONGS_TO]->(p)
         """
 
-        with self.driver.session() as session:
-            session.run(query, senators=senators)
+        stats = self.writer.write(query, senators, param="senators")
+        print(f"  {stats.summary()}")
 
         print("Senators seeded")
 
@@ -104,8 +170,8 @@ class Neo4jSeeder:
             l.topic = law.topic
         """
 
-        with self.driver.session() as session:
-            session.run(query, laws=laws)
+        stats = self.writer.write(query, laws, param="laws")
+        print(f"  {stats.summary()}")
 
         print("Laws seeded")
 
@@ -119,7 +185,8 @@ class Neo4jSeeder:
         WHERE s1.id < s2.id AND s1.party = s2.party
         WITH s1, s2, rand() AS r
         WHERE r > 0.3
-        CREATE (s1)-[:VOTED_SAME {agreement: 0.7 + r * 0.3}]->(s2)
+        // Too few to sparsify, so every sample edge is part of the backbone
+        CREATE (s1)-[:VOTED_SAME {agreement: 0.7 + r * 0.3, backbone: true}]->(s2)
         """
 
         with self.driver.session() as session:
@@ -138,8 +205,10 @@ class Neo4jSeeder:
         MERGE (s)-[:AUTHORED {role: auth.role, date: auth.date}]->(l)
         """
 
-        with self.driver.session() as session:
-            session.run(query, authorships=authorships)
+        stats = self.writer.write(
+            query, authorships, param="authorships", parallel=self.parallel_batches
+        )
+        print(f"  {stats.summary()}")
 
         print("Authorship relationships seeded")
 
@@ -174,57 +243,237 @@ class Neo4jSeeder:
             v.topic = vote.topic
         """
 
-        with self.driver.session() as session:
-            result = session.run(query, votes=votes)
-            summary = result.consume()
-            print(
-                f"Created {summary.counters.relationships_created} VOTED_ON relationships"
-            )
+        stats = self.writer.write(
+            query, votes, param="votes", parallel=self.parallel_batches
+        )
+        print(f"  {stats.summary()}")
+        print(
+            f"Created {stats.counters.get('relationships_created', 0)} VOTED_ON relationships"
+        )
 
         print("Votes seeded")
 
-    def calculate_voting_similarity(self, min_common_votes: int = 5):
-        """Calculate VOTED_SAME relationships based on actual voting patterns."""
+    def calculate_voting_similarity(
+        self,
+        votes: list,
+        senators: list,
+        min_common_votes: int = MIN_COMMON_VOTES,
+        kappa: bool = True,
+        state_path: str = STATE_PATH,
+    ):
+        """Calculate VOTED_SAME relationships from the senators × votaciones matrix.
+
+        Similarity is computed in Python (see similarity.py) and written with
+        MERGE, so reruns update edges in place; edges from previous runs that
+        no longer meet ``min_common_votes`` are removed. The pairwise counters
+        are saved so update_neo4j.py can fold in new votaciones incrementally.
+        """
         print("Calculating voting similarity between senators...")
 
-        query = """
-        // Get all senators who voted on the same laws
-        MATCH (s1:Senator)-[v1:VOTED_ON]->(l:Law)<-[v2:VOTED_ON]-(s2:Senator)
-        WHERE s1 <> s2 AND v1.vote = v2.vote
+        start = time.perf_counter()
+        matrix = build_vote_matrix(votes, senators)
+        state = SimilarityState()
+        state.fold(matrix)
+        result = state.result(min_common_votes=min_common_votes, kappa=kappa)
+        edges = similarity_edges(result)
+        print(
+            f"  {matrix.shape[0]} senators x {matrix.shape[1]} votaciones, "
+            f"{len(edges)} pairs in {time.perf_counter() - start:.3f}s"
+        )
 
-        // Group by senator pairs and count common votes
-        WITH s1, s2, count(*) AS common_votes
-        WHERE common_votes >= $min_common_votes
+        run_id = str(uuid.uuid4())
+        for edge in edges:
+            edge["runId"] = run_id
 
-        // Calculate agreement percentage
-        MATCH (s1)-[v1:VOTED_ON]->(l:Law)
-        WITH s1, s2, common_votes, count(v1) AS total_s1
-        MATCH (s2)-[v2:VOTED_ON]->(l)
-        WITH s1, s2, common_votes, total_s1, count(v2) AS total_s2
+        stats = self.writer.write(VOTED_SAME_QUERY, edges, param="edges")
+        print(f"  {stats.summary()}")
 
-        // Calculate Jaccard similarity: intersection / union
-        WITH s1, s2, common_votes, total_s1, total_s2,
-             (toFloat(common_votes) / (total_s1 + total_s2 - common_votes)) AS agreement
+        with self.driver.session() as session:
+            session.run(
+                """
+                MATCH ()-[r:VOTED_SAME]->()
+                WHERE r.runId IS NULL OR r.runId <> $run_id
+                DELETE r
+                """,
+                run_id=run_id,
+            ).consume()
+
+        state.mark_published(result, result.mask)
+        state.save(state_path)
+
+        print(
+            f"Wrote {len(edges)} VOTED_SAME relationships based on "
+            f"{min_common_votes}+ common votes"
+        )
+
+    def seed_communities(
+        self,
+        senators: list,
+        min_common_votes: int = MIN_COMMON_VOTES,
+        state_path: str = STATE_PATH,
+    ):
+        """Detect voting clusters on the full similarity graph.
+
+        Uses the pairwise counters saved by calculate_voting_similarity and
+        writes ``clusterId`` on Senator nodes plus one Cluster node with stats
+        per community.
+        """
+        print("Detecting voting clusters...")
+
+        start = time.perf_counter()
+        result = SimilarityState.load(state_path).result(
+            min_common_votes=min_common_votes
+        )
+        communities = detect_communities(result, senators)
+        print(
+            f"  {len(communities.clusters)} clusters, modularity "
+            f"{communities.modularity} in {time.perf_counter() - start:.3f}s"
+        )
 
-        // Create relationship with agreement score
-        CREATE (s1)-[r:VOTED_SAME]->(s2)
-        SET r.agreement = agreement
+        write_communities(self.driver, self.writer, communities)
 
-        RETURN count(r) AS relationships_created
+        print("Voting clusters written")
+
+    def seed_backbone(
+        self,
+        senators: list,
+        min_common_votes: int = MIN_COMMON_VOTES,
+        state_path: str = STATE_PATH,
+    ):
+        """Flag the VOTED_SAME edges that make up the similarity backbone.
+
+        See backbone.py; the graph page only fetches flagged edges.
         """
+        print("Extracting voting similarity backbone...")
 
-        with self.driver.session() as session:
-            result = session.run(query, min_common_votes=min_common_votes)
-            record = result.single()
-            if record:
-                count = record[0]
-                print(
-                    f"Created {count} VOTED_SAME relationships based on {min_common_votes}+ common votes"
-                )
-            else:
-                print("No VOTED_SAME relationships created")
+        result = SimilarityState.load(state_path).result(
+            min_common_votes=min_common_votes
+        )
+        backbone = sparsify(result, senators)
+        print(f"  Kept {int(backbone.mask.sum())} of {int(result.mask.sum())} edges")
+
+        write_backbone(self.driver, self.writer, backbone)
 
-        print("Voting similarity calculated")
+        print("Similarity backbone written")
+
+    def seed_voting_metrics(
+        self, votes: list, senators: list, metrics_path: str = METRICS_PATH
+    ):
+        """Store attendance, rebellion and party cohesion metrics on nodes.
+
+        See voting_metrics.py; the full stats, including Rice per votación
+        and party × party agreement, are also saved to ``metrics_path``.
+        """
+        print("Computing voting metrics...")
+
+        start = time.perf_counter()
+        metrics = compute_metrics(build_vote_matrix(votes, senators), senators)
+        print(
+            f"  {len(metrics.senators)} senators, {len(metrics.parties)} parties "
+            f"in {time.perf_counter() - start:.3f}s"
+        )
+
+        write_metrics(self.writer, metrics)
+        save_metrics(metrics, metrics_path)
+
+        print("Voting metrics written")
+
+    def seed_ideal_points(self, votes: list, senators: list):
+        """Estimate 1D and 2D ideal points from roll calls (see ideal_points.py)."""
+        print("Estimating ideal points...")
+
+        start = time.perf_counter()
+        rows = compute_ideal_points(build_vote_matrix(votes, senators), senators)
+        print(f"  {len(rows)} senators in {time.perf_counter() - start:.2f}s")
+
+        write_ideal_points(self.writer, rows)
+
+        print("Ideal points written")
+
+    def seed_projections(self, data: Dict[str, list]):
+        """Write CO_SPONSORED and SHARED_LOBBYIST edges between senators.
+
+        Both are projections of senator × law and senator × lobbyist
+        relationships (see projection.py), weighted by Newman's collaboration
+        weight.
+        """
+        print("Projecting co-sponsorship and shared-lobbyist networks...")
+
+        start = time.perf_counter()
+        projections = build_projections(build_import_tables(data))
+        counts = ", ".join(
+            f"{len(edges)} {rel_type}" for rel_type, edges in projections.items()
+        )
+        print(f"  {counts} in {time.perf_counter() - start:.3f}s")
+
+        for rel_type, edges in projections.items():
+            write_projection(self.driver, self.writer, rel_type, edges)
+
+        print("Projections written")
+
+    def seed_centrality(self, data: Dict[str, list], state_path: str = STATE_PATH):
+        """Compute degree, PageRank and betweenness and store them on nodes.
+
+        Similarity enters the graph through its backbone, the same VOTED_SAME
+        edges the graph page shows.
+        """
+        print("Computing node centrality...")
+
+        start = time.perf_counter()
+        similarity, backbone = None, None
+        if data.get("votes"):
+            similarity = SimilarityState.load(state_path).result()
+            backbone = sparsify(similarity, data["senators"]).mask
+        graph = build_centrality_graph(build_import_tables(data), similarity, backbone)
+        scores = compute_centrality(graph)
+        print(
+            f"  {len(graph)} nodes, {len(graph.src) // 2} edges in "
+            f"{time.perf_counter() - start:.2f}s"
+        )
+
+        write_centrality(self.driver, self.writer, graph, scores)
+
+        print("Centrality written")
+
+    def seed_layout(
+        self,
+        data: Dict[str, list],
+        state_path: str = STATE_PATH,
+        layout_path: str = LAYOUT_PATH,
+    ):
+        """Compute a force-directed layout and store ``x``/``y`` on nodes.
+
+        Nodes in the previous layout keep their place and only new ones are
+        laid out; the graph page renders these positions directly.
+        """
+        print("Computing graph layout...")
+
+        start = time.perf_counter()
+        similarity = None
+        if data.get("votes"):
+            similarity = SimilarityState.load(state_path).result()
+        graph = build_layout_graph(build_import_tables(data), similarity)
+        previous = load_layout(layout_path)
+        positions = compute_layout(graph, previous=previous)
+        print(
+            f"  {len(graph.ids)} nodes, {len(graph.edges)} edges "
+            f"({'warm' if previous else 'cold'} start) in "
+            f"{time.perf_counter() - start:.2f}s"
+        )
+
+        write_layout(self.writer, graph, positions)
+        save_layout(positions, layout_path)
+
+        print("Layout written")
+
+    def export_snapshot(self, data: Dict[str, list]):
+        """Export the graph snapshot served by /api/graph."""
+        print("Exporting graph snapshot...")
+        manifest = export_snapshot(data)
+        print(
+            f"Snapshot {manifest['version']}: {manifest['counts']['nodes']} nodes, "
+            f"{manifest['counts']['edges']} edges"
+        )
 
     def seed_lobbyists(self, lobbyists: list):
         """Seed lobbyists into Neo4j."""
@@ -240,8 +489,8 @@ class Neo4jSeeder:
             l.origin = lobbyist.origin
         """
 
-        with self.driver.session() as session:
-            session.run(query, lobbyists=lobbyists)
+        stats = self.writer.write(query, lobbyists, param="lobbyists")
+        print(f"  {stats.summary()}")
 
         print("Lobbyists seeded")
 
@@ -252,7 +501,7 @@ class Neo4jSeeder:
         query = """
         UNWIND $meetings AS meeting
         MERGE (s:Senator {id: meeting.senator_id})
-        SET s.name = meeting.senator_name
+        ON CREATE SET s.name = meeting.senator_name, s.active = false
         WITH s, meeting
         MERGE (l:Lobbyist {id: meeting.lobbyist_id})
         MERGE (s)-[m:MET_WITH_LOBBYIST]->(l)
@@ -262,8 +511,8 @@ class Neo4jSeeder:
             m.lobbyistName = meeting.lobbyist_name
         """
 
-        with self.driver.session() as session:
-            session.run(query, meetings=meetings)
+        stats = self.writer.write(query, meetings, param="meetings")
+        print(f"  {stats.summary()}")
 
         print("Lobby meeting relationships seeded")
 
@@ -274,7 +523,7 @@ class Neo4jSeeder:
         query = """
         UNWIND $trips AS trip
         MERGE (s:Senator {id: trip.senator_id})
-        SET s.name = trip.senator_name
+        ON CREATE SET s.name = trip.senator_name, s.active = false
         WITH s, trip
         MERGE (l:Lobbyist {id: trip.lobbyist_id})
         MERGE (s)-[t:TRIP_FUNDED_BY]->(l)
@@ -287,8 +536,8 @@ class Neo4jSeeder:
             t.lobbyistName = trip.lobbyist_name
         """
 
-        with self.driver.session() as session:
-            session.run(query, trips=trips)
+        stats = self.writer.write(query, trips, param="trips")
+        print(f"  {stats.summary()}")
 
         print("Lobby trip relationships seeded")
 
@@ -299,7 +548,7 @@ class Neo4jSeeder:
         query = """
         UNWIND $donations AS donation
         MERGE (s:Senator {id: donation.senator_id})
-        SET s.name = donation.senator_name
+        ON CREATE SET s.name = donation.senator_name, s.active = false
         WITH s, donation
         MERGE (l:Lobbyist {id: donation.lobbyist_id})
         MERGE (s)-[d:RECEIVED_DONATION]->(l)
@@ -311,11 +560,155 @@ class Neo4jSeeder:
             d.lobbyistName = donation.lobbyist_name
         """
 
-        with self.driver.session() as session:
-            session.run(query, donations=donations)
+        stats = self.writer.write(query, donations, param="donations")
+        print(f"  {stats.summary()}")
 
         print("Donation relationships seeded")
 
+    def build_seed_steps(self, data: Dict[str, list]) -> List[Step]:
+        """Build the dependency graph of seeding steps for the given data.
+
+        Laws/votes and lobby data only depend on senators existing, so the two
+        branches can run side by side. The lobby relationship steps are
+        chained because they MERGE the same Senator and Lobbyist nodes.
+        """
+        steps = [
+            Step("constraints", self.create_constraints),
+            Step(
+                "parties",
+                lambda: self.seed_parties(data["parties"]),
+                ["constraints"],
+            ),
+            Step(
+                "senators",
+                lambda: self.seed_senators(data["senators"]),
+                ["parties"],
+            ),
+            Step("laws", lambda: self.seed_laws(data["laws"]), ["constraints"]),
+            Step(
+                "authorships",
+                lambda: self.seed_law_authorships(data["authorships"]),
+                ["senators", "laws"],
+            ),
+        ]
+
+        if data.get("votes"):
+            steps.append(
+                Step(
+                    "votes",
+                    lambda: self.seed_votes(data["votes"]),
+                    ["senators", "laws"],
+                )
+            )
+            steps.append(
+                Step(
+                    "similarity",
+                    lambda: self.calculate_voting_similarity(
+                        data["votes"], data["senators"]
+                    ),
+                    ["votes"],
+                )
+            )
+            steps.append(
+                Step(
+                    "communities",
+                    lambda: self.seed_communities(data["senators"]),
+                    ["similarity"],
+                )
+            )
+            steps.append(
+                Step(
+                    "metrics",
+                    lambda: self.seed_voting_metrics(data["votes"], data["senators"]),
+                    ["votes"],
+                )
+            )
+            steps.append(
+                Step(
+                    "ideal_points",
+                    lambda: self.seed_ideal_points(data["votes"], data["senators"]),
+                    ["votes"],
+                )
+            )
+            steps.append(
+                Step(
+                    "backbone",
+                    lambda: self.seed_backbone(data["senators"]),
+                    ["similarity"],
+                )
+            )
+        else:
+            steps.append(
+                Step("similarity", self.create_sample_relationships, ["senators"])
+            )
+
+        lobby_deps = ["senators"]
+        if data.get("lobbyists"):
+            steps.append(
+                Step(
+                    "lobbyists",
+                    lambda: self.seed_lobbyists(data["lobbyists"]),
+                    ["constraints"],
+                )
+            )
+            lobby_deps = ["senators", "lobbyists"]
+
+        resolver = SenatorResolver(data.get("senators") or [])
+        previous = None
+        for name, method in [
+            ("meetings", self.seed_lobby_meetings),
+            ("trips", self.seed_lobby_trips),
+            ("donations", self.seed_lobby_donations),
+        ]:
+            rows = resolve_lobby_senators(data.get(name) or [], resolver)
+            if not rows:
+                continue
+            deps = lobby_deps + ([previous] if previous else [])
+            steps.append(Step(name, lambda m=method, r=rows: m(r), deps))
+            previous = name
+
+        steps.append(
+            Step(
+                "projections",
+                lambda: self.seed_projections(data),
+                ["authorships"] + ([previous] if previous else lobby_deps),
+            )
+        )
+        steps.append(
+            Step(
+                "centrality",
+                lambda: self.seed_centrality(data),
+                [step.name for step in steps],
+            )
+        )
+
+        # Positions need every node in place
+        steps.append(
+            Step(
+                "layout",
+                lambda: self.seed_layout(data),
+                [step.name for step in steps],
+            )
+        )
+        steps.append(Step("snapshot", lambda: self.export_snapshot(data), ["layout"]))
+
+        return steps
+
+    def seed_all(self, data: Dict[str, list], max_workers: int = 4) -> StepReport:
+        """Seed every entity type, running independent steps concurrently.
+
+        Each step opens its own sessions on the shared (pooled) driver.
+
+        Args:
+            data: Lists keyed by parties, senators, laws, authorships, votes,
+                lobbyists, meetings, trips and donations
+            max_workers: Maximum number of steps running at the same time
+
+        Returns:
+            StepReport with per-step durations and the critical path
+        """
+        return run_step_graph(self.build_seed_steps(data), max_workers=max_workers)
+
 
 def load_mock_data():
     """Load mock data for testing when scraping fails."""
@@ -468,14 +861,36 @@ def load_mock_data():
 
 def main():
     """Main seeding function."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Seed Neo4j with scraped data")
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=NEO4J_BATCH_SIZE,
+        help=f"Rows per write transaction (default: {NEO4J_BATCH_SIZE})",
+    )
+    parser.add_argument(
+        "--parallel-batches",
+        type=int,
+        default=None,
+        help="Concurrent batches for authorship and vote relationships",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Seeding steps run concurrently (default: 4)",
+    )
+    args = parser.parse_args()
+
     print("Starting Neo4j seeder...")
 
-    seeder = Neo4jSeeder()
+    seeder = Neo4jSeeder(
+        batch_size=args.batch_size, parallel_batches=args.parallel_batches
+    )
 
     try:
-        # Create constraints
-        seeder.create_constraints()
-
         # Load data
         data_dir = os.path.join(os.path.dirname(__file__), "data")
 
@@ -561,33 +976,29 @@ def main():
             print("No donation data found, skipping...")
             donations = []
 
-        # Seed data
-        seeder.seed_parties(parties)
-        seeder.seed_senators(senators)
-        seeder.seed_laws(laws)
-        seeder.seed_law_authorships(authorships)
-
-        # Seed voting data if available
-        if votes:
-            seeder.seed_votes(votes)
-            # Calculate real voting similarity instead of using mock data
-            seeder.calculate_voting_similarity(min_common_votes=3)
-        else:
-            # Create sample relationships
-            seeder.create_sample_relationships()
-
-        # Seed lobby data if available
-        if lobbyists:
-            seeder.seed_lobbyists(lobbyists)
-
-        if meetings:
-            seeder.seed_lobby_meetings(meetings)
+        # Seed data, running independent branches concurrently
+        report = seeder.seed_all(
+            {
+                "parties": parties,
+                "senators": senators,
+                "laws": laws,
+                "authorships": authorships,
+                "votes": votes,
+                "lobbyists": lobbyists,
+                "meetings": meetings,
+                "trips": trips,
+                "donations": donations,
+            },
+            max_workers=args.workers,
+        )
 
-        if trips:
-            seeder.seed_lobby_trips(trips)
+        print(report.summary())
 
-        if donations:
-            seeder.seed_lobby_donations(donations)
+        if not report.ok:
+            raise RuntimeError(
+                f"Seeding failed: {', '.join(report.failed)}"
+                + (f" (skipped: {', '.join(report.skipped)})" if report.skipped else "")
+            )
 
         print("Seeding complete!")
 
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""Single entry point for the scraper, seeders and tools.
+
+    python senadograph.py <command> [options]
+    python senadograph.py <command> --help
+
+Each command runs the ``main()`` of the module that implements it, with the
+remaining arguments. Modules are imported only when their command runs, so
+startup costs what that command needs: ``backfill status`` never loads
+neo4j or numpy, and ``scrape`` never loads the seeders. ``bench imports``
+measures it.
+"""
+
+import importlib
+import sys
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple, Union
+
+
+class Command(NamedTuple):
+    """A subcommand and the function running it, as ``module:function``."""
+
+    target: str
+    help: str
+
+
+COMMANDS: Dict[str, Union[Command, Dict[str, Command]]] = {
+    "scrape": Command(
+        "advanced_parallel_scraper:main",
+        "Scrape senators, bills, votes and lobby data",
+    ),
+    "backfill": Command(
+        "work_queue:main", "Queue, work and merge a scrape shared between hosts"
+    ),
+    "refresh": Command("scheduler:main", "Keep scraped data fresh as a daemon"),
+    "pipeline": Command("pipeline:main", "Run the cached scrape-to-export pipeline"),
+    "seed": Command("seed_neo4j:main", "Seed Neo4j with scraped data"),
+    "sync": Command("update_neo4j:main", "Push changed data to Neo4j"),
+    "clear": Command("clear_database:main", "Delete everything in Neo4j"),
+    "export": {
+        "snapshot": Command(
+            "graph_snapshot:main", "Export the graph snapshot served to the web app"
+        ),
+        "csv": Command("bulk_export:main", "Export neo4j-admin import CSVs"),
+    },
+    "bench": {
+        "imports": Command(
+            "senadograph:bench_imports", "Time the imports each command pays for"
+        ),
+        "industry": Command("industry:main", "Time the industry classifier"),
+    },
+    "profile": Command(
+        "senadograph:profile", "Run a command under cProfile and print hot spots"
+    ),
+}
+
+# Third-party packages worth reporting when a module pulls them in
+HEAVY_PACKAGES = ("neo4j", "numpy", "requests", "bs4", "tqdm", "lxml", "dotenv")
+
+
+def _usage(table: Dict[str, Union[Command, Dict[str, Command]]], prog: str) -> str:
+    lines = [f"usage: {prog} <command> [options]", "", "commands:"]
+    for name, entry in table.items():
+        if isinstance(entry, Command):
+            lines.append(f"  {name:<12} {entry.help}")
+        else:
+            lines.append(f"  {name:<12} {' | '.join(entry)}")
+    return "\n".join(lines)
+
+
+def resolve(argv: List[str]) -> Tuple[str, Command, List[str]]:
+    """Command for the leading words of ``argv``.
+
+    Returns:
+        (command name, Command, remaining arguments)
+
+    Raises:
+        SystemExit: With usage, for a missing or unknown command
+    """
+    table = COMMANDS
+    words: List[str] = []
+    while True:
+        prog = " ".join(["senadograph", *words])
+        if not argv or argv[0] in ("-h", "--help"):
+            print(_usage(table, prog))
+            raise SystemExit(0 if argv else 2)
+        entry = table.get(argv[0])
+        if entry is None:
+            print(_usage(table, prog), file=sys.stderr)
+            raise SystemExit(f"\nunknown command: {argv[0]}")
+        words.append(argv[0])
+        argv = argv[1:]
+        if isinstance(entry, Command):
+            return " ".join(words), entry, argv
+        table = entry
+
+
+def load(command: Command) -> Callable:
+    module, _, function = command.target.partition(":")
+    return getattr(importlib.import_module(module), function)
+
+
+def run(argv: List[str]):
+    """Run the command named by the leading words of ``argv``."""
+    name, command, args = resolve(argv)
+    function = load(command)
+
+    from config import ensure_dirs
+
+    ensure_dirs()
+    # The modules' own argparse CLIs read sys.argv
+    saved = sys.argv
+    sys.argv = [f"senadograph {name}", *args]
+    try:
+        return function()
+    finally:
+        sys.argv = saved
+
+
+def _import_time(module: str, cwd: str) -> Dict[str, float]:
+    """Cumulative import time (ms) of ``module`` and of what it pulls in.
+
+    Runs a fresh interpreter with ``-X importtime``, so nothing is cached.
+    """
+    import subprocess
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    times: Dict[str, float] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative) / 1000
+    return times
+
+
+def bench_imports():
+    """Import time of every command module, in fresh interpreters."""
+    import argparse
+    import os
+
+    parser = argparse.ArgumentParser(
+        prog=sys.argv[0],
+        description="Time what importing each command's module costs",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Runs per module; the fastest counts (default: 3)",
+    )
+    parser.add_argument(
+        "modules", nargs="*", help="Modules to time (default: every command)"
+    )
+    args = parser.parse_args()
+
+    modules = args.modules or ["senadograph", "config"]
+    if not args.modules:
+        for entry in COMMANDS.values():
+            commands = [entry] if isinstance(entry, Command) else entry.values()
+            for command in commands:
+                module = command.target.partition(":")[0]
+                if module not in modules:
+                    modules.append(module)
+
+    cwd = os.path.dirname(os.path.abspath(__file__))
+    print(f"{'module':<28} {'ms':>8}  heavy dependencies")
+    for module in modules:
+        best: Optional[Dict[str, float]] = None
+        try:
+            for _ in range(max(args.repeat, 1)):
+                times = _import_time(module, cwd)
+                if best is None or times[module] < best[module]:
+                    best = times
+        except RuntimeError as e:
+            print(f"{module:<28} {'-':>8}  failed: {e}")
+            continue
+        heavy = ", ".join(
+            f"{package} {best[package]:.0f}ms"
+            for package in HEAVY_PACKAGES
+            if package in best
+        )
+        print(f"{module:<28} {best[module]:>8.1f}  {heavy or '-'}")
+
+
+def profile():
+    """Run another command under cProfile."""
+    import argparse
+    import cProfile
+    import pstats
+
+    parser = argparse.ArgumentParser(
+        prog=sys.argv[0], description="Profile a senadograph command"
+    )
+    parser.add_argument(
+        "--sort", default="cumulative", help="pstats sort key (default: cumulative)"
+    )
+    parser.add_argument("--limit", type=int, default=30, help="Functions to print")
+    parser.add_argument("--output", help="Also save the raw stats to this file")
+    parser.add_argument("command", help="Command to profile, e.g. 'export csv'")
+    parser.add_argument("args", nargs=argparse.REMAINDER)
+    args = parser.parse_args()
+
+    profiler = cProfile.Profile()
+    try:
+        profiler.runcall(run, [*args.command.split(), *args.args])
+    finally:
+        if args.output:
+            profiler.dump_stats(args.output)
+        stats = pstats.Stats(profiler)
+        stats.sort_stats(args.sort).print_stats(args.limit)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Main entry point."""
+    result = run(sys.argv[1:] if argv is None else argv)
+    if isinstance(result, int):
+        sys.exit(result)
+
+
+if __name__ == "__main__":
+    main()
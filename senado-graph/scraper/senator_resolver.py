@@ -0,0 +1,98 @@
+"""Resolve senator names from votes, authorships and lobby records to Senator ids."""
+
+import re
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+
+
+def normalize_name(text: str) -> str:
+    """Lowercase, strip accents and collapse whitespace."""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return re.sub(r"\s+", " ", stripped.lower()).strip()
+
+
+def split_name(name: str) -> Tuple[List[str], str]:
+    """Split "Surnames, First Names" into surname tokens and first names."""
+    normalized = normalize_name(name)
+    if "," in normalized:
+        surnames, first = normalized.split(",", 1)
+    else:
+        surnames, first = normalized, ""
+    return surnames.split(), first.strip()
+
+
+class SenatorResolver:
+    """Maps the different name spellings used across the Senate sources to ids.
+
+    The senator list uses full names ("Lagos Weber, Ricardo"), while roll calls
+    abbreviate the second surname ("Lagos W., Ricardo") and lobby registries
+    drop accents. Names are matched on the full normalized name first, then on
+    surname prefix + second-surname initial + first names.
+    """
+
+    def __init__(self, senators: List[dict]):
+        self.senators = senators
+        self.ids = {senator["id"] for senator in senators}
+        self._by_name: Dict[str, str] = {}
+        self._by_first: Dict[str, List[Tuple[List[str], str]]] = {}
+        self._cache: Dict[str, Optional[str]] = {}
+
+        for senator in senators:
+            name = senator.get("name") or ""
+            self._by_name[normalize_name(name)] = senator["id"]
+            surnames, first = split_name(name)
+            self._by_first.setdefault(first, []).append((surnames, senator["id"]))
+
+    def resolve(self, name: str) -> Optional[str]:
+        """Return the Senator id for ``name``, or None if it matches no one."""
+        if name in self._cache:
+            return self._cache[name]
+
+        senator_id = self._by_name.get(normalize_name(name))
+        if senator_id is None:
+            senator_id = self._resolve_abbreviated(name)
+
+        self._cache[name] = senator_id
+        return senator_id
+
+    def _resolve_abbreviated(self, name: str) -> Optional[str]:
+        surnames, first = split_name(name)
+        if not surnames:
+            return None
+
+        initial = ""
+        if surnames[-1].endswith(".") and len(surnames) > 1:
+            initial = surnames[-1].rstrip(".")
+            surnames = surnames[:-1]
+
+        matches = []
+        for candidate, senator_id in self._by_first.get(first, []):
+            if candidate[: len(surnames)] != surnames:
+                continue
+            if initial:
+                rest = candidate[len(surnames) :]
+                if not rest or not rest[0].startswith(initial):
+                    continue
+            matches.append(senator_id)
+
+        # Ambiguous matches are left unresolved rather than guessed
+        return matches[0] if len(matches) == 1 else None
+
+    def resolve_record(self, record: dict) -> Optional[str]:
+        """Resolve a record carrying ``senator_name`` and/or ``senator_id``."""
+        name = record.get("senator_name")
+        if name:
+            senator_id = self.resolve(name)
+            if senator_id:
+                return senator_id
+        raw_id = record.get("senator_id")
+        return raw_id if raw_id in self.ids else None
+
+    def canonical_id(self, record: dict) -> str:
+        """Resolved Senator id, falling back to the record's own senator_id.
+
+        Former senators that appear in roll calls or lobby records but not in
+        the current senator list keep their source id.
+        """
+        return self.resolve_record(record) or record.get("senator_id") or ""
@@ -0,0 +1,163 @@
+"""Vectorized pairwise voting similarity between senators."""
+
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+from models import VotingSimilarity
+from vote_matrix import CAST_CODES, VoteMatrix
+
+# Pairs with fewer votes in common are left out of the similarity graph.
+# Seeding, syncing and the CLIs all use this, so they agree on the edges.
+MIN_COMMON_VOTES = 3
+
+
+@dataclass
+class SimilarityResult:
+    """Pairwise similarity matrices (senators × senators)."""
+
+    senator_ids: List[str]
+    common_votes: np.ndarray
+    agreements: np.ndarray
+    agreement: np.ndarray
+    jaccard: np.ndarray
+    kappa: Optional[np.ndarray]
+    mask: np.ndarray
+
+
+def _safe_divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    out = np.zeros_like(numerator, dtype=np.float64)
+    np.divide(numerator, denominator, out=out, where=denominator > 0)
+    return out
+
+
+def pair_counts(matrix: VoteMatrix, kappa: bool = False) -> dict:
+    """Raw pairwise counters for a vote matrix.
+
+    With one indicator matrix X_c per vote code c and P = Σ X_c the cast-vote
+    indicator:
+
+    - common votes (both cast a vote): P Pᵀ
+    - agreements (same vote): Σ_c X_c X_cᵀ
+    - code counts (i voted c where j also voted): X_c Pᵀ, needed for kappa
+
+    Returns:
+        Dict with ``common``, ``agreements``, ``totals`` and, if ``kappa``,
+        ``code_counts`` (codes × senators × senators)
+    """
+    indicators = [matrix.one_hot(code) for code in CAST_CODES]
+    present = matrix.cast_mask()
+
+    counts = {
+        "common": present @ present.T,
+        "agreements": sum(x @ x.T for x in indicators),
+        "totals": present.sum(axis=1),
+    }
+    if kappa:
+        counts["code_counts"] = np.stack([x @ present.T for x in indicators])
+    return counts
+
+
+def similarity_from_counts(
+    senator_ids: List[str],
+    common: np.ndarray,
+    agreements: np.ndarray,
+    totals: np.ndarray,
+    code_counts: Optional[np.ndarray] = None,
+    min_common_votes: int = MIN_COMMON_VOTES,
+) -> SimilarityResult:
+    """Turn pairwise counters into agreement, Jaccard and kappa matrices.
+
+    - agreement rate: agreements / common votes
+    - Jaccard, as in the original Cypher query: agreements /
+      (votes_i + votes_j - agreements)
+    - kappa: observed vs. chance agreement over the common votaciones, with
+      chance agreement Σ_c (counts_c ⊙ counts_cᵀ) / common²
+    """
+    common = np.asarray(common, dtype=np.float64)
+    agreements = np.asarray(agreements, dtype=np.float64)
+    totals = np.asarray(totals, dtype=np.float64)
+
+    agreement = _safe_divide(agreements, common)
+    jaccard = _safe_divide(agreements, totals[:, None] + totals[None, :] - agreements)
+
+    kappa_matrix = None
+    if code_counts is not None:
+        expected = np.zeros_like(common)
+        for counts in code_counts:
+            expected += counts * counts.T
+        expected = _safe_divide(expected, common**2)
+        kappa_matrix = _safe_divide(agreement - expected, 1.0 - expected)
+        # Identical constant voters have expected == 1; treat as full agreement
+        kappa_matrix[(expected >= 1.0) & (common > 0)] = 1.0
+
+    mask = np.triu(common >= max(min_common_votes, 1), k=1)
+
+    return SimilarityResult(
+        senator_ids=list(senator_ids),
+        common_votes=common.astype(np.int64),
+        agreements=agreements.astype(np.int64),
+        agreement=agreement,
+        jaccard=jaccard,
+        kappa=kappa_matrix,
+        mask=mask,
+    )
+
+
+def compute_similarity(
+    matrix: VoteMatrix,
+    min_common_votes: int = MIN_COMMON_VOTES,
+    kappa: bool = False,
+) -> SimilarityResult:
+    """Compute agreement, Jaccard and optionally Cohen's kappa for all pairs.
+
+    Args:
+        matrix: Vote matrix
+        min_common_votes: Pairs with fewer common votes are masked out
+        kappa: Also compute Cohen's kappa
+
+    Returns:
+        SimilarityResult; ``mask`` marks pairs i < j with enough common votes
+    """
+    counts = pair_counts(matrix, kappa=kappa)
+    return similarity_from_counts(
+        matrix.senator_ids,
+        counts["common"],
+        counts["agreements"],
+        counts["totals"],
+        counts.get("code_counts"),
+        min_common_votes=min_common_votes,
+    )
+
+
+def similarity_edges(
+    result: SimilarityResult, mask: Optional[np.ndarray] = None
+) -> List[dict]:
+    """Edge rows (one per masked pair) ready for the VOTED_SAME MERGE.
+
+    Each pair is oriented so that senator1_id < senator2_id, which is the
+    direction the frontend queries.
+
+    Args:
+        result: Similarity matrices
+        mask: Pairs to emit (defaults to ``result.mask``)
+    """
+    rows, cols = np.nonzero(result.mask if mask is None else mask)
+    edges = []
+    for i, j in zip(rows.tolist(), cols.tolist()):
+        first, second = sorted((result.senator_ids[i], result.senator_ids[j]))
+        edge = VotingSimilarity(
+            senator1_id=first,
+            senator2_id=second,
+            agreement=round(float(result.agreement[i, j]), 4),
+            jaccard=round(float(result.jaccard[i, j]), 4),
+            kappa=(
+                round(float(result.kappa[i, j]), 4)
+                if result.kappa is not None
+                else None
+            ),
+            common_votes=int(result.common_votes[i, j]),
+        )
+        edges.append(edge.to_dict())
+    return edges
@@ -0,0 +1,149 @@
+"""Persisted pairwise agreement counters, updated as new votaciones arrive."""
+
+import os
+from typing import List, Tuple
+
+import numpy as np
+
+from config import DATA_DIR
+from similarity import MIN_COMMON_VOTES, SimilarityResult, pair_counts
+from similarity import similarity_from_counts
+from vote_matrix import CAST_CODES, VoteMatrix
+
+STATE_PATH = os.path.join(DATA_DIR, "similarity_state.npz")
+
+
+class SimilarityState:
+    """Running pairwise counters plus the agreement values last written to Neo4j.
+
+    Folding a votación adds its outer products to the counters, which costs
+    O(senators²) per votación regardless of how much history is already
+    folded in. Votaciones are identified by id and folded at most once.
+    """
+
+    def __init__(self, senator_ids: List[str] = None):
+        senator_ids = list(senator_ids or [])
+        size = len(senator_ids)
+        self.senator_ids = senator_ids
+        self._index = {senator_id: i for i, senator_id in enumerate(senator_ids)}
+        self.common = np.zeros((size, size), dtype=np.int64)
+        self.agreements = np.zeros((size, size), dtype=np.int64)
+        self.code_counts = np.zeros((len(CAST_CODES), size, size), dtype=np.int64)
+        self.totals = np.zeros(size, dtype=np.int64)
+        self.published = np.full((size, size), np.nan)
+        self.applied = set()
+
+    def _grow(self, senator_ids: List[str]) -> np.ndarray:
+        """Add unseen senators and return the state index of each id."""
+        new_ids = [s for s in dict.fromkeys(senator_ids) if s not in self._index]
+        if new_ids:
+            old, extra = len(self.senator_ids), len(new_ids)
+            pad2 = ((0, extra), (0, extra))
+            self.common = np.pad(self.common, pad2)
+            self.agreements = np.pad(self.agreements, pad2)
+            self.code_counts = np.pad(self.code_counts, ((0, 0),) + pad2)
+            self.totals = np.pad(self.totals, (0, extra))
+            self.published = np.pad(self.published, pad2, constant_values=np.nan)
+            for offset, senator_id in enumerate(new_ids):
+                self._index[senator_id] = old + offset
+            self.senator_ids.extend(new_ids)
+        return np.array([self._index[s] for s in senator_ids], dtype=np.int64)
+
+    def fold(self, matrix: VoteMatrix) -> int:
+        """Add every votación in ``matrix`` that hasn't been folded in yet.
+
+        A votación is folded with whatever votes it has at that point; the
+        scrapers fetch all votes of a votación in one response, so later
+        corrections to an already-folded votación need a full recompute.
+
+        Returns:
+            Number of newly folded votaciones
+        """
+        columns = [
+            j for j, v in enumerate(matrix.votaciones) if v["id"] not in self.applied
+        ]
+        if not columns:
+            return 0
+
+        new = matrix.select_votaciones(columns)
+        idx = self._grow(new.senator_ids)
+        block = np.ix_(idx, idx)
+        counts = pair_counts(new, kappa=True)
+
+        self.common[block] += counts["common"].astype(np.int64)
+        self.agreements[block] += counts["agreements"].astype(np.int64)
+        for c in range(len(CAST_CODES)):
+            self.code_counts[c][block] += counts["code_counts"][c].astype(np.int64)
+        self.totals[idx] += counts["totals"].astype(np.int64)
+        self.applied.update(v["id"] for v in new.votaciones)
+
+        return len(columns)
+
+    def result(
+        self, min_common_votes: int = MIN_COMMON_VOTES, kappa: bool = True
+    ) -> SimilarityResult:
+        """Similarity matrices derived from the current counters."""
+        return similarity_from_counts(
+            self.senator_ids,
+            self.common,
+            self.agreements,
+            self.totals,
+            self.code_counts if kappa else None,
+            min_common_votes=min_common_votes,
+        )
+
+    def changes(
+        self, result: SimilarityResult, epsilon: float = 0.01
+    ) -> Tuple[np.ndarray, List[Tuple[str, str]]]:
+        """Pairs whose VOTED_SAME edge must be rewritten or removed.
+
+        Returns:
+            Tuple of (mask of pairs to upsert, list of pairs to delete). A pair
+            is upserted when it is new or its agreement moved more than
+            ``epsilon`` since it was last published.
+        """
+        published = ~np.isnan(self.published)
+        drift = np.abs(result.agreement - np.nan_to_num(self.published))
+        upsert = result.mask & (~published | (drift > epsilon))
+
+        upper = np.triu(np.ones_like(result.mask, dtype=bool), k=1)
+        rows, cols = np.nonzero(upper & published & ~result.mask)
+        removed = [
+            tuple(sorted((self.senator_ids[i], self.senator_ids[j])))
+            for i, j in zip(rows.tolist(), cols.tolist())
+        ]
+        return upsert, removed
+
+    def mark_published(self, result: SimilarityResult, upsert: np.ndarray):
+        """Record the values written to Neo4j after a successful sync."""
+        self.published[upsert] = result.agreement[upsert]
+        self.published[~result.mask] = np.nan
+
+    def save(self, path: str = STATE_PATH):
+        tmp_path = f"{path}.tmp.npz"
+        np.savez_compressed(
+            tmp_path,
+            senator_ids=np.array(self.senator_ids, dtype=str),
+            common=self.common,
+            agreements=self.agreements,
+            code_counts=self.code_counts,
+            totals=self.totals,
+            published=self.published,
+            applied=np.array(sorted(self.applied), dtype=str),
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str = STATE_PATH) -> "SimilarityState":
+        """Load a saved state, or return an empty one if none exists."""
+        if not os.path.exists(path):
+            return cls()
+        with np.load(path) as data:
+            state = cls(data["senator_ids"].tolist())
+            state.common = data["common"]
+            state.agreements = data["agreements"]
+            state.code_counts = data["code_counts"]
+            state.totals = data["totals"]
+            state.published = data["published"]
+            state.applied = set(data["applied"].tolist())
+        return state
@@ -0,0 +1,445 @@
+"""Per-period voting agreement with cumulative sums for rolling windows.
+
+Pairwise counters are computed once per time bucket (month, quarter or
+legislative year) and stacked along a leading period axis. Storing the
+running totals means the counters for any window of consecutive buckets are
+a single subtraction, so rolling or arbitrary windows cost O(1) per pair no
+matter how many votaciones they span.
+"""
+
+import os
+import sys
+import uuid
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from config import DATA_DIR
+from dates import to_iso
+from similarity import MIN_COMMON_VOTES, SimilarityResult, pair_counts
+from similarity import similarity_edges, similarity_from_counts
+from vote_matrix import CAST_CODES, VoteMatrix, build_vote_matrix
+
+GRANULARITIES = ("month", "quarter", "legislative_year")
+
+# The legislative year of the Chilean Congress starts on March 11
+LEGISLATIVE_YEAR_START = (3, 11)
+
+# Upsert period-stamped agreement edges; ``window`` is the number of buckets
+PERIOD_EDGE_QUERY = """
+UNWIND $edges AS edge
+MATCH (s1:Senator {id: edge.senator1_id})
+MATCH (s2:Senator {id: edge.senator2_id})
+MERGE (s1)-[r:VOTED_SAME_IN {
+    granularity: edge.granularity, period: edge.period, window: edge.window
+}]->(s2)
+SET r.periodStart = edge.periodStart,
+    r.periodEnd = edge.periodEnd,
+    r.agreement = edge.agreement,
+    r.jaccard = edge.jaccard,
+    r.kappa = edge.kappa,
+    r.commonVotes = edge.commonVotes,
+    r.runId = edge.runId
+"""
+
+PERIOD_EDGE_INDEX = (
+    "CREATE INDEX voted_same_in_period IF NOT EXISTS "
+    "FOR ()-[r:VOTED_SAME_IN]-() ON (r.granularity, r.period)"
+)
+
+
+def _check_window(size: int):
+    if size < 1:
+        raise ValueError(f"Window size must be at least 1 bucket, got {size}")
+
+
+def windows_path(granularity: str, data_dir: str = DATA_DIR) -> str:
+    return os.path.join(data_dir, f"similarity_{granularity}.npz")
+
+
+def period_of(date: str, granularity: str) -> Optional[str]:
+    """Bucket label for a date (None if unparseable).
+
+    Labels sort chronologically: ``2024-03``, ``2024-Q1`` and ``2024-2025``
+    for the legislative year starting on March 11, 2024.
+    """
+    iso = to_iso(date)
+    if iso is None:
+        return None
+    year, month, day = int(iso[:4]), int(iso[5:7]), int(iso[8:10])
+
+    if granularity == "month":
+        return f"{year:04d}-{month:02d}"
+    if granularity == "quarter":
+        return f"{year:04d}-Q{(month - 1) // 3 + 1}"
+    if granularity == "legislative_year":
+        if (month, day) < LEGISLATIVE_YEAR_START:
+            year -= 1
+        return f"{year:04d}-{year + 1:04d}"
+    raise ValueError(f"Unknown granularity: {granularity}")
+
+
+def _next_period(label: str, granularity: str) -> str:
+    year = int(label[:4])
+    if granularity == "month":
+        month = int(label[5:7])
+        return f"{year + month // 12:04d}-{month % 12 + 1:02d}"
+    if granularity == "quarter":
+        quarter = int(label[6])
+        return f"{year + quarter // 4:04d}-Q{quarter % 4 + 1}"
+    return f"{year + 1:04d}-{year + 2:04d}"
+
+
+def period_range(first: str, last: str, granularity: str) -> List[str]:
+    """Every bucket label from ``first`` to ``last``, including empty ones."""
+    periods = [first]
+    while periods[-1] < last:
+        periods.append(_next_period(periods[-1], granularity))
+    return periods
+
+
+def period_bounds(label: str, granularity: str) -> Tuple[str, str]:
+    """First and last ISO date covered by a bucket."""
+    year = int(label[:4])
+    if granularity == "month":
+        start_month = end_month = int(label[5:7])
+    elif granularity == "quarter":
+        start_month = (int(label[6]) - 1) * 3 + 1
+        end_month = start_month + 2
+    else:
+        month, day = LEGISLATIVE_YEAR_START
+        end = np.datetime64(f"{year + 1:04d}-{month:02d}-{day:02d}") - 1
+        return f"{year:04d}-{month:02d}-{day:02d}", str(end)
+
+    end = np.datetime64(f"{year:04d}-{end_month:02d}", "M") + 1
+    return f"{year:04d}-{start_month:02d}-01", str(end.astype("datetime64[D]") - 1)
+
+
+def _pack(counts: np.ndarray) -> np.ndarray:
+    """Smallest unsigned dtype that holds the counts."""
+    top = int(counts.max()) if counts.size else 0
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if top <= np.iinfo(dtype).max:
+            return counts.astype(dtype)
+    return counts.astype(np.uint64)
+
+
+@dataclass
+class WindowedCounts:
+    """Cumulative pairwise counters over consecutive time buckets.
+
+    ``cum_*[k]`` holds the counters for the first ``k`` buckets, so index 0
+    is all zeros and buckets ``[a, b)`` are ``cum_*[b] - cum_*[a]``.
+    """
+
+    senator_ids: List[str]
+    periods: List[str]
+    granularity: str
+    votaciones_per_period: np.ndarray
+    cum_common: np.ndarray
+    cum_agreements: np.ndarray
+    cum_totals: np.ndarray
+    cum_code_counts: Optional[np.ndarray] = None
+
+    def period_index(self, label: str) -> int:
+        try:
+            return self.periods.index(label)
+        except ValueError:
+            raise KeyError(f"No {self.granularity} bucket {label}") from None
+
+    def window(
+        self, start: int, end: int, min_common_votes: int = MIN_COMMON_VOTES
+    ) -> SimilarityResult:
+        """Similarity over buckets ``[start, end)``, in O(1) per pair.
+
+        Args:
+            start: Index of the first bucket
+            end: Index one past the last bucket
+            min_common_votes: Pairs with fewer common votes are masked out
+        """
+        if not 0 <= start <= end <= len(self.periods):
+            raise IndexError(f"Window [{start}, {end}) outside 0..{len(self.periods)}")
+        code_counts = None
+        if self.cum_code_counts is not None:
+            code_counts = self.cum_code_counts[end] - self.cum_code_counts[start]
+        return similarity_from_counts(
+            self.senator_ids,
+            self.cum_common[end] - self.cum_common[start],
+            self.cum_agreements[end] - self.cum_agreements[start],
+            self.cum_totals[end] - self.cum_totals[start],
+            code_counts,
+            min_common_votes=min_common_votes,
+        )
+
+    def between(
+        self, first: str, last: str, min_common_votes: int = MIN_COMMON_VOTES
+    ) -> SimilarityResult:
+        """Similarity from bucket label ``first`` through ``last`` inclusive."""
+        return self.window(
+            self.period_index(first),
+            self.period_index(last) + 1,
+            min_common_votes=min_common_votes,
+        )
+
+    def rolling(
+        self, size: int, min_common_votes: int = MIN_COMMON_VOTES
+    ) -> Iterator[Tuple[str, SimilarityResult]]:
+        """Yield (last bucket label, result) for every window of ``size`` buckets."""
+        _check_window(size)
+        for end in range(size, len(self.periods) + 1):
+            yield self.periods[end - 1], self.window(
+                end - size, end, min_common_votes=min_common_votes
+            )
+
+    def agreement_tensor(self, size: int = 1) -> np.ndarray:
+        """Stacked agreement matrices (windows × senators × senators).
+
+        With ``size`` 1 this is the per-bucket agreement; pairs with no common
+        votes in a window are NaN.
+        """
+        _check_window(size)
+        common = self.cum_common[size:] - self.cum_common[:-size]
+        agreements = self.cum_agreements[size:] - self.cum_agreements[:-size]
+        out = np.full(common.shape, np.nan)
+        np.divide(agreements, common, out=out, where=common > 0)
+        return out
+
+    def save(self, path: str):
+        """Save per-bucket counters (not the running totals) compressed.
+
+        The symmetric matrices keep only their upper triangle.
+        """
+        upper = np.triu_indices(len(self.senator_ids))
+        arrays = {
+            "senator_ids": np.array(self.senator_ids, dtype=str),
+            "periods": np.array(self.periods, dtype=str),
+            "granularity": np.array(self.granularity),
+            "votaciones": _pack(self.votaciones_per_period),
+            "common": _pack(np.diff(self.cum_common, axis=0)[:, upper[0], upper[1]]),
+            "agreements": _pack(
+                np.diff(self.cum_agreements, axis=0)[:, upper[0], upper[1]]
+            ),
+            "totals": _pack(np.diff(self.cum_totals, axis=0)),
+        }
+        if self.cum_code_counts is not None:
+            arrays["code_counts"] = _pack(np.diff(self.cum_code_counts, axis=0))
+
+        tmp_path = f"{path}.tmp.npz"
+        np.savez_compressed(tmp_path, **arrays)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "WindowedCounts":
+        with np.load(path) as data:
+            senator_ids = data["senator_ids"].tolist()
+            size = len(senator_ids)
+            upper = np.triu_indices(size)
+
+            def unpack(packed: np.ndarray) -> np.ndarray:
+                full = np.zeros((packed.shape[0], size, size), dtype=np.int64)
+                full[:, upper[0], upper[1]] = packed
+                full[:, upper[1], upper[0]] = packed
+                return full
+
+            code_counts = None
+            if "code_counts" in data:
+                code_counts = _cumulative(data["code_counts"].astype(np.int64))
+            return cls(
+                senator_ids=senator_ids,
+                periods=data["periods"].tolist(),
+                granularity=str(data["granularity"]),
+                votaciones_per_period=data["votaciones"].astype(np.int64),
+                cum_common=_cumulative(unpack(data["common"])),
+                cum_agreements=_cumulative(unpack(data["agreements"])),
+                cum_totals=_cumulative(data["totals"].astype(np.int64)),
+                cum_code_counts=code_counts,
+            )
+
+
+def _cumulative(per_period: np.ndarray) -> np.ndarray:
+    """Running totals along the period axis, with a leading zero slice."""
+    zero = np.zeros((1,) + per_period.shape[1:], dtype=np.int64)
+    return np.concatenate([zero, np.cumsum(per_period, axis=0, dtype=np.int64)])
+
+
+def build_windowed_counts(
+    matrix: VoteMatrix, granularity: str = "month", kappa: bool = False
+) -> WindowedCounts:
+    """Bucket the votaciones of ``matrix`` by date and stack their counters.
+
+    Votaciones without a parseable date are left out. Empty buckets between
+    the first and last votación are kept so windows span calendar time.
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Unknown granularity: {granularity}")
+
+    labels = [period_of(v.get("date"), granularity) for v in matrix.votaciones]
+    dated = sorted(label for label in set(labels) if label)
+    periods = period_range(dated[0], dated[-1], granularity) if dated else []
+    size = len(matrix.senator_ids)
+
+    common = np.zeros((len(periods), size, size), dtype=np.int64)
+    agreements = np.zeros_like(common)
+    totals = np.zeros((len(periods), size), dtype=np.int64)
+    code_counts = (
+        np.zeros((len(periods), len(CAST_CODES), size, size), dtype=np.int64)
+        if kappa
+        else None
+    )
+    votaciones = np.zeros(len(periods), dtype=np.int64)
+
+    columns: Dict[str, List[int]] = {}
+    for j, label in enumerate(labels):
+        if label:
+            columns.setdefault(label, []).append(j)
+
+    for k, label in enumerate(periods):
+        if label not in columns:
+            continue
+        counts = pair_counts(matrix.select_votaciones(columns[label]), kappa=kappa)
+        common[k] = counts["common"]
+        agreements[k] = counts["agreements"]
+        totals[k] = counts["totals"]
+        if kappa:
+            code_counts[k] = counts["code_counts"]
+        votaciones[k] = len(columns[label])
+
+    return WindowedCounts(
+        senator_ids=list(matrix.senator_ids),
+        periods=periods,
+        granularity=granularity,
+        votaciones_per_period=votaciones,
+        cum_common=_cumulative(common),
+        cum_agreements=_cumulative(agreements),
+        cum_totals=_cumulative(totals),
+        cum_code_counts=_cumulative(code_counts) if kappa else None,
+    )
+
+
+def period_edges(
+    counts: WindowedCounts, size: int = 1, min_common_votes: int = MIN_COMMON_VOTES
+) -> List[dict]:
+    """VOTED_SAME_IN edge rows for every window of ``size`` buckets.
+
+    Each edge is stamped with the label of the window's last bucket and the
+    ISO dates the window covers.
+    """
+    edges = []
+    for end_label, result in counts.rolling(size, min_common_votes=min_common_votes):
+        start_label = counts.periods[counts.period_index(end_label) - size + 1]
+        period_start, _ = period_bounds(start_label, counts.granularity)
+        _, period_end = period_bounds(end_label, counts.granularity)
+        for edge in similarity_edges(result):
+            edge.update(
+                granularity=counts.granularity,
+                period=end_label,
+                window=size,
+                periodStart=period_start,
+                periodEnd=period_end,
+            )
+            edges.append(edge)
+    return edges
+
+
+def write_period_edges(driver, writer, edges: List[dict], granularity: str, size: int):
+    """Replace the VOTED_SAME_IN edges of one granularity and window size."""
+    run_id = str(uuid.uuid4())
+    for edge in edges:
+        edge["runId"] = run_id
+
+    with driver.session() as session:
+        session.run(PERIOD_EDGE_INDEX).consume()
+
+    stats = writer.write(PERIOD_EDGE_QUERY, edges, param="edges")
+    print(f"  {stats.summary()}")
+
+    with driver.session() as session:
+        session.run(
+            """
+            MATCH ()-[r:VOTED_SAME_IN {granularity: $granularity, window: $window}]->()
+            WHERE r.runId <> $run_id
+            DELETE r
+            """,
+            granularity=granularity,
+            window=size,
+            run_id=run_id,
+        ).consume()
+
+
+def main():
+    """Main entry point."""
+    import argparse
+
+    from scraped_data import load_dataset
+
+    parser = argparse.ArgumentParser(
+        description="Compute per-period and rolling voting agreement"
+    )
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument(
+        "--granularity", choices=GRANULARITIES, default="month", help="Bucket size"
+    )
+    parser.add_argument(
+        "--window",
+        type=int,
+        default=1,
+        help="Buckets per rolling window written to Neo4j (default: 1)",
+    )
+    parser.add_argument("--min-common-votes", type=int, default=MIN_COMMON_VOTES)
+    parser.add_argument("--kappa", action="store_true", help="Also keep kappa")
+    parser.add_argument(
+        "--out", help="Output file (default: data/similarity_<granularity>.npz)"
+    )
+    parser.add_argument(
+        "--neo4j",
+        action="store_true",
+        help="Write VOTED_SAME_IN edges stamped with their period",
+    )
+    args = parser.parse_args()
+    if args.window < 1:
+        parser.error("--window must be at least 1")
+
+    votes = load_dataset("votes", args.data_dir)
+    if not votes:
+        print("No voting data found")
+        sys.exit(1)
+
+    matrix = build_vote_matrix(votes, load_dataset("senators", args.data_dir))
+    counts = build_windowed_counts(matrix, args.granularity, kappa=args.kappa)
+    out = args.out or windows_path(args.granularity, args.data_dir)
+    counts.save(out)
+    print(
+        f"{len(counts.periods)} {args.granularity} buckets x "
+        f"{len(counts.senator_ids)} senators saved to {out}"
+    )
+
+    tensor = counts.agreement_tensor(args.window)
+    for label, matrix_k in zip(counts.periods[args.window - 1 :], tensor):
+        pairs = np.triu(~np.isnan(matrix_k), k=1)
+        if not pairs.any():
+            continue
+        mean = float(matrix_k[pairs].mean())
+        print(f"  {label}: {int(pairs.sum())} pairs, mean agreement {mean:.3f}")
+
+    if args.neo4j:
+        from neo4j import GraphDatabase
+
+        from config import NEO4J_PASSWORD, NEO4J_URI, NEO4J_USERNAME
+        from neo4j_batch import BatchWriter
+
+        edges = period_edges(
+            counts, args.window, min_common_votes=args.min_common_votes
+        )
+        print(f"Writing {len(edges)} VOTED_SAME_IN relationships...")
+        driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USERNAME, NEO4J_PASSWORD))
+        try:
+            write_period_edges(
+                driver, BatchWriter(driver), edges, args.granularity, args.window
+            )
+        finally:
+            driver.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Coalesce concurrent fetches of the same URL and cache results briefly.
+
+A boletin shows up on several days, and different thread pools and pipeline
+stages ask for the same ``tramitacion.php`` URL at the same time. With
+``SingleFlight.do(key, fn)`` the first caller for a key runs ``fn`` while
+later callers wait for it and get the same result, so the download and the
+XML parse happen once. Results are then kept for RESULT_CACHE_TTL seconds
+(at most RESULT_CACHE_SIZE of them, least recently used dropped first), so
+callers arriving just after also skip the request.
+
+Failures are never cached: an exception is re-raised to every waiting
+caller and a None result is shared but not stored, so the next call tries
+again.
+"""
+
+import time
+from collections import OrderedDict
+from threading import Event, Lock
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from config import RESULT_CACHE_SIZE, RESULT_CACHE_TTL
+
+
+class _Call:
+    """A fetch in progress and the callers waiting on it."""
+
+    def __init__(self):
+        self.done = Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Per-key call coalescing with a short-lived result cache."""
+
+    def __init__(self, ttl: float = RESULT_CACHE_TTL, size: int = RESULT_CACHE_SIZE):
+        self.ttl = ttl
+        self.size = size
+        self._lock = Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        # key -> (expiry, value), oldest use first
+        self._cache: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self.stats = {"calls": 0, "cached": 0, "coalesced": 0}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Result of ``fn()`` for ``key``, shared with concurrent callers."""
+        with self._lock:
+            hit = self._cache.get(key)
+            if hit is not None:
+                if hit[0] > time.monotonic():
+                    self._cache.move_to_end(key)
+                    self.stats["cached"] += 1
+                    return hit[1]
+                del self._cache[key]
+
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.stats["calls"] += 1
+            else:
+                self.stats["coalesced"] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                if call.error is None and call.value is not None and self.ttl > 0:
+                    self._cache[key] = (time.monotonic() + self.ttl, call.value)
+                    while len(self._cache) > self.size:
+                        self._cache.popitem(last=False)
+            call.done.set()
+        return call.value
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def summary(self) -> str:
+        return (
+            f"{self.stats['calls']} fetched, {self.stats['coalesced']} coalesced, "
+            f"{self.stats['cached']} from cache"
+        )
+
+
+# Shared by every scraper in the process; keys are (kind, url)
+RESPONSES = SingleFlight()
@@ -16,12 +16,16 @@ from config import (
     LOBBY_TRIPS_URL,
     LOBBY_DONATIONS_URL,
     REQUEST_TIMEOUT,
-    REQUEST_DELAY,
     MAX_RETRIES,
     INITIAL_BACKOFF,
     MAX_BACKOFF,
     IMAGES_DIR,
+    ensure_dirs,
 )
+from dates import is_within_days, normalize_date
+from industry import classify_industry
+from rate_limit import rate_limit
+from single_flight import RESPONSES
 from models import (
     Senator,
     Party,
@@ -42,7 +46,7 @@ class SenateScraper:
         initial_backoff: float = 1.0,
         max_backoff: float = 60.0,
     ):
-        self.session = requests.Session()
+        self.session = rate_limit(requests.Session())
         self.session.headers.update(
             {
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
@@ -52,80 +56,6 @@ class SenateScraper:
         self.initial_backoff = initial_backoff
         self.max_backoff = max_backoff
 
-    def _is_within_days(self, date_str: str, days: int = 30) -> bool:
-        """Check if a date string is within the last N days from today.
-
-        Args:
-            date_str: Date string in various formats (DD/MM/YYYY, YYYY-MM-DD, etc.)
-            days: Number of days to look back (default 30)
-
-        Returns:
-            True if date is within the last N days, False if older or parsing fails
-        """
-        from datetime import datetime, timedelta
-
-        if not date_str or not date_str.strip():
-            return True  # Include if no date provided
-
-        date_str = date_str.strip()
-        parsed_date = None
-
-        # Try various date formats
-        formats_to_try = [
-            "%d/%m/%Y",  # DD/MM/YYYY
-            "%Y-%m-%d",  # YYYY-MM-DD
-            "%d-%m-%Y",  # DD-MM-YYYY
-            "%d.%m.%Y",  # DD.MM.YYYY
-            "%m/%d/%Y",  # MM/DD/YYYY
-            "%Y/%m/%d",  # YYYY/MM/DD
-        ]
-
-        for fmt in formats_to_try:
-            try:
-                parsed_date = datetime.strptime(date_str, fmt)
-                break
-            except ValueError:
-                continue
-
-        # If none of the formats worked, try extracting date with regex
-        if parsed_date is None:
-            import re
-
-            # Try to find date patterns like 25/01/2024 or 2024-01-25
-            patterns = [
-                r"(\d{2})[/-](\d{2})[/-](\d{4})",  # DD/MM/YYYY or DD-MM-YYYY
-                r"(\d{4})[/-](\d{2})[/-](\d{2})",  # YYYY-MM-DD or YYYY/MM/DD
-            ]
-            for pattern in patterns:
-                match = re.search(pattern, date_str)
-                if match:
-                    try:
-                        if len(match.group(3)) == 4:  # DD/MM/YYYY
-                            parsed_date = datetime(
-                                int(match.group(3)),
-                                int(match.group(2)),
-                                int(match.group(1)),
-                            )
-                        else:  # YYYY/MM/DD
-                            parsed_date = datetime(
-                                int(match.group(1)),
-                                int(match.group(2)),
-                                int(match.group(3)),
-                            )
-                        break
-                    except ValueError:
-                        continue
-
-        # If we still couldn't parse, include the data by default
-        if parsed_date is None:
-            return True
-
-        # Calculate the cutoff date
-        cutoff_date = datetime.now() - timedelta(days=days)
-
-        # Return True if date is within range (not older than cutoff)
-        return parsed_date >= cutoff_date
-
     def _get(self, url: str) -> Optional[BeautifulSoup]:
         """Make a GET request and return BeautifulSoup object."""
         return self._get_with_retry(url, return_json=False)
@@ -145,7 +75,6 @@ class SenateScraper:
                 if return_json:
                     return response.content
 
-                time.sleep(REQUEST_DELAY)
                 return BeautifulSoup(response.content, "html.parser")
 
             except requests.exceptions.Timeout as e:
@@ -181,6 +110,10 @@ class SenateScraper:
         return None
 
     def _get_api_response(self, url: str) -> Optional[bytes]:
+        """Get API response content, shared with concurrent requests for it."""
+        return RESPONSES.do(("content", url), lambda: self._download(url))
+
+    def _download(self, url: str) -> Optional[bytes]:
         """Get API response content with retry logic."""
         attempt = 0
         backoff = self.initial_backoff
@@ -189,7 +122,6 @@ class SenateScraper:
             try:
                 response = self.session.get(url, timeout=REQUEST_TIMEOUT)
                 response.raise_for_status()
-                time.sleep(REQUEST_DELAY)
                 return response.content
 
             except requests.exceptions.Timeout as e:
@@ -324,6 +256,7 @@ class SenateScraper:
             response.raise_for_status()
 
             # Save to images directory
+            ensure_dirs()
             filename = f"{senator_id}.jpg"
             filepath = f"{IMAGES_DIR}/{filename}"
 
@@ -474,7 +407,7 @@ class SenateScraper:
                                 boletin=boletin_text,
                                 title=titulo,
                                 description=" | ".join(materias) if materias else "",
-                                date_proposed=fecha_ingreso,
+                                date_proposed=normalize_date(fecha_ingreso),
                                 status=self._normalize_status(estado),
                                 topic=materias[0] if materias else None,
                             )
@@ -499,7 +432,7 @@ class SenateScraper:
                                                 "role": "principal"
                                                 if idx == 0
                                                 else "co_sponsor",
-                                                "date": fecha_ingreso,
+                                                "date": normalize_date(fecha_ingreso),
                                             }
                                         )
 
@@ -510,7 +443,6 @@ class SenateScraper:
                             print(f"Error parsing law: {e}")
                             continue
 
-                time.sleep(REQUEST_DELAY)
                 current_date -= timedelta(days=1)
                 days_checked += 1
 
@@ -614,7 +546,9 @@ class SenateScraper:
                                     "session": session.text
                                     if session is not None
                                     else "",
-                                    "date": fecha.text if fecha is not None else "",
+                                    "date": normalize_date(
+                                        fecha.text if fecha is not None else ""
+                                    ),
                                     "topic": tema.text if tema is not None else "",
                                     "senator_name": parlamentario.text,
                                     "vote": self._normalize_vote(
@@ -698,7 +632,7 @@ class SenateScraper:
                         activity = tds[3].get_text(strip=True)
 
                         # Filter by registration date
-                        if not self._is_within_days(date, days):
+                        if not is_within_days(date, days):
                             continue
 
                         lobbyist_id = f"lobbyist_{self._sanitize_id(name)}"
@@ -707,8 +641,8 @@ class SenateScraper:
                             "id": lobbyist_id,
                             "name": name,
                             "type": "organization",
-                            "industry": self._extract_industry(activity),
-                            "registration_date": date,
+                            "industry": classify_industry(activity),
+                            "registration_date": normalize_date(date),
                             "origin": origin,
                         }
 
@@ -719,7 +653,7 @@ class SenateScraper:
                                 lobbyist_id, origin, date, activity
                             )
                             # Filter meetings by meeting date
-                            if meeting and self._is_within_days(
+                            if meeting and is_within_days(
                                 meeting.get("date", ""), days
                             ):
                                 meetings.append(meeting)
@@ -728,8 +662,6 @@ class SenateScraper:
                 print(f"Error parsing lobbyist table for {year}: {e}")
                 continue
 
-            time.sleep(REQUEST_DELAY)
-
         print(
             f"Found {len(lobbyists)} lobbyists and {len(meetings)} meetings (last {days} days)"
         )
@@ -761,32 +693,6 @@ class SenateScraper:
 
         return None
 
-    def _extract_industry(self, activity: str) -> str:
-        """Extract industry/sector from activity description."""
-        activity_lower = activity.lower()
-
-        industry_keywords = {
-            "mining": ["minería", "cobre", "minera", "litio"],
-            "energy": ["energía", "renovable", "hidrógeno", "eléctrica"],
-            "fishing": ["pesca", "acuicultura", "salmon", "mar"],
-            "agriculture": ["agrícola", "agricultura", "fruta", "viña", "vino"],
-            "education": ["educación", "universidad", "escuela"],
-            "health": ["salud", "farmacéutica", "médico"],
-            "finance": ["banca", "financiero", "bancario", "seguro"],
-            "technology": ["tecnología", "digital", "software"],
-            "environment": ["medio ambiente", "ambiental", "agua"],
-            "construction": ["construcción", "inmobiliario", "vivienda"],
-            "transport": ["transporte", "aéreo", "ferrocarril"],
-            "labor": ["trabajo", "laboral", "sindical"],
-            "justice": ["justicia", "legal", "ley"],
-        }
-
-        for industry, keywords in industry_keywords.items():
-            if any(keyword in activity_lower for keyword in keywords):
-                return industry
-
-        return "other"
-
     def scrape_trips(self, days: int = 30) -> List[dict]:
         """Scrape lobbyist-funded trips.
 
@@ -844,7 +750,7 @@ class SenateScraper:
                 # Check for date filtering if a date column was identified
                 if date_column_index >= 0 and date_column_index < len(tds):
                     trip_date = tds[date_column_index].get_text(strip=True)
-                    if trip_date and not self._is_within_days(trip_date, days):
+                    if trip_date and not is_within_days(trip_date, days):
                         continue
 
                 cost = self._parse_cost(cost_text)
@@ -909,7 +815,7 @@ class SenateScraper:
                 donor = tds[4].get_text(strip=True)
 
                 # Filter by donation date
-                if not self._is_within_days(date, days):
+                if not is_within_days(date, days):
                     continue
 
                 senator_id = f"senator_{self._sanitize_id(senator_name)}"
@@ -920,7 +826,7 @@ class SenateScraper:
                     "lobbyist_id": lobbyist_id,
                     "senator_name": senator_name,
                     "lobbyist_name": donor,
-                    "date": date,
+                    "date": normalize_date(date),
                     "occasion": occasion,
                     "item": item,
                     "donor": donor,
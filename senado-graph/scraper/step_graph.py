@@ -0,0 +1,168 @@
+"""Run a small dependency graph of steps, executing independent branches concurrently."""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+
+@dataclass
+class Step:
+    """A named unit of work and the steps that must finish before it."""
+
+    name: str
+    run: Callable[[], object]
+    depends_on: List[str] = field(default_factory=list)
+
+
+@dataclass
+class StepReport:
+    """Outcome of running a step graph."""
+
+    durations: Dict[str, float] = field(default_factory=dict)
+    results: Dict[str, object] = field(default_factory=dict)
+    failed: Dict[str, str] = field(default_factory=dict)
+    skipped: List[str] = field(default_factory=list)
+    wall_seconds: float = 0.0
+    critical_path: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed and not self.skipped
+
+    def summary(self) -> str:
+        lines = ["Step durations:"]
+        for name, seconds in sorted(
+            self.durations.items(), key=lambda item: -item[1]
+        ):
+            status = " (failed)" if name in self.failed else ""
+            lines.append(f"  - {name}: {seconds:.2f}s{status}")
+        for name in self.skipped:
+            lines.append(f"  - {name}: skipped")
+        total = sum(self.durations.values())
+        critical = sum(self.durations.get(name, 0.0) for name in self.critical_path)
+        lines.append(f"Sum of steps: {total:.2f}s")
+        lines.append(
+            f"Critical path: {' -> '.join(self.critical_path)} ({critical:.2f}s)"
+        )
+        lines.append(f"Wall time: {self.wall_seconds:.2f}s")
+        return "\n".join(lines)
+
+
+def validate_steps(steps: List[Step]) -> List[str]:
+    """Check names and dependencies, returning the steps in topological order.
+
+    Raises:
+        ValueError: On duplicate names, unknown dependencies or cycles
+    """
+    by_name: Dict[str, Step] = {}
+    for step in steps:
+        if step.name in by_name:
+            raise ValueError(f"Duplicate step name: {step.name}")
+        by_name[step.name] = step
+
+    for step in steps:
+        for dep in step.depends_on:
+            if dep not in by_name:
+                raise ValueError(f"Step {step.name} depends on unknown step {dep}")
+
+    order = []
+    state: Dict[str, int] = {}  # 1 = visiting, 2 = done
+
+    def visit(name: str, trail: List[str]):
+        if state.get(name) == 2:
+            return
+        if state.get(name) == 1:
+            raise ValueError(f"Dependency cycle: {' -> '.join(trail + [name])}")
+        state[name] = 1
+        for dep in by_name[name].depends_on:
+            visit(dep, trail + [name])
+        state[name] = 2
+        order.append(name)
+
+    for step in steps:
+        visit(step.name, [])
+
+    return order
+
+
+def critical_path(steps: List[Step], durations: Dict[str, float]) -> List[str]:
+    """Return the chain of dependent steps with the largest total duration."""
+    by_name = {step.name: step for step in steps}
+    best: Dict[str, float] = {}
+    previous: Dict[str, Optional[str]] = {}
+
+    for name in validate_steps(steps):
+        deps = [dep for dep in by_name[name].depends_on if dep in best]
+        parent = max(deps, key=lambda dep: best[dep]) if deps else None
+        best[name] = durations.get(name, 0.0) + (best[parent] if parent else 0.0)
+        previous[name] = parent
+
+    if not best:
+        return []
+
+    path = []
+    node: Optional[str] = max(best, key=lambda name: best[name])
+    while node is not None:
+        path.append(node)
+        node = previous[node]
+    return list(reversed(path))
+
+
+def run_step_graph(steps: List[Step], max_workers: int = 4) -> StepReport:
+    """Run ``steps`` respecting dependencies, with independent steps in parallel.
+
+    A failed step does not stop unrelated branches; steps that depend on it
+    (directly or transitively) are skipped and listed in the report.
+
+    Args:
+        steps: Steps to run
+        max_workers: Maximum number of steps running at the same time
+
+    Returns:
+        StepReport with per-step durations, failures and the critical path
+    """
+    validate_steps(steps)
+    by_name = {step.name: step for step in steps}
+    pending = {step.name: set(step.depends_on) for step in steps}
+    report = StepReport()
+    done = set()
+    start = time.perf_counter()
+
+    def timed(step: Step):
+        step_start = time.perf_counter()
+        try:
+            return step.run()
+        finally:
+            report.durations[step.name] = time.perf_counter() - step_start
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        running = {}
+
+        while pending or running:
+            # Skip steps whose dependencies failed or were skipped
+            blocked = set(report.failed) | set(report.skipped)
+            for name in [n for n, deps in pending.items() if deps & blocked]:
+                report.skipped.append(name)
+                del pending[name]
+
+            for name in [n for n, deps in pending.items() if deps <= done]:
+                del pending[name]
+                running[executor.submit(timed, by_name[name])] = name
+
+            if not running:
+                break
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                try:
+                    report.results[name] = future.result()
+                    done.add(name)
+                except Exception as e:
+                    report.failed[name] = str(e)
+                    print(f"Step {name} failed: {e}")
+
+    report.wall_seconds = time.perf_counter() - start
+    report.critical_path = critical_path(steps, report.durations)
+    return report
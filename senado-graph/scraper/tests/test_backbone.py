@@ -0,0 +1,71 @@
+"""Disparity and top-k selection of the similarity backbone."""
+
+import numpy as np
+
+from backbone import backbone_edges, disparity_pvalues, neighbor_ranks, sparsify
+from similarity import SimilarityResult
+
+
+def _result(weights) -> SimilarityResult:
+    weights = np.asarray(weights, dtype=np.float64)
+    size = len(weights)
+    upper = np.triu(weights, k=1)
+    return SimilarityResult(
+        senator_ids=[f"s{i}" for i in range(size)],
+        common_votes=np.full((size, size), 10),
+        agreements=np.zeros((size, size)),
+        agreement=upper,
+        jaccard=upper,
+        kappa=upper,
+        mask=upper > 0,
+    )
+
+
+# s0 is strongly tied to s1 and weakly to everyone else; s3 only knows s0
+WEIGHTS = [
+    [0.0, 0.9, 0.1, 0.1],
+    [0.9, 0.0, 0.5, 0.0],
+    [0.1, 0.5, 0.0, 0.0],
+    [0.1, 0.0, 0.0, 0.0],
+]
+
+
+def test_disparity_pvalues():
+    pvalues = disparity_pvalues(np.array(WEIGHTS))
+
+    assert np.array_equal(pvalues, pvalues.T)
+    # The only edge of a degree-1 node is always significant
+    assert pvalues[0, 3] == 0.0
+    # Missing edges and the diagonal are never significant
+    assert pvalues[1, 3] == 1.0 and pvalues[0, 0] == 1.0
+    assert pvalues[0, 1] < pvalues[0, 2]
+
+
+def test_neighbor_ranks_symmetric_and_mutual():
+    weights = np.array(WEIGHTS)
+
+    ranks = neighbor_ranks(weights)
+    mutual = neighbor_ranks(weights, mutual=True)
+
+    # s2 is s0's 2nd neighbour (tie with s3 kept in node order), s0 is s2's 2nd
+    assert ranks[0, 2] == ranks[2, 0] == 2
+    # s3 is s0's 3rd neighbour but s0 is s3's 1st
+    assert (ranks[0, 3], mutual[0, 3]) == (1, 3)
+    assert ranks[1, 3] == mutual[1, 3] == 0
+
+
+def test_top_k_keeps_each_senators_strongest_edge():
+    backbone = sparsify(_result(WEIGHTS), method="top_k", k=1)
+
+    kept = {(e["senator1_id"], e["senator2_id"]) for e in backbone_edges(backbone)}
+    assert kept == {("s0", "s1"), ("s1", "s2"), ("s0", "s3")}
+    assert not np.any(np.tril(backbone.mask))
+
+
+def test_senators_outside_the_graph_are_left_out():
+    senators = [{"id": "s0"}, {"id": "s1"}, {"id": "s2"}]
+
+    backbone = sparsify(_result(WEIGHTS), senators, method="top_k", k=3)
+
+    assert not backbone.mask[:, 3].any()
+    assert backbone.mask[0, 1] and backbone.mask[0, 2] and backbone.mask[1, 2]
@@ -0,0 +1,59 @@
+"""Centrality graph construction, PageRank and betweenness."""
+
+import numpy as np
+import pytest
+
+from bulk_export import ImportTables
+from centrality import CENTRALITY_WEIGHTS, build_centrality_graph, compute_centrality
+
+
+def _tables() -> ImportTables:
+    # s1 and s2 co-author l1; s3 is only linked to l1 through a vote
+    tables = ImportTables()
+    for senator in ("s1", "s2", "s3"):
+        tables.add_node("Senator", senator, {"name": senator})
+    tables.add_node("Law", "l1", {"title": "Ley"})
+    tables.add_relationship("AUTHORED", ("s1", "l1"), {})
+    tables.add_relationship("AUTHORED", ("s2", "l1"), {})
+    tables.add_relationship("VOTED_ON", ("s1", "l1", "votacion_1"), {})
+    tables.add_relationship("VOTED_ON", ("s3", "l1", "votacion_1"), {})
+    # Endpoints outside the graph are ignored
+    tables.add_relationship("AUTHORED", ("s9", "l1"), {})
+    return tables
+
+
+def test_parallel_relationships_are_merged():
+    graph = build_centrality_graph(_tables())
+
+    weights = {
+        (graph.ids[i], graph.ids[j]): w
+        for i, j, w in zip(graph.src, graph.dst, graph.weights)
+    }
+    assert len(graph) == 4 and len(weights) == 6
+    assert weights["s1", "l1"] == weights["l1", "s1"] == pytest.approx(
+        CENTRALITY_WEIGHTS["AUTHORED"] + CENTRALITY_WEIGHTS["VOTED_ON"]
+    )
+    assert weights["s3", "l1"] == CENTRALITY_WEIGHTS["VOTED_ON"]
+
+
+def test_hub_scores_highest():
+    graph = build_centrality_graph(_tables())
+
+    scores = compute_centrality(graph)
+
+    hub = graph.ids.index("l1")
+    assert scores["degree"].tolist()[hub] == 3
+    assert scores["pagerank"].sum() == pytest.approx(1.0)
+    assert scores["pagerank"].argmax() == hub
+    # Every path between two senators goes through the law
+    assert scores["betweenness"][hub] == pytest.approx(1.0)
+    assert np.delete(scores["betweenness"], hub) == pytest.approx(np.zeros(3))
+
+
+def test_sampled_betweenness_of_every_source_is_exact():
+    graph = build_centrality_graph(_tables())
+
+    exact = compute_centrality(graph)["betweenness"]
+    sampled = compute_centrality(graph, samples=len(graph))["betweenness"]
+
+    assert sampled == pytest.approx(exact)
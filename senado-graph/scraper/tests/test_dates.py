@@ -0,0 +1,66 @@
+"""ISO date normalization and the votación ids that hash dates."""
+
+import hashlib
+
+import pytest
+
+from dates import is_within_days, normalize_date, normalize_records, to_iso
+from vote_matrix import votacion_id
+
+
+@pytest.mark.parametrize(
+    "raw, iso",
+    [
+        ("05/03/2024", "2024-03-05"),
+        ("5-3-2024", "2024-03-05"),
+        ("05.03.2024", "2024-03-05"),
+        ("2024-03-05", "2024-03-05"),
+        ("2024/3/5", "2024-03-05"),
+        ("Sesión 12ª, 05/03/2024 a las 16:00", "2024-03-05"),
+    ],
+)
+def test_reads_every_source_format(raw, iso):
+    assert to_iso(raw) == iso
+
+
+def test_day_first_falls_back_to_month_first():
+    # 12/31 can only be December 31st; 03/05 stays day-first
+    assert to_iso("12/31/2024") == "2024-12-31"
+    assert to_iso("03/05/2024") == "2024-05-03"
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [None, "", "sin fecha", "31/31/2024", "30/02/2024", "2024-13-01", "123/4/2024"],
+)
+def test_invalid_dates_have_no_iso_form(raw):
+    assert to_iso(raw) is None
+
+
+def test_normalize_keeps_values_without_a_date():
+    assert normalize_date(" pendiente ") == "pendiente"
+
+    records = [{"date": "05/03/2024"}, {"date": "2024-03-06"}, {"date": "?"}]
+    assert normalize_records(records, ("date",)) == 1
+    assert [r["date"] for r in records] == ["2024-03-05", "2024-03-06", "?"]
+
+
+def test_undated_rows_count_as_recent():
+    assert is_within_days("sin fecha", days=30)
+    assert not is_within_days("01/01/2000", days=30)
+
+
+def test_votacion_id_is_stable_across_date_formats():
+    vote = {
+        "law_boletin": "17001-07",
+        "session": "12",
+        "date": "05/03/2024",
+        "topic": "En general",
+    }
+    # Ids persisted before dates were normalized hashed the raw DD/MM/YYYY
+    legacy = hashlib.sha1(b"17001-07|12|05/03/2024|En general").hexdigest()[:16]
+
+    assert votacion_id(vote) == "votacion_" + legacy
+    assert votacion_id({**vote, "date": "2024-03-05"}) == "votacion_" + legacy
+    assert votacion_id({**vote, "date": "5/3/2024"}) == "votacion_" + legacy
+    assert votacion_id({**vote, "date": "2024-03-06"}) != "votacion_" + legacy
@@ -0,0 +1,34 @@
+"""Incremental layout: known nodes stay put, new ones are placed."""
+
+import numpy as np
+
+from bulk_export import ImportTables
+from layout import build_layout_graph, compute_layout
+
+
+def _tables(senators: int) -> ImportTables:
+    tables = ImportTables()
+    tables.add_node("Party", "p1", {"name": "P"})
+    for i in range(senators):
+        tables.add_node("Senator", f"s{i}", {"name": f"S{i}"})
+        tables.add_relationship("BELONGS_TO", (f"s{i}", "p1"), {})
+    return tables
+
+
+def test_unchanged_graph_keeps_every_position():
+    graph = build_layout_graph(_tables(12))
+    first = compute_layout(graph)
+
+    assert compute_layout(graph, previous=first) == first
+
+
+def test_new_nodes_are_placed_without_moving_known_ones():
+    first = compute_layout(build_layout_graph(_tables(12)))
+    graph = build_layout_graph(_tables(15))
+
+    second = compute_layout(graph, previous=first)
+
+    assert {k: second[k] for k in first} == first
+    new = [second[f"s{i}"] for i in range(12, 15)]
+    assert all(np.isfinite(xy).all() for xy in new)
+    assert len({tuple(xy) for xy in new}) == 3
@@ -0,0 +1,52 @@
+"""Senator–senator projections of authorships."""
+
+import pytest
+
+from bulk_export import ImportTables
+from projection import incidence, project, projection_edges
+
+
+def _tables() -> ImportTables:
+    # s1, s2 and s3 co-author l1; s1 and s2 also co-author l2
+    tables = ImportTables()
+    for senator in ("s1", "s2", "s3", "s4"):
+        tables.add_node("Senator", senator, {"name": senator})
+    for senator, law in [("s1", "l1"), ("s2", "l1"), ("s3", "l1"), ("s1", "l2")]:
+        tables.add_relationship("AUTHORED", (senator, law), {})
+    tables.add_relationship("AUTHORED", ("s2", "l2"), {})
+    # A senator alone on a bill shares it with nobody
+    tables.add_relationship("AUTHORED", ("s4", "l3"), {})
+    return tables
+
+
+def _edges(**kwargs) -> dict:
+    projection = project(*incidence(_tables(), ("AUTHORED",)), **kwargs)
+    return {
+        (e["senator1_id"], e["senator2_id"]): e
+        for e in projection_edges(projection)
+    }
+
+
+def test_shared_items_and_normalizations():
+    edges = _edges()
+
+    assert set(edges) == {("s1", "s2"), ("s1", "s3"), ("s2", "s3")}
+    assert edges["s1", "s2"]["shared"] == 2
+    assert edges["s1", "s2"]["jaccard"] == 1.0
+    # Newman: 1 / (3 - 1) for l1 plus 1 / (2 - 1) for l2
+    assert edges["s1", "s2"]["newman"] == pytest.approx(1.5)
+    assert edges["s1", "s3"]["shared"] == 1
+    assert edges["s1", "s3"]["jaccard"] == 0.5
+    assert edges["s1", "s3"]["newman"] == pytest.approx(0.5)
+
+
+def test_chunking_does_not_change_the_projection():
+    assert _edges(pair_budget=1) == _edges()
+
+
+def test_repeated_incidences_count_once():
+    senator_ids, rows, cols = incidence(_tables(), ("AUTHORED",))
+
+    doubled = project(senator_ids, rows.repeat(2), cols.repeat(2))
+
+    assert doubled.shared.tolist() == project(senator_ids, rows, cols).shared.tolist()
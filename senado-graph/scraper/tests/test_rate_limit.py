@@ -0,0 +1,38 @@
+"""Token bucket shared through its state file."""
+
+import pytest
+
+from rate_limit import TokenBucket
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "host.bucket")
+
+
+def test_burst_then_waits_at_the_refill_rate(path):
+    bucket = TokenBucket(path, rate=2.0, burst=2)
+
+    waits = [bucket.reserve(now=100.0) for _ in range(4)]
+
+    assert waits == [0.0, 0.0, 0.5, 1.0]
+
+
+def test_refill_is_capped_at_the_burst(path):
+    bucket = TokenBucket(path, rate=2.0, burst=2)
+    for _ in range(3):
+        bucket.reserve(now=100.0)
+
+    waits = [bucket.reserve(now=200.0) for _ in range(3)]
+
+    assert waits == [0.0, 0.0, 0.5]
+
+
+def test_buckets_on_the_same_file_share_tokens(path):
+    # Separate instances stand in for separate processes
+    first = TokenBucket(path, rate=1.0, burst=1)
+    second = TokenBucket(path, rate=1.0, burst=1)
+
+    assert first.reserve(now=100.0) == 0.0
+    assert second.reserve(now=100.0) == 1.0
+    assert first.reserve(now=100.5) == 1.5
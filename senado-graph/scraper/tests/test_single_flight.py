@@ -0,0 +1,64 @@
+"""Call coalescing and result caching of SingleFlight."""
+
+import threading
+import time
+
+import pytest
+
+from single_flight import SingleFlight
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight(ttl=60)
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return {"votes": 3}
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(flight.do("url", fetch)))
+        for _ in range(4)
+    ]
+    threads[0].start()
+    started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    # Let the followers queue up behind the leader before it returns
+    deadline = time.monotonic() + 5
+    while flight.stats["coalesced"] < 3 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [{"votes": 3}] * 4
+    assert flight.stats == {"calls": 1, "cached": 0, "coalesced": 3}
+
+
+def test_results_are_cached_until_evicted():
+    flight = SingleFlight(ttl=60, size=1)
+
+    assert flight.do("a", lambda: 1) == 1
+    assert flight.do("a", lambda: 2) == 1
+    flight.do("b", lambda: 3)
+    assert flight.do("a", lambda: 4) == 4
+    assert flight.stats["cached"] == 1
+
+
+def test_failures_are_not_cached():
+    flight = SingleFlight(ttl=60)
+
+    def fail():
+        raise ConnectionError("503")
+
+    with pytest.raises(ConnectionError):
+        flight.do("url", fail)
+    assert flight.do("url", lambda: None) is None
+    assert flight.do("url", lambda: "ok") == "ok"
+    assert flight.stats["calls"] == 3
@@ -0,0 +1,158 @@
+"""Lease, expiry and retry behaviour of the work queue (SQLite backend)."""
+
+import threading
+import time
+
+import pytest
+
+import work_queue
+from work_queue import MAX_ATTEMPTS, SQLiteQueueBackend, Worker, WorkUnit
+
+
+class Clock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(work_queue.time, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def backend(tmp_path):
+    backend = SQLiteQueueBackend(str(tmp_path / "queue.db"))
+    yield backend
+    backend.close()
+
+
+def test_claims_in_priority_order_until_empty(backend, clock):
+    backend.enqueue(
+        [
+            WorkUnit("day", "2025-07-02", priority=2),
+            WorkUnit("boletin", "17001-07", priority=1),
+        ]
+    )
+
+    first = backend.claim("a", lease=60)
+    second = backend.claim("b", lease=60)
+
+    assert (first.id, first.owner, first.attempts) == ("boletin:17001-07", "a", 1)
+    assert (second.id, second.owner) == ("day:2025-07-02", "b")
+    assert backend.claim("c", lease=60) is None
+
+
+def test_enqueue_skips_queued_units_unless_requeued(backend, clock):
+    unit = WorkUnit("day", "2025-07-02")
+    assert backend.enqueue([unit]) == 1
+    assert backend.enqueue([unit]) == 0
+
+    claimed = backend.claim("a", lease=60)
+    backend.complete(claimed, "a", {"laws": []})
+    assert backend.enqueue([unit]) == 0
+    assert backend.enqueue([unit], requeue=True) == 1
+    assert backend.counts() == {"pending": 1}
+
+
+def test_expired_lease_moves_to_another_worker(backend, clock):
+    backend.enqueue([WorkUnit("day", "2025-07-02")])
+    stale = backend.claim("a", lease=60)
+
+    clock.now += 30
+    assert backend.heartbeat(stale, "a", lease=60)
+    clock.now += 61
+    taken = backend.claim("b", lease=60)
+
+    assert (taken.id, taken.owner, taken.attempts) == (stale.id, "b", 2)
+    # The first worker lost the unit: its heartbeat and result are refused
+    assert not backend.heartbeat(stale, "a", lease=60)
+    assert not backend.complete(stale, "a", {"laws": []})
+    assert backend.complete(taken, "b", {"laws": [{"id": "law"}]})
+    assert [u.result for u in backend.finished()] == [{"laws": [{"id": "law"}]}]
+
+
+def test_heartbeat_keeps_the_lease(backend, clock):
+    backend.enqueue([WorkUnit("day", "2025-07-02")])
+    unit = backend.claim("a", lease=60)
+
+    for _ in range(5):
+        clock.now += 40
+        assert backend.heartbeat(unit, "a", lease=60)
+
+    assert backend.claim("b", lease=60) is None
+
+
+def test_lease_expiring_every_attempt_leaves_unit_failed(backend, clock):
+    backend.enqueue([WorkUnit("day", "2025-07-02")])
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        unit = backend.claim(f"w{attempt}", lease=60)
+        assert unit.attempts == attempt
+        clock.now += 61
+
+    assert backend.claim("late", lease=60) is None
+    [failed] = backend.failures()
+    assert (failed.error, failed.attempts) == ("lease expired", MAX_ATTEMPTS)
+
+
+def test_failed_unit_waits_for_its_retry_delay(backend, clock):
+    backend.enqueue([WorkUnit("day", "2025-07-02")])
+    unit = backend.claim("a", lease=60)
+    assert backend.fail(unit, "a", "HTTPError: 503")
+
+    assert backend.claim("b", lease=60) is None
+    clock.now = work_queue.retry_at(unit.attempts, clock.now)
+    retried = backend.claim("b", lease=60)
+    assert (retried.attempts, retried.error) == (2, "HTTPError: 503")
+
+
+def test_failing_every_attempt_leaves_unit_failed(backend, clock):
+    backend.enqueue([WorkUnit("day", "2025-07-02")])
+    for _ in range(MAX_ATTEMPTS):
+        unit = backend.claim("a", lease=60)
+        backend.fail(unit, "a", "HTTPError: 503")
+        clock.now += 3600 * 24
+
+    assert backend.claim("a", lease=60) is None
+    assert backend.counts() == {"failed": 1}
+
+
+def test_workers_started_together_share_the_queue(tmp_path, monkeypatch):
+    path = str(tmp_path / "queue.db")
+    days = [f"2025-07-{day:02d}" for day in range(1, 31)]
+    SQLiteQueueBackend(path).enqueue([WorkUnit("day", day) for day in days])
+
+    fetched = []
+    start = threading.Barrier(4)
+
+    def fetch_unit(scraper, kind, target):
+        time.sleep(0.01)
+        fetched.append(target)
+        return {"laws": [{"id": target}]}
+
+    monkeypatch.setattr(work_queue, "fetch_unit", fetch_unit)
+
+    def run(worker: Worker):
+        start.wait()
+        worker.run()
+
+    workers = [
+        Worker(SQLiteQueueBackend(path), worker_id=f"w{i}", scraper=object())
+        for i in range(4)
+    ]
+    threads = [threading.Thread(target=run, args=(w,)) for w in workers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(fetched) == days
+    assert sum(w.stats["done"] for w in workers) == len(days)
+    assert all(w.stats["done"] for w in workers)
+    assert workers[0].backend.counts() == {"done": len(days)}
+    for worker in workers:
+        worker.backend.close()
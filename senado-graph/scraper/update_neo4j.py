@@ -1,132 +1,390 @@
 """Update Neo4j database with incremental changes."""
 
-import json
 import os
+import uuid
 from datetime import datetime
+from typing import Dict
 from neo4j import GraphDatabase
-from config import NEO4J_URI, NEO4J_USERNAME, NEO4J_PASSWORD
+from config import DATA_DIR, NEO4J_URI, NEO4J_USERNAME, NEO4J_PASSWORD, NEO4J_BATCH_SIZE
+from bulk_export import REL_SPECS, build_import_tables
+from delta_sync import (
+    REL_MERGE_KEYS,
+    SNAPSHOT_PATH,
+    Delta,
+    compute_delta,
+    load_snapshot,
+    save_snapshot,
+)
+from backbone import sparsify, write_backbone
+from centrality import build_centrality_graph, compute_centrality, write_centrality
+from communities import detect_communities, write_communities
+from graph_snapshot import export_snapshot
+from ideal_points import compute_ideal_points, write_ideal_points
+from layout import (
+    LAYOUT_PATH,
+    build_layout_graph,
+    compute_layout,
+    load_layout,
+    save_layout,
+    write_layout,
+)
+from neo4j_batch import BatchWriter
+from projection import (
+    PROJECTIONS,
+    incidence,
+    project,
+    projection_edges,
+    write_projection,
+)
+from scraped_data import load_scraped_data
+from seed_neo4j import VOTED_SAME_QUERY
+from similarity import MIN_COMMON_VOTES, similarity_edges
+from similarity_state import STATE_PATH, SimilarityState
+from vote_matrix import build_vote_matrix
+from voting_metrics import METRICS_PATH, compute_metrics, save_metrics, write_metrics
 
 
 class Neo4jUpdater:
     """Updates Neo4j with incremental changes from scraping."""
 
-    def __init__(self):
+    def __init__(self, batch_size: int = NEO4J_BATCH_SIZE):
         self.driver = GraphDatabase.driver(
             NEO4J_URI, auth=(NEO4J_USERNAME, NEO4J_PASSWORD)
         )
+        self.writer = BatchWriter(self.driver, batch_size=batch_size)
 
     def close(self):
         self.driver.close()
 
-    def update_senators(self, senators: list):
-        """Update or insert senators."""
-        print(f"Updating {len(senators)} senators...")
-
+    def log_update(self, update_type: str, count: int):
+        """Log update activity."""
         query = """
-        UNWIND $senators AS senator
-        MERGE (s:Senator {id: senator.id})
-        SET s.name = senator.name,
-            s.nameEn = senator.nameEn,
-            s.party = senator.party,
-            s.region = senator.region,
-            s.regionEn = senator.regionEn,
-            s.email = senator.email,
-            s.photoUrl = senator.photoUrl,
-            s.biography = senator.biography,
-            s.biographyEn = senator.biographyEn,
-            s.startDate = senator.startDate,
-            s.active = senator.active,
-            s.lastUpdated = datetime()
-        WITH s, senator
-        MATCH (p:Party {shortName: senator.party})
-        MERGE (s)-[:BELONGS_TO]->(p)
+        CREATE (u:Update {
+            id: randomUUID(),
+            type: $type,
+            count: $count,
+            timestamp: datetime()
+        })
         """
 
         with self.driver.session() as session:
-            session.run(query, senators=senators)
+            session.run(query, type=update_type, count=count)
 
-        print("Senators updated")
+    def _upsert_nodes(self, label: str, rows: list) -> int:
+        query = f"""
+        UNWIND $rows AS row
+        MERGE (n:{label} {{id: row.id}})
+        SET n += row.props,
+            n.lastUpdated = datetime()
+        """
+        return self.writer.write(query, rows).rows
 
-    def update_laws(self, laws: list):
-        """Update or insert laws."""
-        print(f"Updating {len(laws)} laws...")
+    def _delete_nodes(self, label: str, rows: list) -> int:
+        if label == "Senator":
+            # Senators that disappear from the listing are kept, not deleted
+            query = """
+            UNWIND $rows AS row
+            MATCH (n:Senator {id: row.id})
+            SET n.active = false, n.endDate = date(), n.lastUpdated = datetime()
+            """
+        else:
+            query = f"""
+            UNWIND $rows AS row
+            MATCH (n:{label} {{id: row.id}})
+            DETACH DELETE n
+            """
+        return self.writer.write(query, rows).rows
 
-        query = """
-        UNWIND $laws AS law
-        MERGE (l:Law {id: law.id})
-        SET l.boletin = law.boletin,
-            l.title = law.title,
-            l.titleEn = law.titleEn,
-            l.description = law.description,
-            l.descriptionEn = law.descriptionEn,
-            l.dateProposed = law.dateProposed,
-            l.status = law.status,
-            l.topic = law.topic,
-            l.lastUpdated = datetime()
+    def _upsert_relationships(self, rel_type: str, rows: list) -> int:
+        start, end, _ = REL_SPECS[rel_type]
+        pattern = ", ".join(
+            f"{key}: row.key.{key}" for key in REL_MERGE_KEYS.get(rel_type, [])
+        )
+        query = f"""
+        UNWIND $rows AS row
+        MATCH (s:{start} {{id: row.start}})
+        MATCH (e:{end} {{id: row.end}})
+        MERGE (s)-[r:{rel_type} {{{pattern}}}]->(e)
+        SET r += row.props
         """
+        return self.writer.write(query, rows).rows
 
-        with self.driver.session() as session:
-            session.run(query, laws=laws)
+    def _delete_relationships(self, rel_type: str, rows: list) -> int:
+        start, end, _ = REL_SPECS[rel_type]
+        query = f"""
+        UNWIND $rows AS row
+        MATCH (s:{start} {{id: row.start}})-[r:{rel_type}]->(e:{end} {{id: row.end}})
+        WHERE all(k IN keys(row.key) WHERE r[k] = row.key[k])
+        DELETE r
+        """
+        return self.writer.write(query, rows).rows
 
-        print("Laws updated")
+    def apply_delta(self, delta: Delta) -> Dict[str, int]:
+        """Write only the inserts, updates and deletes in ``delta``.
 
-    def mark_inactive_senators(self, active_ids: list):
-        """Mark senators as inactive if not in active list."""
-        query = """
-        MATCH (s:Senator)
-        WHERE NOT s.id IN $active_ids
-        SET s.active = false, s.endDate = date()
-        RETURN count(s) AS count
+        Nodes are upserted first so relationship endpoints exist, stale
+        relationships are removed before new ones are merged, and node
+        deletes run last.
+
+        Returns:
+            Number of changed records per label/relationship type
         """
+        counts = {}
 
-        with self.driver.session() as session:
-            result = session.run(query, active_ids=active_ids)
-            count = result.single()["count"]
-            print(f"Marked {count} senators as inactive")
+        for label, change in delta.nodes.items():
+            rows = change.inserts + change.updates
+            if rows:
+                print(f"Upserting {len(rows)} {label} nodes...")
+                counts[label] = self._upsert_nodes(label, rows)
 
-    def log_update(self, update_type: str, count: int):
-        """Log update activity."""
-        query = """
-        CREATE (u:Update {
-            id: randomUUID(),
-            type: $type,
-            count: $count,
-            timestamp: datetime()
-        })
+        for rel_type, change in delta.relationships.items():
+            if change.deletes:
+                print(f"Deleting {len(change.deletes)} {rel_type} relationships...")
+                self._delete_relationships(rel_type, change.deletes)
+            rows = change.inserts + change.updates
+            if rows:
+                print(f"Upserting {len(rows)} {rel_type} relationships...")
+                self._upsert_relationships(rel_type, rows)
+            if change:
+                counts[rel_type] = len(change)
+
+        for label, change in delta.nodes.items():
+            if change.deletes:
+                print(f"Removing {len(change.deletes)} {label} nodes...")
+                self._delete_nodes(label, change.deletes)
+                counts[label] = counts.get(label, 0) + len(change.deletes)
+
+        return counts
+
+    def update_voting_similarity(
+        self,
+        votes: list,
+        senators: list,
+        min_common_votes: int = MIN_COMMON_VOTES,
+        epsilon: float = 0.01,
+        state_path: str = STATE_PATH,
+    ) -> int:
+        """Fold new votaciones into the saved counters and rewrite changed edges.
+
+        Only VOTED_SAME edges that are new, whose agreement moved by more
+        than ``epsilon`` since they were last written, or that fell below
+        ``min_common_votes`` are touched.
+
+        Returns:
+            Number of VOTED_SAME edges written or removed
         """
+        state = SimilarityState.load(state_path)
+        folded = state.fold(build_vote_matrix(votes, senators))
+        if not folded:
+            print("No new votaciones, voting similarity unchanged")
+            return 0
 
-        with self.driver.session() as session:
-            session.run(query, type=update_type, count=count)
+        result = state.result(min_common_votes=min_common_votes)
+        upsert, removed = state.changes(result, epsilon=epsilon)
+        edges = similarity_edges(result, mask=upsert)
+        print(
+            f"Folded {folded} new votaciones: {len(edges)} VOTED_SAME edges "
+            f"changed, {len(removed)} removed"
+        )
 
+        run_id = str(uuid.uuid4())
+        for edge in edges:
+            edge["runId"] = run_id
+        if edges:
+            self.writer.write(VOTED_SAME_QUERY, edges, param="edges")
 
-def main():
-    """Main update function."""
+        if removed:
+            query = """
+            UNWIND $pairs AS pair
+            MATCH (:Senator {id: pair[0]})-[r:VOTED_SAME]->(:Senator {id: pair[1]})
+            DELETE r
+            """
+            self.writer.write(query, [list(pair) for pair in removed], param="pairs")
+
+        # Only advance the counters once the edges are committed
+        state.mark_published(result, upsert)
+        state.save(state_path)
+
+        return len(edges) + len(removed)
+
+    def update_communities(
+        self,
+        senators: list,
+        min_common_votes: int = MIN_COMMON_VOTES,
+        state_path: str = STATE_PATH,
+    ):
+        """Re-detect voting clusters from the saved pairwise counters."""
+        result = SimilarityState.load(state_path).result(
+            min_common_votes=min_common_votes
+        )
+        communities = detect_communities(result, senators)
+        print(
+            f"Detected {len(communities.clusters)} voting clusters "
+            f"(modularity {communities.modularity})"
+        )
+        write_communities(self.driver, self.writer, communities)
+
+    def update_backbone(
+        self,
+        senators: list,
+        min_common_votes: int = MIN_COMMON_VOTES,
+        state_path: str = STATE_PATH,
+    ):
+        """Re-flag the similarity backbone from the saved pairwise counters."""
+        result = SimilarityState.load(state_path).result(
+            min_common_votes=min_common_votes
+        )
+        backbone = sparsify(result, senators)
+        print(f"Kept {int(backbone.mask.sum())} VOTED_SAME edges in the backbone")
+        write_backbone(self.driver, self.writer, backbone)
+
+    def update_projections(self, tables, delta: Delta) -> int:
+        """Rewrite the senator projections whose source relationships changed.
+
+        Returns:
+            Number of projected relationship types rewritten
+        """
+        rewritten = 0
+        for rel_type, (sources, model) in PROJECTIONS.items():
+            if not any(delta.relationships.get(source) for source in sources):
+                continue
+            edges = projection_edges(project(*incidence(tables, sources)), model)
+            print(f"Projecting {len(edges)} {rel_type} relationships...")
+            write_projection(self.driver, self.writer, rel_type, edges)
+            rewritten += 1
+        return rewritten
+
+    def update_voting_metrics(
+        self, votes: list, senators: list, metrics_path: str = METRICS_PATH
+    ):
+        """Recompute attendance, rebellion and party cohesion metrics."""
+        metrics = compute_metrics(build_vote_matrix(votes, senators), senators)
+        print(f"Updating voting metrics for {len(metrics.senators)} senators...")
+        write_metrics(self.writer, metrics)
+        save_metrics(metrics, metrics_path)
+
+    def update_ideal_points(self, votes: list, senators: list):
+        """Re-estimate ideal points from every roll call."""
+        rows = compute_ideal_points(build_vote_matrix(votes, senators), senators)
+        print(f"Updating ideal points for {len(rows)} senators...")
+        write_ideal_points(self.writer, rows)
+
+    def update_centrality(self, tables, senators: list, state_path: str = STATE_PATH):
+        """Recompute node centrality on the whole graph."""
+        similarity = SimilarityState.load(state_path).result()
+        backbone = sparsify(similarity, senators).mask
+        graph = build_centrality_graph(tables, similarity, backbone)
+        print(f"Scoring {len(graph)} nodes by centrality")
+        write_centrality(self.driver, self.writer, graph, compute_centrality(graph))
+
+    def update_layout(
+        self,
+        tables,
+        state_path: str = STATE_PATH,
+        layout_path: str = LAYOUT_PATH,
+    ):
+        """Place new nodes around the ones already in the last layout."""
+        similarity = SimilarityState.load(state_path).result()
+        graph = build_layout_graph(tables, similarity)
+        positions = compute_layout(graph, previous=load_layout(layout_path))
+        print(f"Laid out {len(graph.ids)} nodes")
+        write_layout(self.writer, graph, positions)
+        save_layout(positions, layout_path)
+
+
+def sync(
+    data_dir: str = DATA_DIR,
+    snapshot_path: str = SNAPSHOT_PATH,
+    full: bool = False,
+    dry_run: bool = False,
+    state_path: str = STATE_PATH,
+    epsilon: float = 0.01,
+    batch_size: int = NEO4J_BATCH_SIZE,
+    export: bool = True,
+    metrics_path: str = METRICS_PATH,
+    layout_path: str = LAYOUT_PATH,
+):
+    """Push the changes in ``data_dir`` since the last sync to Neo4j.
+
+    Args:
+        data_dir: Directory with scraped JSON files
+        snapshot_path: Fingerprints of the last applied sync
+        full: Ignore the snapshot and upsert every record
+        dry_run: Only print the computed changes
+        state_path: Saved pairwise agreement counters
+        epsilon: Minimum agreement change that rewrites a VOTED_SAME edge
+        batch_size: Rows per write transaction
+        export: Also export the graph snapshot when something changed
+        metrics_path: Where the voting metrics are saved
+        layout_path: Saved node positions, updated in place
+    """
     print("Starting Neo4j updater...")
 
-    updater = Neo4jUpdater()
+    data = load_scraped_data(data_dir)
+    tables = build_import_tables(data)
+    snapshot = {} if full else load_snapshot(snapshot_path)
+    delta = compute_delta(tables, snapshot)
+
+    print("Changes since last sync:")
+    print(delta.summary())
+
+    if dry_run:
+        return
+
+    updater = Neo4jUpdater(batch_size=batch_size)
 
     try:
-        data_dir = os.path.join(os.path.dirname(__file__), "data")
-
-        # Load and update senators
-        try:
-            with open(f"{data_dir}/senators.json", "r", encoding="utf-8") as f:
-                senators = json.load(f)
-            updater.update_senators(senators)
-            active_ids = [s["id"] for s in senators]
-            updater.mark_inactive_senators(active_ids)
-            updater.log_update("senators", len(senators))
-        except FileNotFoundError:
-            print("No senator data found to update")
-
-        # Load and update laws
-        try:
-            with open(f"{data_dir}/laws.json", "r", encoding="utf-8") as f:
-                laws = json.load(f)
-            updater.update_laws(laws)
-            updater.log_update("laws", len(laws))
-        except FileNotFoundError:
-            print("No law data found to update")
+        if delta.is_empty():
+            print("No node or relationship changes to write")
+        else:
+            counts = updater.apply_delta(delta)
+
+            # Only advance the snapshot once every batch has been committed
+            save_snapshot(delta.snapshot, snapshot_path)
+
+            for update_type, count in counts.items():
+                updater.log_update(update_type, count)
+
+            updater.update_projections(tables, delta)
+
+        changed = 0
+        if data["votes"]:
+            changed = updater.update_voting_similarity(
+                data["votes"],
+                data["senators"],
+                epsilon=epsilon,
+                state_path=state_path,
+            )
+            if (
+                delta.relationships.get("VOTED_ON")
+                or delta.nodes.get("Senator")
+                or not os.path.exists(metrics_path)
+            ):
+                updater.update_voting_metrics(
+                    data["votes"], data["senators"], metrics_path=metrics_path
+                )
+                updater.update_ideal_points(data["votes"], data["senators"])
+            if changed:
+                updater.log_update("VOTED_SAME", changed)
+                updater.update_communities(
+                    data["senators"], state_path=state_path
+                )
+                updater.update_backbone(
+                    data["senators"], state_path=state_path
+                )
+
+        if changed or not delta.is_empty():
+            updater.update_centrality(
+                tables, data["senators"], state_path=state_path
+            )
+            updater.update_layout(
+                tables, state_path=state_path, layout_path=layout_path
+            )
+            if export:
+                manifest = export_snapshot(
+                    data, state_path=state_path, layout_path=layout_path
+                )
+                print(f"Exported graph snapshot {manifest['version']}")
 
         print("Update complete!")
 
@@ -137,5 +395,56 @@ def main():
         updater.close()
 
 
+def main():
+    """Main update function."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Push only changed nodes and relationships to Neo4j"
+    )
+    parser.add_argument(
+        "--snapshot",
+        default=SNAPSHOT_PATH,
+        help="Fingerprints of the last applied sync",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Ignore the snapshot and upsert every record",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only print the computed changes",
+    )
+    parser.add_argument(
+        "--similarity-state",
+        default=STATE_PATH,
+        help="Saved pairwise agreement counters",
+    )
+    parser.add_argument(
+        "--epsilon",
+        type=float,
+        default=0.01,
+        help="Minimum agreement change that rewrites a VOTED_SAME edge",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=NEO4J_BATCH_SIZE,
+        help=f"Rows per write transaction (default: {NEO4J_BATCH_SIZE})",
+    )
+    args = parser.parse_args()
+
+    sync(
+        snapshot_path=args.snapshot,
+        full=args.full,
+        dry_run=args.dry_run,
+        state_path=args.similarity_state,
+        epsilon=args.epsilon,
+        batch_size=args.batch_size,
+    )
+
+
 if __name__ == "__main__":
     main()
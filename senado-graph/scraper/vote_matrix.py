@@ -0,0 +1,141 @@
+"""Senators × votaciones vote-code matrix built from scraped roll calls."""
+
+import hashlib
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from dates import normalize_date, to_iso
+from senator_resolver import SenatorResolver
+
+# Vote codes stored in the matrix; 0 means the senator has no recorded vote
+NO_VOTE = 0
+VOTE_CODES = {"favor": 1, "against": 2, "abstained": 3, "paired": 4}
+
+# Codes that count as a cast vote when comparing two senators
+CAST_CODES = [VOTE_CODES["favor"], VOTE_CODES["against"], VOTE_CODES["abstained"]]
+
+
+def votacion_id(vote: dict) -> str:
+    """Stable id for the votación a vote record belongs to.
+
+    A boletín can have several votaciones (general, particular, each
+    article...), so the law alone is not enough to tell them apart. The
+    date is hashed day-first, as roll calls were stored before dates were
+    normalized to ISO, so ids don't change with the stored format.
+    """
+    parts = [
+        (vote.get(k) or "").strip() for k in ("law_boletin", "session", "date", "topic")
+    ]
+    iso = to_iso(parts[2])
+    if iso:
+        parts[2] = f"{iso[8:]}/{iso[5:7]}/{iso[:4]}"
+    key = "|".join(parts)
+    return "votacion_" + hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+
+def _date_sort_key(date: str) -> str:
+    """Sort key for dates: the ISO form, or the raw value if it has no date."""
+    return normalize_date(date)
+
+
+@dataclass
+class VoteMatrix:
+    """Vote codes for every senator (rows) in every votación (columns)."""
+
+    senator_ids: List[str]
+    votaciones: List[dict]
+    codes: np.ndarray
+    senator_names: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def shape(self):
+        return self.codes.shape
+
+    def senator_index(self) -> Dict[str, int]:
+        return {senator_id: i for i, senator_id in enumerate(self.senator_ids)}
+
+    def votacion_index(self) -> Dict[str, int]:
+        return {v["id"]: j for j, v in enumerate(self.votaciones)}
+
+    def one_hot(self, code: int) -> np.ndarray:
+        """Float32 indicator matrix of where ``code`` was voted."""
+        return (self.codes == code).astype(np.float32)
+
+    def cast_mask(self) -> np.ndarray:
+        """Float32 indicator of a cast vote (favor, against or abstained)."""
+        return np.isin(self.codes, CAST_CODES).astype(np.float32)
+
+    def select_votaciones(self, columns) -> "VoteMatrix":
+        """Return a matrix restricted to the given column indices or mask."""
+        columns = np.asarray(columns)
+        if columns.dtype == bool:
+            columns = np.flatnonzero(columns)
+        return VoteMatrix(
+            senator_ids=self.senator_ids,
+            votaciones=[self.votaciones[j] for j in columns],
+            codes=self.codes[:, columns],
+            senator_names=self.senator_names,
+        )
+
+
+def build_vote_matrix(
+    votes: List[dict], senators: Optional[List[dict]] = None
+) -> VoteMatrix:
+    """Build a VoteMatrix from scraped vote records.
+
+    Senator names are resolved to Senator ids where possible; former senators
+    keep the id from the vote record. Votaciones are ordered by date.
+
+    Args:
+        votes: Records with law_boletin, session, date, topic, senator_name,
+            senator_id and vote
+        senators: Senator list used to resolve roll-call names
+    """
+    resolver = SenatorResolver(senators or [])
+    senator_index: Dict[str, int] = {}
+    senator_names: Dict[str, str] = {}
+    votaciones: Dict[str, dict] = {}
+    cells = []
+
+    for vote in votes:
+        code = VOTE_CODES.get(vote.get("vote"))
+        if code is None:
+            continue
+        senator_id = resolver.canonical_id(vote)
+        if not senator_id:
+            continue
+        if senator_id not in senator_index:
+            senator_index[senator_id] = len(senator_index)
+            senator_names[senator_id] = vote.get("senator_name") or senator_id
+
+        vid = votacion_id(vote)
+        if vid not in votaciones:
+            votaciones[vid] = {
+                "id": vid,
+                "law_boletin": vote.get("law_boletin"),
+                "law_id": vote.get("law_id"),
+                "session": vote.get("session"),
+                "date": vote.get("date"),
+                "topic": vote.get("topic"),
+            }
+        cells.append((senator_index[senator_id], vid, code))
+
+    ordered = sorted(
+        votaciones.values(),
+        key=lambda v: (_date_sort_key(v["date"]), v["session"] or "", v["id"]),
+    )
+    column = {v["id"]: j for j, v in enumerate(ordered)}
+
+    codes = np.zeros((len(senator_index), len(ordered)), dtype=np.int8)
+    if cells:
+        rows, vids, values = zip(*cells)
+        codes[np.array(rows), np.array([column[v] for v in vids])] = values
+
+    return VoteMatrix(
+        senator_ids=list(senator_index),
+        votaciones=ordered,
+        codes=codes,
+        senator_names=senator_names,
+    )
@@ -0,0 +1,287 @@
+"""Per-senator and per-party voting metrics over the vote matrix.
+
+Everything is computed with array operations on the senators × votaciones
+code matrix and party membership one-hots, then stored on Senator and Party
+nodes and in a JSON artifact, so profile pages read precomputed values
+instead of aggregating VOTED_ON edges per request:
+
+- attendance, absence and pairing rates per senator. Roll calls only list
+  senators who were present or paired, so a senator counts as absent from
+  a votación held between their first and last recorded ones where they
+  don't appear
+- Rice cohesion |favor - against| / (favor + against) per party and
+  votación, and its mean per party
+- rebellion rate: share of a senator's favor/against votes that went
+  against their party's majority
+- party × party agreement: share of votaciones where both party majorities
+  took the same side
+"""
+
+import json
+import os
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from config import DATA_DIR
+from vote_matrix import NO_VOTE, VOTE_CODES, VoteMatrix
+
+METRICS_PATH = os.path.join(DATA_DIR, "voting_metrics.json")
+
+# Senators without a party bloc to rebel against
+NON_PARTISAN = ("Independiente",)
+
+SENATOR_METRICS_QUERY = """
+UNWIND $senators AS row
+MATCH (s:Senator {id: row.id})
+SET s.attendanceRate = row.attendanceRate,
+    s.absenceRate = row.absenceRate,
+    s.pairingRate = row.pairingRate,
+    s.rebellionRate = row.rebellionRate,
+    s.rebellions = row.rebellions,
+    s.eligibleVotes = row.eligibleVotes
+"""
+
+PARTY_METRICS_QUERY = """
+UNWIND $parties AS row
+MATCH (p:Party {shortName: row.party})
+SET p.riceCohesion = row.riceCohesion,
+    p.cohesionVotes = row.cohesionVotes,
+    p.partyAgreement = row.partyAgreement
+"""
+
+
+@dataclass
+class VotingMetrics:
+    """Metrics for one vote matrix; rates are None when undefined."""
+
+    senators: List[dict]
+    parties: List[dict]
+    party_agreement: Dict[str, Dict[str, Optional[float]]]
+    rice: Dict[str, List[Optional[float]]] = field(default_factory=dict)
+    votaciones: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return {
+            "senators": self.senators,
+            "parties": self.parties,
+            "partyAgreement": self.party_agreement,
+            "votaciones": self.votaciones,
+            "rice": self.rice,
+        }
+
+
+def _rate(numerator: np.ndarray, denominator: np.ndarray) -> List[Optional[float]]:
+    return [
+        round(float(n) / float(d), 4) if d > 0 else None
+        for n, d in zip(numerator, denominator)
+    ]
+
+
+def _rounded(values: np.ndarray) -> List[Optional[float]]:
+    return [None if np.isnan(v) else round(float(v), 4) for v in values]
+
+
+def compute_metrics(matrix: VoteMatrix, senators: List[dict]) -> VotingMetrics:
+    """Compute every metric for ``matrix``.
+
+    Args:
+        matrix: Vote matrix
+        senators: Senator records; their ``party`` (short name) defines the
+            blocs. Senators outside this list or in NON_PARTISAN still get
+            attendance rates but no rebellion rate
+    """
+    codes = matrix.codes
+    size, n_votaciones = codes.shape
+    favor = codes == VOTE_CODES["favor"]
+    against = codes == VOTE_CODES["against"]
+    paired = codes == VOTE_CODES["paired"]
+    recorded = codes != NO_VOTE
+
+    # Attendance: a senator is expected at every votación in their span
+    columns = np.arange(n_votaciones)
+    first = np.where(recorded.any(axis=1), recorded.argmax(axis=1), n_votaciones)
+    last = n_votaciones - 1 - recorded[:, ::-1].argmax(axis=1)
+    eligible = (columns >= first[:, None]) & (columns <= last[:, None])
+    eligible_count = eligible.sum(axis=1)
+    present = recorded & ~paired
+
+    # Party blocs as a one-hot membership matrix (parties × senators)
+    party_of = {s["id"]: s.get("party") for s in senators}
+    party_names = sorted({p for p in party_of.values() if p and p not in NON_PARTISAN})
+    party_index = {name: k for k, name in enumerate(party_names)}
+    member_party = np.array(
+        [party_index.get(party_of.get(s), -1) for s in matrix.senator_ids],
+        dtype=np.int64,
+    )
+    membership = np.zeros((len(party_names), size))
+    partisan = member_party >= 0
+    membership[member_party[partisan], np.flatnonzero(partisan)] = 1.0
+
+    yes = membership @ favor
+    no = membership @ against
+    decided = yes + no
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rice = np.abs(yes - no) / decided
+    # Rice needs at least two members taking a side
+    rice[decided < 2] = np.nan
+
+    # Majority side per party and votación: +1 favor, -1 against, 0 none
+    position = np.sign(yes - no)
+    position[decided < 2] = 0
+
+    own_position = np.zeros_like(codes, dtype=np.float64)
+    own_position[partisan] = position[member_party[partisan]]
+    side = favor.astype(np.float64) - against
+    counted = (side != 0) & (own_position != 0)
+    rebellions = (counted & (side != own_position)).sum(axis=1)
+    counted_votes = counted.sum(axis=1)
+
+    favor_side = (position > 0).astype(np.float64)
+    against_side = (position < 0).astype(np.float64)
+    agree = favor_side @ favor_side.T + against_side @ against_side.T
+    both = (favor_side + against_side) @ (favor_side + against_side).T
+    with np.errstate(invalid="ignore", divide="ignore"):
+        agreement = agree / both
+
+    senator_rows = []
+    attendance = _rate(present.sum(axis=1), eligible_count)
+    absence = _rate((eligible & ~recorded).sum(axis=1), eligible_count)
+    pairing = _rate(paired.sum(axis=1), eligible_count)
+    rebellion = _rate(rebellions, counted_votes)
+    for i, senator_id in enumerate(matrix.senator_ids):
+        senator_rows.append(
+            {
+                "id": senator_id,
+                "party": party_of.get(senator_id),
+                "attendanceRate": attendance[i],
+                "absenceRate": absence[i],
+                "pairingRate": pairing[i],
+                "rebellionRate": rebellion[i] if partisan[i] else None,
+                "rebellions": int(rebellions[i]),
+                "eligibleVotes": int(eligible_count[i]),
+            }
+        )
+
+    party_rows = []
+    cohesion_votes = (~np.isnan(rice)).sum(axis=1)
+    for k, name in enumerate(party_names):
+        values = rice[k][~np.isnan(rice[k])]
+        party_rows.append(
+            {
+                "party": name,
+                "riceCohesion": (
+                    round(float(values.mean()), 4) if values.size else None
+                ),
+                "cohesionVotes": int(cohesion_votes[k]),
+            }
+        )
+
+    party_agreement = {
+        name: dict(zip(party_names, _rounded(agreement[k])))
+        for k, name in enumerate(party_names)
+    }
+
+    return VotingMetrics(
+        senators=senator_rows,
+        parties=party_rows,
+        party_agreement=party_agreement,
+        rice={name: _rounded(rice[k]) for k, name in enumerate(party_names)},
+        votaciones=[v["id"] for v in matrix.votaciones],
+    )
+
+
+def save_metrics(metrics: VotingMetrics, path: str = METRICS_PATH):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(metrics.to_dict(), f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def load_metrics(path: str = METRICS_PATH) -> Optional[dict]:
+    """Load the last saved metrics (None if none)."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def write_metrics(writer, metrics: VotingMetrics):
+    """Store the metrics on Senator and Party nodes."""
+    stats = writer.write(SENATOR_METRICS_QUERY, metrics.senators, param="senators")
+    print(f"  Senator: {stats.summary()}")
+
+    parties = [
+        {
+            **row,
+            # Neo4j properties can't hold maps
+            "partyAgreement": json.dumps(
+                metrics.party_agreement[row["party"]], ensure_ascii=False
+            ),
+        }
+        for row in metrics.parties
+    ]
+    stats = writer.write(PARTY_METRICS_QUERY, parties, param="parties")
+    print(f"  Party: {stats.summary()}")
+
+
+def main():
+    """Main entry point."""
+    import argparse
+
+    from scraped_data import load_dataset
+    from vote_matrix import build_vote_matrix
+
+    parser = argparse.ArgumentParser(
+        description="Compute attendance, party cohesion and rebellion rates"
+    )
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--out", default=METRICS_PATH, help="Stats artifact")
+    parser.add_argument(
+        "--neo4j", action="store_true", help="Store the metrics on nodes"
+    )
+    args = parser.parse_args()
+
+    votes = load_dataset("votes", args.data_dir)
+    if not votes:
+        print("No voting data found")
+        sys.exit(1)
+
+    senators = load_dataset("senators", args.data_dir)
+    metrics = compute_metrics(build_vote_matrix(votes, senators), senators)
+    save_metrics(metrics, args.out)
+    print(f"Metrics for {len(metrics.senators)} senators saved to {args.out}")
+
+    for row in sorted(metrics.parties, key=lambda r: -(r["riceCohesion"] or 0)):
+        print(
+            f"  {row['party']}: Rice {row['riceCohesion']} "
+            f"over {row['cohesionVotes']} votaciones"
+        )
+    rebels = sorted(
+        (r for r in metrics.senators if r["rebellionRate"] is not None),
+        key=lambda r: -r["rebellionRate"],
+    )
+    for row in rebels[:5]:
+        print(
+            f"  {row['id']} ({row['party']}): rebellion {row['rebellionRate']}, "
+            f"attendance {row['attendanceRate']}"
+        )
+
+    if args.neo4j:
+        from neo4j import GraphDatabase
+
+        from config import NEO4J_PASSWORD, NEO4J_URI, NEO4J_USERNAME
+        from neo4j_batch import BatchWriter
+
+        driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USERNAME, NEO4J_PASSWORD))
+        try:
+            write_metrics(BatchWriter(driver), metrics)
+        finally:
+            driver.close()
+
+
+if __name__ == "__main__":
+    main()
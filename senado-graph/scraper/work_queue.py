@@ -0,0 +1,741 @@
+"""Lease-based work queue for spreading a scrape over several hosts.
+
+Scrape units (see scrape_units.py) are enqueued once; any number of worker
+processes, on any host that reaches the backend, then claim them one at a
+time. A claim is a lease: the worker heartbeats while it fetches, and a unit
+whose lease expires (the worker died or lost the network) becomes claimable
+again. Failed units go back to the queue after an exponential delay until
+MAX_ATTEMPTS claims have been spent, then stay ``failed`` for inspection.
+
+Workers upload each unit's rows with the unit; ``merge`` writes every
+finished unit into the scraped JSON files the seeders read, on whichever
+host runs the seed.
+
+Backends:
+
+- ``SQLiteQueueBackend``: a SQLite file, for a single host and for testing
+- ``Neo4jQueueBackend``: ``:ScrapeUnit`` nodes in the project database,
+  which every host already reaches, for production runs
+
+WORK_QUEUE_URL picks the backend: a file path, or ``neo4j``.
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from config import DATA_DIR, WORK_QUEUE_URL
+from scrape_units import (
+    LOBBY_PAGES,
+    UNIT_KINDS,
+    describe,
+    fetch_unit,
+    merge_unit,
+    unit_id,
+)
+
+# Seconds a claim lasts without a heartbeat
+LEASE_SECONDS = 120
+
+# Heartbeats per lease, so a slow heartbeat doesn't lose the lease
+HEARTBEATS_PER_LEASE = 4
+
+# Claims a unit gets before it is left failed
+MAX_ATTEMPTS = 5
+
+# Delay before a failed unit is claimable again, doubling per attempt
+RETRY_DELAY = 30
+
+# Seconds an idle worker waits before polling the queue again
+POLL_INTERVAL = 10
+
+STATUSES = ("pending", "leased", "done", "failed", "merged")
+
+
+@dataclass
+class WorkUnit:
+    """A queued scrape unit and its claim state."""
+
+    kind: str
+    target: str
+    priority: int = 0
+    status: str = "pending"
+    attempts: int = 0
+    owner: Optional[str] = None
+    lease_expires: float = 0.0
+    available_at: float = 0.0
+    result: Optional[Dict[str, List[dict]]] = None
+    error: Optional[str] = None
+
+    @property
+    def id(self) -> str:
+        return unit_id(self.kind, self.target)
+
+
+def retry_at(attempts: int, now: float) -> float:
+    return now + RETRY_DELAY * 2 ** max(attempts - 1, 0)
+
+
+class QueueBackend(ABC):
+    """Storage shared by the workers.
+
+    Every method is atomic, and the ones taking ``worker`` only act on a
+    unit that worker currently holds.
+    """
+
+    @abstractmethod
+    def enqueue(self, units: List[WorkUnit], requeue: bool = False) -> int:
+        """Add units not yet queued; with ``requeue``, reset finished ones.
+
+        Returns:
+            Number of units added or reset
+        """
+
+    @abstractmethod
+    def claim(self, worker: str, lease: float = LEASE_SECONDS) -> Optional[WorkUnit]:
+        """Lease the most urgent claimable unit, or None if there is none."""
+
+    @abstractmethod
+    def heartbeat(self, unit: WorkUnit, worker: str, lease: float) -> bool:
+        """Extend a lease; False if the worker no longer holds the unit."""
+
+    @abstractmethod
+    def complete(self, unit: WorkUnit, worker: str, result: dict) -> bool:
+        """Store a unit's rows and mark it done."""
+
+    @abstractmethod
+    def fail(self, unit: WorkUnit, worker: str, error: str) -> bool:
+        """Release a unit for retry, or leave it failed after MAX_ATTEMPTS."""
+
+    @abstractmethod
+    def finished(self) -> Iterator[WorkUnit]:
+        """Done units with their results, in priority order."""
+
+    @abstractmethod
+    def mark_merged(self, units: List[WorkUnit]):
+        """Record that units' results were written to the data files."""
+
+    @abstractmethod
+    def counts(self) -> Dict[str, int]:
+        """Units per status."""
+
+    @abstractmethod
+    def failures(self) -> List[WorkUnit]:
+        """Units left failed, with their last error."""
+
+    def close(self):
+        pass
+
+
+class SQLiteQueueBackend(QueueBackend):
+    """Queue in a SQLite file, shared by processes on one host.
+
+    Claims run in ``BEGIN IMMEDIATE`` transactions, so two processes never
+    lease the same unit.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS units (
+        id TEXT PRIMARY KEY,
+        kind TEXT NOT NULL,
+        target TEXT NOT NULL,
+        priority INTEGER NOT NULL DEFAULT 0,
+        status TEXT NOT NULL DEFAULT 'pending',
+        attempts INTEGER NOT NULL DEFAULT 0,
+        owner TEXT,
+        lease_expires REAL NOT NULL DEFAULT 0,
+        available_at REAL NOT NULL DEFAULT 0,
+        result TEXT,
+        error TEXT
+    );
+    CREATE INDEX IF NOT EXISTS units_claim ON units (status, priority);
+    """
+
+    COLUMNS = (
+        "kind, target, priority, status, attempts, owner, lease_expires, "
+        "available_at, result, error"
+    )
+
+    def __init__(self, path: str):
+        self.path = path
+        # Heartbeats come from another thread of the same worker
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(
+            path, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(self.SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    @staticmethod
+    def _unit(row: tuple) -> WorkUnit:
+        unit = WorkUnit(*row)
+        if unit.result is not None:
+            unit.result = json.loads(unit.result)
+        return unit
+
+    def _update(self, sql: str, params: tuple) -> bool:
+        with self._lock:
+            return self.conn.execute(sql, params).rowcount > 0
+
+    def enqueue(self, units: List[WorkUnit], requeue: bool = False) -> int:
+        conflict = (
+            "UPDATE SET status = 'pending', attempts = 0, owner = NULL, "
+            "available_at = 0, result = NULL, error = NULL, "
+            "priority = excluded.priority "
+            "WHERE status IN ('done', 'failed', 'merged')"
+            if requeue
+            else "NOTHING"
+        )
+        sql = (
+            "INSERT INTO units (id, kind, target, priority) VALUES (?, ?, ?, ?) "
+            f"ON CONFLICT(id) DO {conflict}"
+        )
+        with self._lock:
+            before = self.conn.total_changes
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                self.conn.executemany(
+                    sql, [(u.id, u.kind, u.target, u.priority) for u in units]
+                )
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+            return self.conn.total_changes - before
+
+    def claim(self, worker: str, lease: float = LEASE_SECONDS) -> Optional[WorkUnit]:
+        now = time.time()
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Expired leases that used up their attempts are given up
+                self.conn.execute(
+                    "UPDATE units SET status = 'failed', owner = NULL, "
+                    "error = COALESCE(error, 'lease expired') "
+                    "WHERE status = 'leased' AND lease_expires < ? "
+                    "AND attempts >= ?",
+                    (now, MAX_ATTEMPTS),
+                )
+                row = self.conn.execute(
+                    f"SELECT id, {self.COLUMNS} FROM units "
+                    "WHERE (status = 'pending' AND available_at <= ?) "
+                    "OR (status = 'leased' AND lease_expires < ?) "
+                    "ORDER BY priority, id LIMIT 1",
+                    (now, now),
+                ).fetchone()
+                if row is None:
+                    self.conn.execute("COMMIT")
+                    return None
+                self.conn.execute(
+                    "UPDATE units SET status = 'leased', owner = ?, "
+                    "lease_expires = ?, attempts = attempts + 1 WHERE id = ?",
+                    (worker, now + lease, row[0]),
+                )
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+        unit = self._unit(row[1:])
+        unit.status, unit.owner = "leased", worker
+        unit.lease_expires, unit.attempts = now + lease, unit.attempts + 1
+        return unit
+
+    def heartbeat(self, unit: WorkUnit, worker: str, lease: float) -> bool:
+        return self._update(
+            "UPDATE units SET lease_expires = ? "
+            "WHERE id = ? AND owner = ? AND status = 'leased'",
+            (time.time() + lease, unit.id, worker),
+        )
+
+    def complete(self, unit: WorkUnit, worker: str, result: dict) -> bool:
+        return self._update(
+            "UPDATE units SET status = 'done', owner = NULL, result = ?, "
+            "error = NULL WHERE id = ? AND owner = ? AND status = 'leased'",
+            (json.dumps(result, ensure_ascii=False), unit.id, worker),
+        )
+
+    def fail(self, unit: WorkUnit, worker: str, error: str) -> bool:
+        exhausted = unit.attempts >= MAX_ATTEMPTS
+        return self._update(
+            "UPDATE units SET status = ?, owner = NULL, available_at = ?, "
+            "error = ? WHERE id = ? AND owner = ? AND status = 'leased'",
+            (
+                "failed" if exhausted else "pending",
+                retry_at(unit.attempts, time.time()),
+                error,
+                unit.id,
+                worker,
+            ),
+        )
+
+    def finished(self) -> Iterator[WorkUnit]:
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT {self.COLUMNS} FROM units WHERE status = 'done' "
+                "ORDER BY priority, id"
+            ).fetchall()
+        for row in rows:
+            yield self._unit(row)
+
+    def mark_merged(self, units: List[WorkUnit]):
+        with self._lock:
+            self.conn.executemany(
+                "UPDATE units SET status = 'merged', result = NULL "
+                "WHERE id = ? AND status = 'done'",
+                [(unit.id,) for unit in units],
+            )
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT status, count(*) FROM units GROUP BY status"
+            ).fetchall()
+        return dict(rows)
+
+    def failures(self) -> List[WorkUnit]:
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT {self.COLUMNS} FROM units WHERE status = 'failed' "
+                "ORDER BY priority, id"
+            ).fetchall()
+        return [self._unit(row) for row in rows]
+
+
+class Neo4jQueueBackend(QueueBackend):
+    """Queue as ``:ScrapeUnit`` nodes in Neo4j, shared by every host.
+
+    A claim picks a candidate, write-locks it by setting a property, and
+    re-checks it under the lock: a concurrent claim of the same node waits
+    for the first transaction, finds the unit taken and moves on to the next
+    candidate, so workers started together don't see an empty queue.
+    """
+
+    CLAIMABLE = (
+        "((u.status = 'pending' AND u.available_at <= $now) "
+        "OR (u.status = 'leased' AND u.lease_expires < $now "
+        "AND u.attempts < $max_attempts))"
+    )
+
+    def __init__(self, driver):
+        self.driver = driver
+        with driver.session() as session:
+            session.run(
+                "CREATE CONSTRAINT scrape_unit_id IF NOT EXISTS "
+                "FOR (u:ScrapeUnit) REQUIRE u.id IS UNIQUE"
+            ).consume()
+
+    @classmethod
+    def connect(cls) -> "Neo4jQueueBackend":
+        from neo4j import GraphDatabase
+
+        from config import NEO4J_PASSWORD, NEO4J_URI, NEO4J_USERNAME
+
+        driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USERNAME, NEO4J_PASSWORD))
+        return cls(driver)
+
+    def close(self):
+        self.driver.close()
+
+    @staticmethod
+    def _unit(node) -> WorkUnit:
+        result = node.get("result")
+        return WorkUnit(
+            kind=node["kind"],
+            target=node["target"],
+            priority=node.get("priority", 0),
+            status=node["status"],
+            attempts=node.get("attempts", 0),
+            owner=node.get("owner"),
+            lease_expires=node.get("lease_expires", 0.0),
+            available_at=node.get("available_at", 0.0),
+            result=json.loads(result) if result is not None else None,
+            error=node.get("error"),
+        )
+
+    def _write(self, query: str, **params) -> list:
+        def work(tx):
+            return list(tx.run(query, **params))
+
+        with self.driver.session() as session:
+            return session.execute_write(work)
+
+    def _read(self, query: str, **params) -> list:
+        def work(tx):
+            return list(tx.run(query, **params))
+
+        with self.driver.session() as session:
+            return session.execute_read(work)
+
+    def enqueue(self, units: List[WorkUnit], requeue: bool = False) -> int:
+        records = self._write(
+            """
+            UNWIND $units AS unit
+            MERGE (u:ScrapeUnit {id: unit.id})
+            ON CREATE SET u.kind = unit.kind, u.target = unit.target,
+                u.status = 'pending', u.new = true
+            WITH u, unit
+            WHERE coalesce(u.new, false)
+                OR ($requeue AND u.status IN ['done', 'failed', 'merged'])
+            SET u.status = 'pending', u.priority = unit.priority,
+                u.attempts = 0, u.owner = null, u.lease_expires = 0.0,
+                u.available_at = 0.0, u.result = null, u.error = null
+            REMOVE u.new
+            RETURN count(u) AS changed
+            """,
+            units=[
+                {"id": u.id, "kind": u.kind, "target": u.target, "priority": u.priority}
+                for u in units
+            ],
+            requeue=requeue,
+        )
+        return records[0]["changed"] if records else 0
+
+    def claim(self, worker: str, lease: float = LEASE_SECONDS) -> Optional[WorkUnit]:
+        now = time.time()
+        self._write(
+            """
+            MATCH (u:ScrapeUnit {status: 'leased'})
+            WHERE u.lease_expires < $now AND u.attempts >= $max_attempts
+            SET u.status = 'failed', u.owner = null,
+                u.error = coalesce(u.error, 'lease expired')
+            """,
+            now=now,
+            max_attempts=MAX_ATTEMPTS,
+        )
+        while True:
+            records = self._write(
+                f"""
+                MATCH (u:ScrapeUnit)
+                WHERE {self.CLAIMABLE}
+                WITH u ORDER BY u.priority, u.id LIMIT 1
+                SET u._lock = true
+                WITH u, {self.CLAIMABLE} AS claimable
+                FOREACH (_ IN CASE WHEN claimable THEN [1] ELSE [] END |
+                    SET u.status = 'leased', u.owner = $worker,
+                        u.lease_expires = $now + $lease,
+                        u.attempts = u.attempts + 1
+                )
+                REMOVE u._lock
+                RETURN u, claimable
+                """,
+                now=now,
+                lease=lease,
+                worker=worker,
+                max_attempts=MAX_ATTEMPTS,
+            )
+            if not records:
+                return None
+            if records[0]["claimable"]:
+                return self._unit(records[0]["u"])
+            # Another worker claimed this unit while we waited for its lock;
+            # try the next candidate rather than report an empty queue
+
+    def _held(self, query: str, unit: WorkUnit, worker: str, **params) -> bool:
+        records = self._write(
+            f"""
+            MATCH (u:ScrapeUnit {{id: $id}})
+            WHERE u.owner = $worker AND u.status = 'leased'
+            {query}
+            RETURN count(u) AS held
+            """,
+            id=unit.id,
+            worker=worker,
+            **params,
+        )
+        return bool(records and records[0]["held"])
+
+    def heartbeat(self, unit: WorkUnit, worker: str, lease: float) -> bool:
+        return self._held(
+            "SET u.lease_expires = $expires",
+            unit,
+            worker,
+            expires=time.time() + lease,
+        )
+
+    def complete(self, unit: WorkUnit, worker: str, result: dict) -> bool:
+        return self._held(
+            "SET u.status = 'done', u.owner = null, u.result = $result, "
+            "u.error = null",
+            unit,
+            worker,
+            result=json.dumps(result, ensure_ascii=False),
+        )
+
+    def fail(self, unit: WorkUnit, worker: str, error: str) -> bool:
+        exhausted = unit.attempts >= MAX_ATTEMPTS
+        return self._held(
+            "SET u.status = $status, u.owner = null, "
+            "u.available_at = $available_at, u.error = $error",
+            unit,
+            worker,
+            status="failed" if exhausted else "pending",
+            available_at=retry_at(unit.attempts, time.time()),
+            error=error,
+        )
+
+    def finished(self) -> Iterator[WorkUnit]:
+        records = self._read(
+            "MATCH (u:ScrapeUnit {status: 'done'}) RETURN u "
+            "ORDER BY u.priority, u.id"
+        )
+        for record in records:
+            yield self._unit(record["u"])
+
+    def mark_merged(self, units: List[WorkUnit]):
+        self._write(
+            """
+            UNWIND $ids AS id
+            MATCH (u:ScrapeUnit {id: id, status: 'done'})
+            SET u.status = 'merged', u.result = null
+            """,
+            ids=[unit.id for unit in units],
+        )
+
+    def counts(self) -> Dict[str, int]:
+        records = self._read(
+            "MATCH (u:ScrapeUnit) RETURN u.status AS status, count(u) AS units"
+        )
+        return {record["status"]: record["units"] for record in records}
+
+    def failures(self) -> List[WorkUnit]:
+        records = self._read(
+            "MATCH (u:ScrapeUnit {status: 'failed'}) RETURN u "
+            "ORDER BY u.priority, u.id"
+        )
+        return [self._unit(record["u"]) for record in records]
+
+
+def open_backend(url: str = WORK_QUEUE_URL) -> QueueBackend:
+    """Backend for WORK_QUEUE_URL: ``neo4j`` or a SQLite file path."""
+    if url == "neo4j":
+        return Neo4jQueueBackend.connect()
+    if url.startswith("sqlite:///"):
+        url = url[len("sqlite:///") :]
+    return SQLiteQueueBackend(url)
+
+
+def backfill_units(
+    days: int = 30,
+    boletines: Tuple[str, ...] = (),
+    lobby: bool = True,
+    today: Optional[date] = None,
+) -> List[WorkUnit]:
+    """Units for a backfill, most recent days first.
+
+    Args:
+        days: Days of fecha queries, counting today
+        boletines: Boletines whose votes to fetch
+        lobby: Include the lobby registry pages
+        today: Reference date (defaults to today)
+    """
+    today = today or date.today()
+    units = [
+        WorkUnit("day", (today - timedelta(days=offset)).isoformat())
+        for offset in range(days)
+    ]
+    units += [WorkUnit("boletin", boletin) for boletin in boletines]
+    if lobby:
+        units += [WorkUnit("lobby", page) for page in LOBBY_PAGES]
+    for priority, unit in enumerate(units):
+        unit.priority = priority
+    return units
+
+
+class Worker:
+    """Claims units from a backend and uploads their rows."""
+
+    def __init__(
+        self,
+        backend: QueueBackend,
+        worker_id: Optional[str] = None,
+        lease: float = LEASE_SECONDS,
+        scraper=None,
+    ):
+        self.backend = backend
+        self.worker_id = worker_id or (
+            f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        )
+        self.lease = lease
+        self._scraper = scraper
+        self.stop = threading.Event()
+        self.stats = {"done": 0, "failed": 0, "lost": 0}
+
+    @property
+    def scraper(self):
+        if self._scraper is None:
+            from advanced_parallel_scraper import AdvancedParallelScraper
+
+            self._scraper = AdvancedParallelScraper(max_workers=1)
+        return self._scraper
+
+    def _heartbeat(self, unit: WorkUnit, done: threading.Event, lost: threading.Event):
+        while not done.wait(self.lease / HEARTBEATS_PER_LEASE):
+            try:
+                held = self.backend.heartbeat(unit, self.worker_id, self.lease)
+            except Exception as e:
+                print(f"  heartbeat for {unit.id} failed: {e}")
+                continue
+            if not held:
+                lost.set()
+                return
+
+    def process(self, unit: WorkUnit) -> str:
+        """Fetch one claimed unit and report it; returns the outcome."""
+        done, lost = threading.Event(), threading.Event()
+        beat = threading.Thread(
+            target=self._heartbeat, args=(unit, done, lost), daemon=True
+        )
+        beat.start()
+        try:
+            result = fetch_unit(self.scraper, unit.kind, unit.target)
+            error = None
+        except Exception as e:
+            result, error = None, f"{type(e).__name__}: {e}"
+        finally:
+            done.set()
+            beat.join()
+
+        if error is None:
+            reported = self.backend.complete(unit, self.worker_id, result)
+            outcome = "done"
+        else:
+            reported = self.backend.fail(unit, self.worker_id, error)
+            outcome = "failed"
+        if lost.is_set() or not reported:
+            # Another worker took over the expired lease; its result counts
+            outcome = "lost"
+        self.stats[outcome] += 1
+        detail = describe(result) if result is not None else error
+        print(f"  [{self.worker_id}] {unit.id}: {outcome} ({detail})")
+        return outcome
+
+    def run(self, max_units: Optional[int] = None, exit_when_empty: bool = True):
+        """Process units until the queue is empty (or forever)."""
+        processed = 0
+        while not self.stop.is_set():
+            unit = self.backend.claim(self.worker_id, self.lease)
+            if unit is None:
+                if exit_when_empty:
+                    break
+                self.stop.wait(POLL_INTERVAL)
+                continue
+            self.process(unit)
+            processed += 1
+            if max_units is not None and processed >= max_units:
+                break
+        return processed
+
+
+def merge_results(backend: QueueBackend, data_dir: str = DATA_DIR) -> Dict[str, int]:
+    """Write every finished unit into the scraped JSON files.
+
+    Returns:
+        Units merged per kind
+    """
+    merged: Dict[str, int] = {kind: 0 for kind in UNIT_KINDS}
+    units = list(backend.finished())
+    for unit in units:
+        merge_unit(unit.kind, unit.target, unit.result or {}, data_dir)
+        merged[unit.kind] += 1
+    backend.mark_merged(units)
+    return merged
+
+
+def main():
+    """Main entry point."""
+    import argparse
+    import signal
+
+    parser = argparse.ArgumentParser(
+        description="Share a scrape between workers through a lease-based queue"
+    )
+    parser.add_argument(
+        "--queue",
+        default=WORK_QUEUE_URL,
+        help="SQLite file or 'neo4j' (default: WORK_QUEUE_URL)",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    enqueue = commands.add_parser("enqueue", help="Queue a backfill")
+    enqueue.add_argument("--days", type=int, default=30)
+    enqueue.add_argument(
+        "--boletines",
+        action="store_true",
+        help="Also queue the votes of every boletin in laws.json",
+    )
+    enqueue.add_argument("--no-lobby", action="store_true")
+    enqueue.add_argument(
+        "--requeue", action="store_true", help="Reset units that already finished"
+    )
+    enqueue.add_argument("--data-dir", default=DATA_DIR)
+
+    work = commands.add_parser("work", help="Run a worker")
+    work.add_argument("--worker-id")
+    work.add_argument("--lease", type=float, default=LEASE_SECONDS)
+    work.add_argument("--max-units", type=int)
+    work.add_argument(
+        "--wait", action="store_true", help="Keep polling when the queue is empty"
+    )
+
+    merge = commands.add_parser("merge", help="Write finished units to the data files")
+    merge.add_argument("--data-dir", default=DATA_DIR)
+
+    commands.add_parser("status", help="Show units per status and failures")
+    args = parser.parse_args()
+
+    backend = open_backend(args.queue)
+    try:
+        if args.command == "enqueue":
+            boletines: Tuple[str, ...] = ()
+            if args.boletines:
+                from scraped_data import load_dataset
+
+                boletines = tuple(
+                    law["boletin"] for law in load_dataset("laws", args.data_dir)
+                )
+            units = backfill_units(args.days, boletines, lobby=not args.no_lobby)
+            added = backend.enqueue(units, requeue=args.requeue)
+            print(f"Queued {added} of {len(units)} units")
+
+        elif args.command == "work":
+            worker = Worker(backend, args.worker_id, args.lease)
+            signal.signal(signal.SIGTERM, lambda *_: worker.stop.set())
+            print(f"Worker {worker.worker_id} started")
+            worker.run(args.max_units, exit_when_empty=not args.wait)
+            print(
+                f"Worker {worker.worker_id}: "
+                + ", ".join(f"{count} {name}" for name, count in worker.stats.items())
+            )
+
+        elif args.command == "merge":
+            merged = merge_results(backend, args.data_dir)
+            print(
+                "Merged "
+                + ", ".join(f"{count} {kind}" for kind, count in merged.items())
+                + f" units into {args.data_dir}"
+            )
+
+        else:
+            counts = backend.counts()
+            print(
+                ", ".join(f"{counts.get(status, 0)} {status}" for status in STATUSES)
+            )
+            for unit in backend.failures():
+                print(f"  {unit.id} after {unit.attempts} attempts: {unit.error}")
+    finally:
+        backend.close()
+
+
+if __name__ == "__main__":
+    main()
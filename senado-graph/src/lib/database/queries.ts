@@ -17,7 +17,10 @@ import type {
   Committee,
   GraphData,
   EdgeType,
+  ClusterInfo,
 } from "$lib/types";
+import { getClusterColor } from "$lib/utils/clustering";
+import { nodePosition } from "$lib/utils/position";
 
 // Helper to check if we should use mock data
 function useMockData(): boolean {
@@ -88,7 +91,14 @@ export async function getSenatorById(id: string): Promise<Senator | null> {
         .biography,
         .biographyEn,
         .startDate,
-        .active
+        .active,
+        .attendanceRate,
+        .absenceRate,
+        .pairingRate,
+        .rebellionRate,
+        .idealPoint,
+        .idealPointSE,
+        .idealPoint2d
       } AS senator
     `,
       { id },
@@ -121,7 +131,8 @@ export async function getAllParties(): Promise<Party[]> {
         .nameEn,
         .shortName,
         .color,
-        .ideology
+        .ideology,
+        .riceCohesion
       } AS party
     `);
 
@@ -192,11 +203,13 @@ export async function getInitialGraphData(
         .nameEn,
         .party,
         .region,
-        .active
+        .active,
+        .x,
+        .y
       } AS senator, p.color AS color
     `);
 
-    // Get law nodes with optional status filter
+    // Get the 50 most central law nodes, with optional status filter
     let lawQuery = `
       MATCH (l:Law)
     `;
@@ -215,8 +228,12 @@ export async function getInitialGraphData(
         .title,
         .titleEn,
         .status,
-        .topic
+        .topic,
+        .x,
+        .y
       } AS law
+      ORDER BY coalesce(l.pagerank, 0) DESC
+      LIMIT 50
     `;
 
     const lawsResult = await session.run(lawQuery, lawParams);
@@ -232,7 +249,9 @@ export async function getInitialGraphData(
         .nameEn,
         .shortName,
         .color,
-        .ideology
+        .ideology,
+        .x,
+        .y
       } AS party, count(s) AS memberCount
     `);
 
@@ -246,7 +265,7 @@ export async function getInitialGraphData(
       } AS committee
     `);
 
-    // Get Lobbyist nodes (limit 30)
+    // Get the 30 most central Lobbyist nodes (scraper/centrality.py)
     const lobbyistsResult = await session.run(`
       MATCH (l:Lobbyist)
       RETURN l {
@@ -254,8 +273,11 @@ export async function getInitialGraphData(
         .name,
         .type,
         .industry,
-        .industryEn
+        .industryEn,
+        .x,
+        .y
       } AS lobbyist
+      ORDER BY coalesce(l.pagerank, 0) DESC
       LIMIT 30
     `);
 
@@ -288,12 +310,16 @@ export async function getInitialGraphData(
       LIMIT 50
     `);
 
-    // Get VOTED_SAME edges between senators (voting patterns) - reduced to 50
+    // Get VOTED_SAME edges between senators (voting patterns) - only the
+    // sparsified backbone flagged by the scraper (scraper/backbone.py), or
+    // pairs above 0.7 agreement in a database with no backbone flagged yet
     const votedSameResult = await session.run(`
+      OPTIONAL MATCH ()-[flagged:VOTED_SAME {backbone: true}]->()
+      WITH count(flagged) > 0 AS hasBackbone
       MATCH (s1:Senator)-[v:VOTED_SAME]->(s2:Senator)
-      WHERE s1.id < s2.id AND v.agreement > 0.7
+      WHERE s1.id < s2.id
+        AND (v.backbone = true OR (NOT hasBackbone AND v.agreement > 0.7))
       RETURN s1.id AS source, s2.id AS target, v.agreement AS agreement
-      LIMIT 50
     `);
 
     // Get VOTED_ON edges (senator → law)
@@ -313,6 +339,7 @@ export async function getInitialGraphData(
         party: record.get("senator").party,
         region: record.get("senator").region,
       },
+      position: nodePosition(record.get("senator")),
     }));
 
     const lawNodes = lawsResult.records.map((record) => ({
@@ -323,6 +350,7 @@ export async function getInitialGraphData(
         status: record.get("law").status,
         topic: record.get("law").topic,
       },
+      position: nodePosition(record.get("law")),
     }));
 
     const partyNodes = partiesResult.records.map((record) => ({
@@ -334,6 +362,7 @@ export async function getInitialGraphData(
         ideology: record.get("party").ideology,
         memberCount: record.get("memberCount").toNumber(),
       },
+      position: nodePosition(record.get("party")),
     }));
 
     const committeeNodes = committeesResult.records.map((record) => ({
@@ -351,6 +380,7 @@ export async function getInitialGraphData(
         type: "lobbyist" as const,
         lobbyistType: record.get("lobbyist").type,
       },
+      position: nodePosition(record.get("lobbyist")),
     }));
 
     const nodes = [
@@ -752,7 +782,10 @@ export async function getVotingSimilarityGraph(): Promise<GraphData> {
         .nameEn,
         .party,
         .region,
-        .active
+        .active,
+        .clusterId,
+        .x,
+        .y
       } AS senator, p.color AS color
     `);
 
@@ -772,8 +805,11 @@ export async function getVotingSimilarityGraph(): Promise<GraphData> {
         .title,
         .titleEn,
         .status,
-        .topic
+        .topic,
+        .x,
+        .y
       } AS law
+      ORDER BY coalesce(l.pagerank, 0) DESC
       LIMIT 100
     `);
 
@@ -785,7 +821,9 @@ export async function getVotingSimilarityGraph(): Promise<GraphData> {
         color: record.get("color"),
         party: record.get("senator").party,
         region: record.get("senator").region,
+        clusterId: record.get("senator").clusterId?.toNumber(),
       },
+      position: nodePosition(record.get("senator")),
     }));
 
     const lawNodes = lawsResult.records.map((record) => ({
@@ -796,6 +834,7 @@ export async function getVotingSimilarityGraph(): Promise<GraphData> {
         status: record.get("law").status,
         topic: record.get("law").topic,
       },
+      position: nodePosition(record.get("law")),
     }));
 
     const nodes = [...senatorNodes, ...lawNodes];
@@ -842,3 +881,51 @@ export async function getVotingSimilarityGraph(): Promise<GraphData> {
     await session.close();
   }
 }
+
+/**
+ * Get voting clusters precomputed by the scraper pipeline (communities.py)
+ * Returns an empty list when clusters haven't been computed yet
+ */
+export async function getVotingClusters(): Promise<ClusterInfo[]> {
+  if (useMockData()) {
+    return [];
+  }
+
+  const driver = getDriver()!;
+  const session = driver.session();
+
+  try {
+    const result = await session.run(`
+      MATCH (c:Cluster)
+      RETURN c {
+        .id,
+        .size,
+        .avgAgreement,
+        .density,
+        .partyBreakdown,
+        .modularity
+      } AS cluster
+      ORDER BY c.id
+    `);
+
+    return result.records.map((record) => {
+      const cluster = record.get("cluster");
+      const id = cluster.id.toNumber();
+      return {
+        id,
+        name: `Cluster ${id + 1}`,
+        color: getClusterColor(id),
+        size: cluster.size.toNumber(),
+        cohesion: cluster.density,
+        partyBreakdown: JSON.parse(cluster.partyBreakdown || "{}"),
+        avgAgreement: cluster.avgAgreement,
+        modularity: cluster.modularity,
+      };
+    });
+  } catch (err) {
+    console.error("Error fetching voting clusters:", err);
+    return [];
+  } finally {
+    await session.close();
+  }
+}
@@ -0,0 +1,121 @@
+import { readFile } from "node:fs/promises";
+import path from "node:path";
+import type { GraphData } from "$lib/types";
+
+/**
+ * Graph snapshots exported by the scraper pipeline (graph_snapshot.py)
+ */
+const SNAPSHOT_DIR =
+  process.env.GRAPH_SNAPSHOT_DIR || path.join("scraper", "data", "snapshot");
+
+export type SnapshotFormat = "json" | "columnar";
+
+/** Level of detail, from party/cluster super-nodes to the full graph */
+export type SnapshotLevel = "parties" | "senators" | "full";
+
+export const SNAPSHOT_LEVELS: SnapshotLevel[] = ["parties", "senators", "full"];
+
+export interface SnapshotManifest {
+  schemaVersion: number;
+  version: string;
+  generatedAt: string;
+  files: Record<SnapshotFormat, string>;
+  counts: { nodes: number; edges: number };
+  views?: Partial<
+    Record<SnapshotLevel, { file: string; nodes: number; edges: number }>
+  >;
+}
+
+function snapshotFilename(
+  manifest: SnapshotManifest,
+  format: SnapshotFormat,
+  level: SnapshotLevel,
+): string {
+  if (level === "full") {
+    return manifest.files[format];
+  }
+  // Coarser views are only exported as JSON
+  const view = manifest.views?.[level];
+  if (!view || format !== "json") {
+    throw new Error(`No ${format} snapshot for level ${level}`);
+  }
+  return view.file;
+}
+
+export function hasSnapshotFile(
+  manifest: SnapshotManifest,
+  format: SnapshotFormat,
+  level: SnapshotLevel,
+): boolean {
+  return level === "full" || (format === "json" && !!manifest.views?.[level]);
+}
+
+// Snapshot files are immutable per version, so they can be cached forever
+const fileCache = new Map<string, Buffer>();
+const parsedCache = new Map<
+  SnapshotLevel,
+  { version: string; graph: GraphData }
+>();
+
+export async function getSnapshotManifest(): Promise<SnapshotManifest | null> {
+  try {
+    const manifest = await readFile(
+      path.join(SNAPSHOT_DIR, "manifest.json"),
+      "utf-8",
+    );
+    return JSON.parse(manifest) as SnapshotManifest;
+  } catch {
+    return null;
+  }
+}
+
+export async function readSnapshotFile(
+  manifest: SnapshotManifest,
+  format: SnapshotFormat,
+  level: SnapshotLevel = "full",
+): Promise<Buffer> {
+  const filename = snapshotFilename(manifest, format, level);
+  let contents = fileCache.get(filename);
+  if (!contents) {
+    contents = await readFile(path.join(SNAPSHOT_DIR, filename));
+    // Drop files from older versions
+    const current = new Set([
+      ...Object.values(manifest.files),
+      ...Object.values(manifest.views ?? {}).map((view) => view.file),
+    ]);
+    for (const cached of fileCache.keys()) {
+      if (!current.has(cached)) fileCache.delete(cached);
+    }
+    fileCache.set(filename, contents);
+  }
+  return contents;
+}
+
+/**
+ * Get the latest snapshot as GraphData, or null if none has been exported.
+ * Coarser levels are null when the snapshot has no view for them.
+ */
+export async function getSnapshotGraphData(
+  level: SnapshotLevel = "full",
+): Promise<GraphData | null> {
+  const manifest = await getSnapshotManifest();
+  if (!manifest || !hasSnapshotFile(manifest, "json", level)) {
+    return null;
+  }
+
+  let parsed = parsedCache.get(level);
+  if (parsed?.version !== manifest.version) {
+    try {
+      const contents = await readSnapshotFile(manifest, "json", level);
+      parsed = {
+        version: manifest.version,
+        graph: JSON.parse(contents.toString("utf-8")) as GraphData,
+      };
+      parsedCache.set(level, parsed);
+    } catch (err) {
+      console.error("Graph: Error reading snapshot:", err);
+      return null;
+    }
+  }
+  return parsed.graph;
+}
@@ -12,6 +12,15 @@ export interface Senator {
   biographyEn?: string;
   startDate?: string;
   active: boolean;
+  // Voting metrics precomputed by scraper/voting_metrics.py
+  attendanceRate?: number | null;
+  absenceRate?: number | null;
+  pairingRate?: number | null;
+  rebellionRate?: number | null;
+  // Roll-call ideal points from scraper/ideal_points.py
+  idealPoint?: number | null;
+  idealPointSE?: number | null;
+  idealPoint2d?: number[] | null;
 }
 
 // Party types
@@ -22,6 +31,7 @@ export interface Party {
   shortName: string;
   color: string;
   ideology?: string;
+  riceCohesion?: number | null;
 }
 
 // Law types
@@ -68,7 +78,14 @@ export interface Lobbyist {
 }
 
 // Graph data types
-export type NodeType = "senator" | "law" | "party" | "committee" | "lobbyist";
+export type NodeType =
+  | "senator"
+  | "law"
+  | "party"
+  | "committee"
+  | "lobbyist"
+  | "cluster"
+  | "industry";
 
 export type EdgeType =
   | "authored"
@@ -76,7 +93,8 @@ export type EdgeType =
   | "belongs_to"
   | "lobby"
   | "voted_same"
-  | "voted_on";
+  | "voted_on"
+  | "aggregate";
 
 export interface ClusterInfo {
   id: number;
@@ -86,6 +104,7 @@ export interface ClusterInfo {
   cohesion: number;
   partyBreakdown: Record<string, number>;
   avgAgreement: number;
+  modularity?: number;
 }
 
 export interface GraphNode {
@@ -102,10 +121,14 @@ export interface GraphNode {
     region?: string;
     agreement?: number;
     memberCount?: number;
+    // Super-nodes of the coarser snapshot views (graph_views.py)
+    aggregate?: boolean;
+    members?: string[];
     clusterId?: number;
     clusterColor?: string;
     [key: string]: unknown;
   };
+  position?: { x: number; y: number };
 }
 
 export interface GraphEdge {
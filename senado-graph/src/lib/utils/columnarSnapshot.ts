@@ -0,0 +1,102 @@
+import type { GraphData, GraphEdge, GraphNode } from "$lib/types";
+
+/**
+ * Decoder for the columnar graph snapshot written by the scraper pipeline
+ * (graph_snapshot.encode_columnar), served by GET /api/graph?format=columnar
+ */
+
+const MAGIC = "SGC1";
+const NULL_INDEX = 0xffffffff;
+
+interface ColumnSpec {
+  encoding: "string" | "number" | "bool" | "node";
+  dtype: "u8" | "u32" | "f32";
+  offset: number;
+  length: number;
+}
+
+interface ColumnarHeader {
+  format: string;
+  schemaVersion: number;
+  version: string;
+  strings: string[];
+  nodes: { count: number; columns: Record<string, ColumnSpec> };
+  edges: { count: number; columns: Record<string, ColumnSpec> };
+}
+
+function columnView(
+  buffer: ArrayBuffer,
+  base: number,
+  spec: ColumnSpec,
+): Uint8Array | Uint32Array | Float32Array {
+  const offset = base + spec.offset;
+  if (spec.dtype === "u8") return new Uint8Array(buffer, offset, spec.length);
+  if (spec.dtype === "u32") return new Uint32Array(buffer, offset, spec.length);
+  return new Float32Array(buffer, offset, spec.length);
+}
+
+function decodeColumns(
+  buffer: ArrayBuffer,
+  base: number,
+  header: ColumnarHeader,
+  table: { count: number; columns: Record<string, ColumnSpec> },
+): Record<string, unknown>[] {
+  const rows: Record<string, unknown>[] = Array.from(
+    { length: table.count },
+    () => ({}),
+  );
+
+  for (const [name, spec] of Object.entries(table.columns)) {
+    const values = columnView(buffer, base, spec);
+    for (let i = 0; i < table.count; i++) {
+      const raw = values[i];
+      let value: unknown;
+      if (spec.encoding === "string") {
+        value = raw === NULL_INDEX ? undefined : header.strings[raw];
+      } else if (spec.encoding === "number") {
+        value = Number.isNaN(raw) ? undefined : raw;
+      } else if (spec.encoding === "bool") {
+        value = raw === 255 ? undefined : raw === 1;
+      } else {
+        value = raw;
+      }
+      if (value !== undefined) rows[i][name] = value;
+    }
+  }
+
+  return rows;
+}
+
+export function decodeColumnarSnapshot(buffer: ArrayBuffer): GraphData {
+  const bytes = new Uint8Array(buffer);
+  const magic = new TextDecoder().decode(bytes.subarray(0, 4));
+  if (magic !== MAGIC) {
+    throw new Error(`Not a columnar graph snapshot (magic ${magic})`);
+  }
+
+  const headerLength = new DataView(buffer).getUint32(4, true);
+  const header: ColumnarHeader = JSON.parse(
+    new TextDecoder().decode(bytes.subarray(8, 8 + headerLength)),
+  );
+  const base = 8 + headerLength;
+
+  const nodeRows = decodeColumns(buffer, base, header, header.nodes);
+  const nodes: GraphNode[] = nodeRows.map(({ x, y, ...data }) => ({
+    data: data as GraphNode["data"],
+    ...(typeof x === "number" && typeof y === "number"
+      ? { position: { x, y } }
+      : {}),
+  }));
+
+  const edgeRows = decodeColumns(buffer, base, header, header.edges);
+  const edges: GraphEdge[] = edgeRows.map((row, i) => ({
+    data: {
+      ...row,
+      id: `edge_${i}`,
+      source: nodes[row.source as number].data.id,
+      target: nodes[row.target as number].data.id,
+    } as GraphEdge["data"],
+  }));
+
+  return { nodes, edges };
+}
@@ -0,0 +1,18 @@
+/**
+ * Format a date stored by the scraper (ISO YYYY-MM-DD, see scraper/dates.py)
+ * for display. The date is built in local time: `new Date("2025-07-02")`
+ * is UTC midnight, which shows as the day before west of UTC.
+ */
+export function formatDate(
+  value: string | null | undefined,
+  locale?: string,
+): string {
+  if (!value) {
+    return "";
+  }
+  const match = /^(\d{4})-(\d{2})-(\d{2})$/.exec(value);
+  const date = match
+    ? new Date(Number(match[1]), Number(match[2]) - 1, Number(match[3]))
+    : new Date(value);
+  return Number.isNaN(date.getTime()) ? value : date.toLocaleDateString(locale);
+}
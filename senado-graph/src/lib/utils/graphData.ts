@@ -1,6 +1,7 @@
 import type { GraphData, GraphFilters, EdgeType } from "$lib/types";
 import { getDriver } from "$lib/database/neo4j";
 import { getMockGraphData } from "$lib/database/mockData";
+import { nodePosition } from "$lib/utils/position";
 import type { Record as Neo4jRecord } from "neo4j-driver";
 
 export async function getFilteredGraphData(
@@ -50,7 +51,9 @@ export async function getFilteredGraphData(
           .nameEn,
           .party,
           .region,
-          .active
+          .active,
+          .x,
+          .y
         } AS senator, p.color AS color
       `;
 
@@ -77,8 +80,11 @@ export async function getFilteredGraphData(
           .title,
           .titleEn,
           .status,
-          .topic
+          .topic,
+          .x,
+          .y
         } AS law
+        ORDER BY coalesce(l.pagerank, 0) DESC
         LIMIT 50
       `;
 
@@ -107,7 +113,9 @@ export async function getFilteredGraphData(
           .nameEn,
           .shortName,
           .color,
-          .ideology
+          .ideology,
+          .x,
+          .y
         } AS party, count(s) AS memberCount
       `;
 
@@ -157,8 +165,11 @@ export async function getFilteredGraphData(
           .name,
           .type,
           .industry,
-          .industryEn
+          .industryEn,
+          .x,
+          .y
         } AS lobbyist
+        ORDER BY coalesce(l.pagerank, 0) DESC
         LIMIT 30
       `;
 
@@ -318,9 +329,14 @@ export async function getFilteredGraphData(
       activeEdgeTypes.includes("voted_same") &&
       entityTypes.includes("senator")
     ) {
+      // Backbone edges (scraper/backbone.py), or pairs above 0.7 agreement
+      // in a database with no backbone flagged yet
       let votedSameQuery = `
+        OPTIONAL MATCH ()-[flagged:VOTED_SAME {backbone: true}]->()
+        WITH count(flagged) > 0 AS hasBackbone
         MATCH (s1:Senator)-[v:VOTED_SAME]->(s2:Senator)
-        WHERE s1.id < s2.id AND v.agreement > 0.7
+        WHERE s1.id < s2.id
+          AND (v.backbone = true OR (NOT hasBackbone AND v.agreement > 0.7))
       `;
 
       // Use party shortName for filtering
@@ -336,7 +352,6 @@ export async function getFilteredGraphData(
 
       votedSameQuery += `
         RETURN s1.id AS source, s2.id AS target, v.agreement AS agreement
-        LIMIT 50
       `;
 
       const votedSameResult = await session.run(votedSameQuery, params);
@@ -401,6 +416,7 @@ export async function getFilteredGraphData(
         party: record.get("senator").party,
         region: record.get("senator").region,
       },
+      position: nodePosition(record.get("senator")),
     }));
 
     const lawNodes = lawsResult.records.map((record: Neo4jRecord) => ({
@@ -411,6 +427,7 @@ export async function getFilteredGraphData(
         status: record.get("law").status,
         topic: record.get("law").topic,
       },
+      position: nodePosition(record.get("law")),
     }));
 
     const partyNodes = partiesResult.records.map((record: Neo4jRecord) => ({
@@ -422,6 +439,7 @@ export async function getFilteredGraphData(
         ideology: record.get("party").ideology,
         memberCount: record.get("memberCount").toNumber(),
       },
+      position: nodePosition(record.get("party")),
     }));
 
     const committeeNodes = committeesResult.records.map(
@@ -442,6 +460,7 @@ export async function getFilteredGraphData(
           type: "lobbyist" as const,
           lobbyistType: record.get("lobbyist").type,
         },
+        position: nodePosition(record.get("lobbyist")),
       }),
     );
 
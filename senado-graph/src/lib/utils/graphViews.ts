@@ -0,0 +1,89 @@
+import type { GraphData, GraphNode } from "$lib/types";
+import type { SnapshotLevel } from "$lib/database/snapshot";
+import { getClusterColor } from "./clustering";
+import { decodeColumnarSnapshot } from "./columnarSnapshot";
+
+// Snapshot views from coarsest to most detailed (graph_views.LEVELS)
+const LEVELS: SnapshotLevel[] = ["parties", "senators", "full"];
+
+/**
+ * Level whose nodes a super-node's members refer to, or null at the bottom
+ */
+export function nextLevel(level: SnapshotLevel): SnapshotLevel | null {
+  return LEVELS[LEVELS.indexOf(level) + 1] ?? null;
+}
+
+/**
+ * Fetch a snapshot view from /api/graph. The full graph, the largest, comes
+ * in the columnar encoding; the coarser views are only exported as JSON
+ */
+export async function fetchGraphView(level: SnapshotLevel): Promise<GraphData> {
+  const columnar = level === "full";
+  const response = await fetch(
+    `/api/graph?level=${level}${columnar ? "&format=columnar" : ""}`,
+  );
+  if (!response.ok) {
+    throw new Error(`Failed to load ${level} view: ${response.status}`);
+  }
+  return columnar
+    ? decodeColumnarSnapshot(await response.arrayBuffer())
+    : ((await response.json()) as GraphData);
+}
+
+/**
+ * Expand a super-node into its members in the next level's view.
+ *
+ * Keeps the members, plus their neighbors that are either super-nodes
+ * themselves (so lobby industries can be drilled into next) or already on
+ * screen (so the expanded group stays attached to where it came from).
+ */
+export function expandSuperNode(
+  view: GraphData,
+  node: GraphNode,
+  visible: Set<string>,
+): GraphData {
+  const members = new Set(node.data.members ?? []);
+  const aggregates = new Set(
+    view.nodes.filter((n) => n.data.aggregate).map((n) => n.data.id),
+  );
+
+  const keep = new Set(members);
+  for (const edge of view.edges) {
+    const { source, target } = edge.data;
+    for (const [member, other] of [
+      [source, target],
+      [target, source],
+    ]) {
+      if (members.has(member) && (aggregates.has(other) || visible.has(other))) {
+        keep.add(other);
+      }
+    }
+  }
+
+  return {
+    nodes: view.nodes.filter((n) => keep.has(n.data.id)),
+    edges: view.edges.filter(
+      (e) => keep.has(e.data.source) && keep.has(e.data.target),
+    ),
+  };
+}
+
+/**
+ * Add the colors of precomputed voting clusters to nodes carrying a clusterId
+ */
+export function withClusterColors(graph: GraphData): GraphData {
+  return {
+    nodes: graph.nodes.map((node) =>
+      node.data.clusterId === undefined || node.data.clusterId === null
+        ? node
+        : {
+            ...node,
+            data: {
+              ...node.data,
+              clusterColor: getClusterColor(node.data.clusterId),
+            },
+          },
+    ),
+    edges: graph.edges,
+  };
+}
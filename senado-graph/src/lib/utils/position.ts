@@ -0,0 +1,12 @@
+/**
+ * Node position precomputed by the scraper pipeline (layout.py), if any
+ */
+export function nodePosition(props: {
+  x?: number | null;
+  y?: number | null;
+}): { x: number; y: number } | undefined {
+  if (typeof props.x !== "number" || typeof props.y !== "number") {
+    return undefined;
+  }
+  return { x: props.x, y: props.y };
+}
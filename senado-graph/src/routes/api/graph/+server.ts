@@ -1,5 +1,12 @@
 import { error } from "@sveltejs/kit";
 import { getFilteredGraphData } from "$lib/utils/graphData";
+import {
+  SNAPSHOT_LEVELS,
+  getSnapshotManifest,
+  hasSnapshotFile,
+  readSnapshotFile,
+} from "$lib/database/snapshot";
+import type { SnapshotFormat, SnapshotLevel } from "$lib/database/snapshot";
 import type { RequestHandler } from "./$types";
 import type { GraphFilters } from "$lib/types";
 
@@ -18,3 +25,52 @@ export const POST: RequestHandler = async ({ request }) => {
     throw error(500, "Failed to fetch graph data");
   }
 };
+
+/**
+ * Serve the prebuilt graph snapshot without touching Neo4j.
+ * `?format=columnar` returns the compact binary encoding and
+ * `?level=parties|senators` a coarser view built from super-nodes.
+ */
+export const GET: RequestHandler = async ({ request, url }) => {
+  const manifest = await getSnapshotManifest();
+  if (!manifest) {
+    throw error(404, "No graph snapshot has been exported");
+  }
+
+  const format: SnapshotFormat =
+    url.searchParams.get("format") === "columnar" ? "columnar" : "json";
+  const levelParam = url.searchParams.get("level") ?? "full";
+  if (!SNAPSHOT_LEVELS.includes(levelParam as SnapshotLevel)) {
+    throw error(400, `Unknown level: ${levelParam}`);
+  }
+  const level = levelParam as SnapshotLevel;
+  if (!hasSnapshotFile(manifest, format, level)) {
+    throw error(404, `No ${format} snapshot for level ${level}`);
+  }
+
+  const etag = `"${manifest.version}-${level}-${format}"`;
+  const headers = {
+    ETag: etag,
+    "Cache-Control": "public, max-age=0, must-revalidate",
+    "X-Graph-Version": manifest.version,
+  };
+
+  const ifNoneMatch = request.headers.get("If-None-Match");
+  if (ifNoneMatch?.split(",").some((tag) => tag.trim() === etag)) {
+    return new Response(null, { status: 304, headers });
+  }
+
+  try {
+    const contents = await readSnapshotFile(manifest, format, level);
+    return new Response(contents, {
+      headers: {
+        ...headers,
+        "Content-Type":
+          format === "columnar" ? "application/octet-stream" : "application/json",
+      },
+    });
+  } catch (err) {
+    console.error("Error reading graph snapshot:", err);
+    throw error(500, "Failed to read graph snapshot");
+  }
+};
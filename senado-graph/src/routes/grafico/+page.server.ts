@@ -4,8 +4,16 @@ import {
   getAllCommittees,
   getInitialGraphData,
   getVotingSimilarityGraph,
+  getVotingClusters,
 } from "$lib/database/queries";
-import type { GraphData, Senator, Party, Committee } from "$lib/types";
+import { getSnapshotGraphData } from "$lib/database/snapshot";
+import type {
+  GraphData,
+  Senator,
+  Party,
+  Committee,
+  ClusterInfo,
+} from "$lib/types";
 import type { PageServerLoad } from "./$types";
 
 export const load: PageServerLoad = async () => {
@@ -17,18 +25,29 @@ export const load: PageServerLoad = async () => {
       getAllCommittees(),
     ]);
 
-    // Fetch initial graph data (for display)
-    const initialGraphData = await getInitialGraphData();
+    // Start from the snapshot's party/cluster super-nodes when it has them;
+    // the page fetches finer views as the user drills down. Otherwise load
+    // the full graph, from the snapshot when one has been exported
+    const overviewGraphData = await getSnapshotGraphData("parties");
+    const initialGraphData =
+      overviewGraphData ??
+      (await getSnapshotGraphData()) ??
+      (await getInitialGraphData());
 
     // Fetch voting similarity graph (for clustering analysis)
     const votingGraphData = await getVotingSimilarityGraph();
 
+    // Clusters precomputed on the full similarity graph, if available
+    const votingClusters = await getVotingClusters();
+
     return {
       senators,
       parties,
       committees,
       initialGraphData,
+      levelOfDetail: overviewGraphData !== null,
       votingGraphData,
+      votingClusters,
     };
   } catch (err) {
     console.error("Error loading graph page data:", err);
@@ -37,7 +56,9 @@ export const load: PageServerLoad = async () => {
       parties: [] as Party[],
       committees: [] as Committee[],
       initialGraphData: { nodes: [], edges: [] } as GraphData,
+      levelOfDetail: false,
       votingGraphData: { nodes: [], edges: [] } as GraphData,
+      votingClusters: [] as ClusterInfo[],
     };
   }
 };